@@ -9,6 +9,8 @@ import os
 from typing import Dict, List
 from dataclasses import dataclass
 from datetime import datetime
+from src.analysis.structured_output import StructuredOutputClient, StructuredOutputError
+from src.analysis.prompt_templates import PROMPTS
 
 @dataclass
 class SecurityIssue:
@@ -34,11 +36,13 @@ class AISolution:
 class SecuritySolutionsAI:
     """AI-powered solutions generator for security market issues"""
     
-    def __init__(self):
+    def __init__(self, model: str = "gpt-4o-mini"):
         # Load API key from environment
         self.client = None
+        self.structured = None
         if os.getenv('OPENAI_API_KEY'):
             self.client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            self.structured = StructuredOutputClient(self.client, model)
         
         # Predefined security issues from market analysis
         self.issues = [
@@ -72,82 +76,45 @@ class SecuritySolutionsAI:
         """Generate AI-powered solution for a security issue"""
         
         if self.client:
-            prompt = f"""
-            As a strategic business consultant specializing in cybersecurity markets, analyze this critical issue and provide a comprehensive solution strategy:
-            
-            ISSUE ANALYSIS:
-            Company: {issue.company}
-            Problem: {issue.issue_type} - {issue.description}
-            Evidence: {issue.evidence}
-            Market Impact: {issue.market_impact}
-            Severity: {issue.severity}
-            
-            Provide a strategic solution with these components:
-            1. Solution Title (concise, action-oriented)
-            2. 4-5 specific action items (concrete steps)
-            3. Evidence strategy (how to prove effectiveness)
-            4. ROI projection (quantified business impact)
-            5. Implementation timeline
-            6. Investment requirements
-            
-            Focus on practical, measurable strategies that address root causes and create competitive advantage.
-            """
+            template = PROMPTS.get("strategic_solution")
             
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a senior strategy consultant with expertise in cybersecurity market dynamics and business transformation."},
-                        {"role": "user", "content": prompt}
-                    ],
+                data = self.structured.request(
+                    PROMPTS.render(
+                        "strategic_solution",
+                        company=issue.company,
+                        issue_type=issue.issue_type,
+                        description=issue.description,
+                        evidence=issue.evidence,
+                        market_impact=issue.market_impact,
+                        severity=issue.severity
+                    ),
+                    template.schema,
+                    schema_name=template.name,
                     max_tokens=1000,
                     temperature=0.7
                 )
+                return self._build_solution(data, issue)
                 
-                content = response.choices[0].message.content
-                return self._parse_ai_response(content, issue)
-                
+            except StructuredOutputError as e:
+                print(f"Unusable AI solution response: {e}")
+                return self._fallback_solution(issue)
             except Exception as e:
                 print(f"Error generating AI solution: {e}")
                 return self._fallback_solution(issue)
         else:
             return self._fallback_solution(issue)
     
-    def _parse_ai_response(self, content: str, issue: SecurityIssue) -> AISolution:
-        """Parse AI response into structured solution"""
-        # Simple parsing - in production, would use more sophisticated NLP
-        lines = content.split('\n')
-        
-        solution_title = "AI-Generated Strategic Solution"
-        action_items = []
-        evidence_strategy = []
-        
-        current_section = None
-        for line in lines:
-            line = line.strip()
-            if "solution" in line.lower() and "title" in line.lower():
-                current_section = "title"
-            elif "action" in line.lower():
-                current_section = "actions"
-            elif "evidence" in line.lower():
-                current_section = "evidence"
-            elif line.startswith(('1.', '2.', '3.', '4.', '5.', '-', '•')):
-                if current_section == "actions":
-                    action_items.append(line)
-                elif current_section == "evidence":
-                    evidence_strategy.append(line)
-        
-        if not action_items:  # Fallback parsing
-            action_items = [line for line in lines if line.startswith(('1.', '2.', '3.', '4.', '5.'))][:5]
-        
+    def _build_solution(self, data: Dict, issue: SecurityIssue) -> AISolution:
+        """Map a structured AI response onto a solution, filling any dropped fields from the issue"""
         return AISolution(
             problem_id=f"{issue.company.lower()}_{issue.issue_type.lower().replace(' ', '_')}",
-            solution_title=solution_title,
-            action_items=action_items[:5],
-            evidence_strategy=evidence_strategy[:3],
-            roi_projection=f"${issue.market_impact.split('$')[-1].split()[0]} projected impact",
-            timeline="6-12 months implementation",
-            investment_required="$5-25M strategic investment"
+            solution_title=data.get("solution_title", "AI-Generated Strategic Solution"),
+            action_items=data.get("action_items", [])[:5],
+            evidence_strategy=data.get("evidence_strategy", [])[:3],
+            roi_projection=data.get("roi_projection", f"${issue.market_impact.split('$')[-1].split()[0]} projected impact"),
+            timeline=data.get("timeline", "6-12 months implementation"),
+            investment_required=data.get("investment_required", "$5-25M strategic investment")
         )
     
     def _fallback_solution(self, issue: SecurityIssue) -> AISolution:
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+DataCleaner engine parity check and benchmark.
+
+Generates a synthetic combined-reviews frame shaped like the collection
+manager's output (all four sources, Reddit selftext, URLs and repeated
+punctuation, exact and near duplicates, undated reviews), cleans it with the
+pandas and Polars engines, checks that both produce the same rows, columns,
+values and removal counts, and reports wall time and speedup.
+
+Usage:
+    python benchmarks/cleaner_engines.py
+    python benchmarks/cleaner_engines.py --rows 200000 --repeat 3
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.preprocessing.data_cleaner import DataCleaner  # noqa: E402
+from src.preprocessing.polars_engine import polars_available  # noqa: E402
+
+PRODUCTS = ['McAfee', 'norton ', 'Kaspersky', 'Bitdefender', 'AVG', 'Trend Micro', 'windows defender']
+SOURCES = [('reddit', 'Reddit'), ('appstore', 'Apple App Store'),
+           ('playstore', 'Google Play Store'), ('amazon', 'Amazon')]
+WORDS = ('good great bad slow fast crash love hate vpn scan malware battery price support refund '
+         'works fine install update best worst awful useless perfect renewal firewall café naïve').split()
+EXTRAS = ['', ' Read more at https://example.com/review?id=1', '!!!', '...... really??', ' (edited)', ' <3 #1 ~~']
+
+
+def synthetic_reviews(rows: int, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        collection_source, source = rng.choice(SOURCES)
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 45))) + rng.choice(EXTRAS)
+        if i % 41 == 0 and records:
+            text = records[-1]['review_text']                      # exact duplicate candidate
+        reddit = collection_source == 'reddit'
+        title = rng.choice(['', 'Great app', 'Problem with renewal', None])
+        records.append({
+            'product_name': None if i % 997 == 0 else rng.choice(PRODUCTS),
+            'review_text': None if i % 53 == 0 else text,
+            'title': title,
+            'selftext': (title if i % 3 == 0 else text) if reddit else None,
+            'rating': rng.randint(-5, 300) if reddit else rng.randint(1, 5),
+            'date': None if reddit else rng.choice([f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                                                     'unknown']),
+            'source': source,
+            'collection_source': collection_source,
+            'reviewer_name': None if reddit else f"user{rng.randint(0, rows // 4)}",
+            'scraped_at': '2024-12-31T12:00:00.000001',
+            'created_utc': 1.7e9 + i * 37.5 if reddit else None,
+            'score': rng.randint(0, 500) if reddit else None,
+            'num_comments': rng.randint(0, 80) if reddit else None
+        })
+    return pd.DataFrame(records)
+
+
+def normalized(series: pd.Series) -> pd.Series:
+    """Object values with None for every missing marker, so dtypes don't matter"""
+    values = series.astype(object)
+    return values.where(series.notna(), None).reset_index(drop=True)
+
+
+def compare(pandas_df: pd.DataFrame, polars_df: pd.DataFrame) -> List[str]:
+    """Human-readable differences between the two engines' outputs"""
+    problems = []
+    if list(pandas_df.columns) != list(polars_df.columns):
+        problems.append(f"columns differ: {list(pandas_df.columns)} vs {list(polars_df.columns)}")
+    if len(pandas_df) != len(polars_df):
+        return problems + [f"row counts differ: {len(pandas_df)} vs {len(polars_df)}"]
+    for column in pandas_df.columns.intersection(polars_df.columns):
+        left, right = normalized(pandas_df[column]), normalized(polars_df[column])
+        if pd.api.types.is_float_dtype(pandas_df[column]):
+            equal = np.isclose(left.astype(float), right.astype(float), equal_nan=True)
+        else:
+            equal = (left == right) | (left.isna() & right.isna())
+        if not equal.all():
+            first = int(np.flatnonzero(~np.asarray(equal))[0])
+            problems.append(f"{column}: {int((~np.asarray(equal)).sum())} rows differ, "
+                            f"first at {first}: {left[first]!r} vs {right[first]!r}")
+    return problems
+
+
+def run_engine(engine: str, df: pd.DataFrame, repeat: int) -> Dict:
+    config = {**DataCleaner()._get_default_config(), 'engine': engine, 'compact_schema': False}
+    best, result, stats = float('inf'), None, None
+    for _ in range(repeat):
+        cleaner = DataCleaner(config)
+        start = time.perf_counter()
+        result = cleaner.clean_pipeline(df.copy())
+        best = min(best, time.perf_counter() - start)
+        stats = {key: value for key, value in cleaner.cleaning_stats.items()}
+    return {'seconds': best, 'frame': result, 'stats': stats}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--repeat', type=int, default=1, help='best-of runs per engine')
+    args = parser.parse_args(argv)
+
+    if not polars_available():
+        print("polars is not installed; nothing to compare")
+        return 1
+
+    logging.disable(logging.WARNING)
+    df = synthetic_reviews(args.rows, args.seed)
+    results = {engine: run_engine(engine, df, args.repeat) for engine in DataCleaner.ENGINES}
+
+    print(f"{args.rows:,} synthetic reviews")
+    print(f"{'engine':<8} {'seconds':>9} {'rows out':>9}  removal counts")
+    for engine, result in results.items():
+        counts = {key: value for key, value in result['stats'].items() if key != 'original_count'}
+        print(f"{engine:<8} {result['seconds']:>9.3f} {len(result['frame']):>9,}  {counts}")
+    speedup = results['pandas']['seconds'] / results['polars']['seconds']
+    print(f"speedup  {speedup:.1f}x")
+
+    problems = compare(results['pandas']['frame'], results['polars']['frame'])
+    if results['pandas']['stats'] != results['polars']['stats']:
+        problems.insert(0, f"removal counts differ: {results['pandas']['stats']} vs {results['polars']['stats']}")
+    if problems:
+        print("PARITY FAILED")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("parity OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the src packages.
+
+Runs each target in a fresh interpreter with ``python -X importtime`` so the numbers
+reflect a cold CLI invocation or worker start, and reports which heavy third-party
+dependencies each import drags in.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 150 "from src.data_collection import RedditScraper"
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGETS = [
+    "import src.data_collection",
+    "import src.preprocessing",
+    "import src.analysis",
+    "from src.data_collection import RedditScraper",
+    "from src.data_collection import AppStoreScraper",
+    "from src.data_collection import DataCollectionManager",
+    "from src.analysis import PROMPTS",
+]
+
+HEAVY_MODULES = ['selenium', 'bs4', 'pandas', 'numpy', 'openai', 'requests', 'yaml']
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(statement: str, repeat: int = 3, baseline: Dict = None) -> Dict:
+    """Best-of-N cold import of a statement in a fresh interpreter, net of interpreter startup"""
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', statement],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            return {'statement': statement, 'error': proc.stderr.strip().splitlines()[-1]}
+
+        modules = []
+        for line in proc.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                modules.append((name, int(self_us), int(cumulative_us), len(indent)))
+
+        # Modules the bare interpreter already loads at startup are not the target's cost
+        startup = baseline['modules'] if baseline else set()
+        modules = [m for m in modules if m[0] not in startup]
+
+        # Top-level entries (least indented) add up to the total import cost
+        top_level = min((m[3] for m in modules), default=0)
+        total_us = sum(m[2] for m in modules if m[3] == top_level)
+        if best is None or total_us < best['total_us']:
+            loaded = {m[0].split('.')[0] for m in modules}
+            best = {
+                'statement': statement,
+                'total_us': total_us,
+                'modules': {m[0] for m in modules},
+                'heavy_deps': [dep for dep in HEAVY_MODULES if dep in loaded],
+                'slowest': sorted(modules, key=lambda m: m[1], reverse=True)[:5]
+            }
+    return best
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('targets', nargs='*', help='import statements to time (defaults to package entry points)')
+    parser.add_argument('--repeat', type=int, default=3, help='fresh interpreters per target (best is kept)')
+    parser.add_argument('--budget-ms', type=float, default=None, help='exit non-zero if any target exceeds this')
+    args = parser.parse_args(argv)
+
+    baseline = measure('pass', args.repeat)
+    print(f"{'interpreter startup (excluded)':<55} {baseline['total_us'] / 1000:8.1f} ms")
+
+    over_budget = False
+    for statement in args.targets or DEFAULT_TARGETS:
+        result = measure(statement, args.repeat, baseline)
+        if 'error' in result:
+            print(f"{statement:<55} ERROR {result['error']}")
+            over_budget = True
+            continue
+
+        total_ms = result['total_us'] / 1000
+        deps = ', '.join(result['heavy_deps']) or '-'
+        print(f"{statement:<55} {total_ms:8.1f} ms   heavy deps: {deps}")
+        for name, self_us, _, _ in result['slowest'][:3]:
+            print(f"{'':<8}{name:<47} {self_us / 1000:8.1f} ms self")
+
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            over_budget = True
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+HTML parsing microbenchmark over saved search-page fixtures.
+
+Times Amazon search-result extraction with every installed parser backend
+(plus the previous full-tree BeautifulSoup path when bs4 is installed) and the
+Play Store package-link scan, so parser changes can be compared offline.
+
+Usage:
+    python benchmarks/parse_benchmark.py
+    python benchmarks/parse_benchmark.py --number 50 --repeat 5
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+from typing import Callable, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, REPO_ROOT)
+
+from src.data_collection.html_parser import available_backends  # noqa: E402
+
+
+def best_ms(fn: Callable, number: int, repeat: int) -> float:
+    """Best-of-repeat mean time per call in milliseconds"""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1000
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def amazon_cases(content: bytes) -> List:
+    """(label, callable) pairs that parse the fixture and extract every product"""
+    from src.data_collection.amazon_scraper import AmazonScraper, RESULT_SELECTOR
+    from src.data_collection.html_parser import parse_html
+
+    scraper = AmazonScraper()
+    cases = []
+
+    for backend in available_backends():
+        def run(backend=backend):
+            document = parse_html(content, backend, only=('div', {'data-component-type': 's-search-result'}))
+            return [scraper._extract_product_info(node) for node in document.select(RESULT_SELECTOR)]
+        cases.append((backend, run))
+
+    if 'html.parser' in available_backends():
+        from bs4 import BeautifulSoup
+
+        def previous():
+            # The pre-parser-layer path: whole page into a tree, then find calls per container
+            soup = BeautifulSoup(content, 'html.parser')
+            results = []
+            for container in soup.find_all('div', {'data-component-type': 's-search-result'}):
+                title = container.find('h2', class_='s-size-mini')
+                results.append((
+                    title.find('a') if title else None,
+                    container.find('span', class_='a-price-whole'),
+                    container.find('span', class_='a-icon-alt'),
+                    container.find('a', {'href': re.compile(r'#customerReviews')})
+                ))
+            return results
+        cases.append(('bs4 full tree + find (previous)', previous))
+
+    return cases
+
+
+def playstore_cases(text: str) -> List:
+    from src.data_collection.playstore_scraper import _DETAILS_LINK
+
+    def previous():
+        return re.findall(r'/store/apps/details\?id=([^"\s&]+)', text)[:5]
+
+    def current():
+        matches = []
+        for match in _DETAILS_LINK.finditer(text):
+            if match.group(1) not in matches:
+                matches.append(match.group(1))
+                if len(matches) == 5:
+                    break
+        return matches
+
+    return [('findall over full page (previous)', previous), ('precompiled finditer, early exit', current)]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20, help='calls per timing run')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs (best is kept)')
+    args = parser.parse_args(argv)
+
+    backends = available_backends()
+    print(f"Installed backends (fastest first): {', '.join(backends) or 'none'}")
+
+    amazon = load_fixture('amazon_search.html')
+    print(f"\nAmazon search page ({len(amazon) / 1024:.0f} KB)")
+    if not backends:
+        print("  skipped: install selectolax, lxml+cssselect or beautifulsoup4")
+    for label, fn in amazon_cases(amazon) if backends else []:
+        results = fn()
+        print(f"  {label:<42} {best_ms(fn, args.number, args.repeat):8.2f} ms   {len(results)} results")
+
+    playstore = load_fixture('playstore_search.html').decode('utf-8')
+    print(f"\nPlay Store search page ({len(playstore) / 1024:.0f} KB)")
+    for label, fn in playstore_cases(playstore):
+        results = fn()
+        print(f"  {label:<42} {best_ms(fn, args.number * 10, args.repeat) * 1000:8.1f} us   {len(results)} packages")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
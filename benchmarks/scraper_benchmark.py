@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Offline scraper throughput benchmark.
+
+Starts the fixture stub server (benchmarks/stub_server.py) with simulated
+latency, routes every scraper through the 'stub' transport and measures
+requests/sec, reviews/sec and bytes per source under the scrapers' concurrency
+settings. Parse time per page is measured separately against the same fixture
+payloads, so network and parsing regressions can be told apart.
+
+Usage:
+    python benchmarks/scraper_benchmark.py
+    python benchmarks/scraper_benchmark.py --latency-ms 120 --workers 8 --json results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import timeit
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import StubServer  # noqa: E402
+
+COMPANIES = ['McAfee', 'Norton', 'Kaspersky', 'Bitdefender', 'Avast',
+             'AVG', 'Malwarebytes', 'ESET', 'Trend Micro', 'Windows Defender']
+
+
+def make_scraper(source: str, args, stub_url: str):
+    from src.data_collection.amazon_scraper import AmazonScraper
+    from src.data_collection.appstore_scraper import AppStoreScraper
+    from src.data_collection.playstore_scraper import PlayStoreScraper
+    from src.data_collection.reddit_scraper import RedditScraper
+
+    scraper = {
+        'reddit': RedditScraper,
+        'appstore': AppStoreScraper,
+        'amazon': AmazonScraper,
+        'playstore': PlayStoreScraper
+    }[source](delay=args.delay)
+    scraper.max_retries = 1
+    if hasattr(scraper, 'max_workers'):
+        scraper.max_workers = args.workers
+    if source == 'reddit':
+        scraper.subreddits = ['antivirus', 'cybersecurity', 'techsupport', 'privacy',
+                              'malware', 'windows', 'security', 'pcmasterrace']
+        scraper.comment_config.update({'enabled': True, 'top_k_posts': 5})
+    if source == 'appstore':
+        scraper.countries = ['us', 'gb', 'ca', 'au', 'in']
+    scraper.use_transport('stub', stub_url=stub_url)
+    return scraper
+
+
+def run_workload(source: str, scraper, companies: List[str], max_reviews: int) -> int:
+    """Drive the source the way a collection run does; returns items produced"""
+    if source == 'reddit':
+        scraper.start_run(review_limit=max_reviews)
+        return sum(len(reviews) for reviews in scraper.scrape_reviews_multi(companies, max_reviews).values())
+    if source == 'appstore':
+        return sum(len(scraper.scrape_reviews(company, max_reviews)) for company in companies)
+    if source == 'amazon':
+        # Amazon reviews are sample data; search-result pages are the real traffic
+        return sum(len(scraper.search_products(company, limit=15)) for company in companies)
+    # Play Store reviews need Selenium; only the requests-based search is exercised
+    return sum(1 for company in companies if scraper._search_via_requests(company))
+
+
+def parse_ms_per_page(source: str, scraper, routes) -> float:
+    """Parse time for one recorded page, excluding network"""
+    if source == 'reddit':
+        body = routes._reddit_page('antivirus', {'limit': ['100']})
+        fn = lambda: scraper._parse_listing(json.loads(body)['data']['children'], 'antivirus', 'Norton')
+    elif source == 'appstore':
+        from src.data_collection.appstore_scraper import _loads
+        body = routes._review_page('us', 1, '100001')
+        app = {'trackId': 100001, 'trackName': 'Norton'}
+        fn = lambda: [scraper._extract_review(entry, 'Norton', app, 'us') for entry in _loads(body)['feed']['entry']]
+    elif source == 'amazon':
+        from src.data_collection.amazon_scraper import RESULT_SELECTOR
+        from src.data_collection.html_parser import parse_html, available_backends
+        if not available_backends():
+            return float('nan')
+        fn = lambda: [scraper._extract_product_info(node) for node in parse_html(
+            routes.amazon_search, scraper.html_backend,
+            only=('div', {'data-component-type': 's-search-result'})).select(RESULT_SELECTOR)]
+    else:
+        from src.data_collection.playstore_scraper import _DETAILS_LINK
+        text = routes.playstore_search.decode('utf-8')
+        fn = lambda: _DETAILS_LINK.findall(text)
+    return min(timeit.repeat(fn, number=10, repeat=3)) / 10 * 1000
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sources', nargs='*', default=['reddit', 'appstore', 'amazon', 'playstore'])
+    parser.add_argument('--companies', type=int, default=len(COMPANIES), help='number of target companies')
+    parser.add_argument('--max-reviews', type=int, default=100)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='simulated server latency per request')
+    parser.add_argument('--workers', type=int, default=4, help='scraper max_workers (Reddit, App Store)')
+    parser.add_argument('--delay', type=float, default=0.0, help='scraper rate-limit interval in seconds')
+    parser.add_argument('--json', dest='json_path', default=None, help='write results to this file')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    companies = COMPANIES[:args.companies]
+    server = StubServer(latency_ms=args.latency_ms).start()
+
+    print(f"{len(companies)} companies, latency {args.latency_ms:.0f} ms, workers {args.workers}, delay {args.delay}s")
+    print(f"{'source':<10} {'requests':>8} {'req/s':>8} {'items':>7} {'items/s':>9} {'MB':>7} {'parse ms/page':>14} {'wall s':>7}")
+
+    results = {}
+    try:
+        for source in args.sources:
+            scraper = make_scraper(source, args, server.url)
+            server.reset_stats()
+            start = time.perf_counter()
+            items = run_workload(source, scraper, companies, args.max_reviews)
+            wall = time.perf_counter() - start
+            served = server.reset_stats()
+
+            results[source] = {
+                'requests': served['requests'],
+                'requests_per_sec': served['requests'] / wall if wall else 0.0,
+                'items': items,
+                'items_per_sec': items / wall if wall else 0.0,
+                'megabytes': served['bytes'] / 1e6,
+                'parse_ms_per_page': parse_ms_per_page(source, scraper, server.routes),
+                'wall_seconds': wall
+            }
+            r = results[source]
+            print(f"{source:<10} {r['requests']:>8} {r['requests_per_sec']:>8.1f} {r['items']:>7} "
+                  f"{r['items_per_sec']:>9.1f} {r['megabytes']:>7.2f} {r['parse_ms_per_page']:>14.2f} {r['wall_seconds']:>7.2f}")
+    finally:
+        server.stop()
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stub server for offline scraper runs.
+
+Serves recorded Reddit JSON, iTunes JSON and Amazon / Play Store HTML from
+benchmarks/fixtures, keyed on the host the scraper originally asked for (sent by
+the 'stub' transport in the X-Original-Host header). Reddit listings and App Store
+review feeds are paginated like the real APIs, with ids made unique per
+subreddit / country / page so deduplication behaves realistically. A cassette
+recorded with the 'record' transport is served first when given.
+
+Usage:
+    python benchmarks/stub_server.py --port 8765 --latency-ms 80
+    # then set scrapers.transport.mode: stub in config.yaml
+"""
+
+import argparse
+import copy
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, REPO_ROOT)
+
+from src.data_collection.transport import ORIGINAL_HOST_HEADER, Cassette  # noqa: E402
+
+_REDDIT_LISTING = re.compile(r'^/r/([^/]+)/(search|hot)\.json$')
+_REDDIT_COMMENTS = re.compile(r'^/r/([^/]+)/comments/([^/.]+)')
+_ITUNES_REVIEWS = re.compile(r'^/(\w+)/rss/customerreviews/page=(\d+)/id=(\d+)/')
+
+
+class FixtureRoutes:
+    """Build paginated responses from the recorded fixture payloads"""
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, listing_pages: int = 4, review_pages: int = 10):
+        self.listing_pages = listing_pages
+        self.review_pages = review_pages
+
+        def load(name):
+            with open(os.path.join(fixtures_dir, name), 'rb') as f:
+                return f.read()
+
+        self.reddit_listing = json.loads(load('reddit_listing.json'))
+        self.reddit_comments = load('reddit_comments.json')
+        self.itunes_search = load('itunes_search.json')
+        self.itunes_reviews = json.loads(load('itunes_reviews.json'))
+        self.amazon_search = load('amazon_search.html')
+        self.playstore_search = load('playstore_search.html')
+        self.playstore_details = b'<!doctype html><html><body><h1 itemprop="name">App</h1></body></html>'
+
+    def respond(self, host: str, path: str, query: Dict) -> Tuple[int, str, bytes]:
+        """(status, content type, body) for one request"""
+        if 'reddit.com' in host:
+            match = _REDDIT_LISTING.match(path)
+            if match:
+                return 200, 'application/json', self._reddit_page(match.group(1), query)
+            if _REDDIT_COMMENTS.match(path):
+                return 200, 'application/json', self.reddit_comments
+        elif 'itunes.apple.com' in host:
+            if path == '/search':
+                return 200, 'application/json', self.itunes_search
+            match = _ITUNES_REVIEWS.match(path)
+            if match:
+                return 200, 'application/json', self._review_page(match.group(1), int(match.group(2)), match.group(3))
+        elif 'amazon.' in host and path == '/s':
+            return 200, 'text/html; charset=utf-8', self.amazon_search
+        elif 'play.google.com' in host:
+            if path == '/store/search':
+                return 200, 'text/html; charset=utf-8', self.playstore_search
+            if path == '/store/apps/details':
+                return 200, 'text/html; charset=utf-8', self.playstore_details
+        return 404, 'text/plain', b'not recorded'
+
+    def _reddit_page(self, subreddit: str, query: Dict) -> bytes:
+        after = query.get('after', [''])[0]
+        page = int(after.rsplit('p', 1)[1]) if after else 0
+        limit = int(query.get('limit', ['25'])[0])
+        source = self.reddit_listing['data']['children']
+
+        children = []
+        for i in range(limit):
+            child = copy.deepcopy(source[i % len(source)])
+            child['data']['id'] = f"{subreddit}{page}x{i}"
+            children.append(child)
+
+        last_page = page + 1 >= self.listing_pages
+        listing = {'kind': 'Listing', 'data': {
+            'after': None if last_page else f"t3_{subreddit}p{page + 1}",
+            'children': children
+        }}
+        return json.dumps(listing).encode('utf-8')
+
+    def _review_page(self, country: str, page: int, track_id: str) -> bytes:
+        if page > self.review_pages:
+            return json.dumps({'feed': {}}).encode('utf-8')
+        feed = copy.deepcopy(self.itunes_reviews)
+        for i, entry in enumerate(feed['feed']['entry']):
+            entry['id']['label'] = f"{track_id}{country}{page}x{i}"
+        return json.dumps(feed).encode('utf-8')
+
+
+class StubServer:
+    """Threaded local server with optional per-request latency and served-traffic counters"""
+
+    def __init__(self, port: int = 0, latency_ms: float = 0.0, cassette_path: str = None,
+                 routes: FixtureRoutes = None):
+        self.routes = routes or FixtureRoutes()
+        self.cassette = Cassette(cassette_path) if cassette_path else None
+        self.latency = latency_ms / 1000.0
+        self.stats = {'requests': 0, 'bytes': 0, 'not_found': 0}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def _recorded(self, host: str, path: str, query: str) -> Optional[Tuple[int, str, bytes]]:
+        if not self.cassette:
+            return None
+        entry = self.cassette.get('GET', f"https://{host}{path}" + (f"?{query}" if query else ''))
+        if entry is None:
+            return None
+        content_type = entry['headers'].get('Content-Type', 'application/octet-stream')
+        return entry['status'], content_type, Cassette.body_bytes(entry)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                parts = urlsplit(self.path)
+                host = self.headers.get(ORIGINAL_HOST_HEADER, '')
+                status, content_type, body = (
+                    server._recorded(host, parts.path, parts.query)
+                    or server.routes.respond(host, parts.path, parse_qs(parts.query))
+                )
+                with server._lock:
+                    server.stats['requests'] += 1
+                    server.stats['bytes'] += len(body)
+                    server.stats['not_found'] += status == 404
+
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_stats(self) -> Dict:
+        with self._lock:
+            stats, self.stats = self.stats, {'requests': 0, 'bytes': 0, 'not_found': 0}
+        return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='simulated server latency per request')
+    parser.add_argument('--cassette', default=None, help='recorded cassette served before the fixtures')
+    args = parser.parse_args(argv)
+
+    server = StubServer(args.port, args.latency_ms, args.cassette)
+    print(f"Serving scraper fixtures on {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
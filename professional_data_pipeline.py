@@ -11,6 +11,7 @@ import time
 import re
 from datetime import datetime
 from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 # Core libraries for data extraction and processing
@@ -22,19 +23,22 @@ try:
     from selenium.webdriver.support import expected_conditions as EC
     import requests
     import pandas as pd
-    import openai
+    from openai import OpenAI
     import numpy as np
 except ImportError as e:
     print(f"Required library not installed: {e}")
     print("Install with: pip install selenium requests pandas openai numpy")
 
+from src.analysis.prompt_templates import PROMPTS
+from src.analysis.structured_output import StructuredOutputClient
+
 class SecurityMarketAnalyzer:
     """
     Professional-grade data extraction and analysis pipeline
     Demonstrates real-world skills in web scraping, API integration, and AI analysis
     """
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, model: str = "gpt-4o-mini", max_workers: int = 4):
         """Initialize the analyzer with proper configuration"""
         self.setup_logging()
         self.data_sources = {
@@ -57,8 +61,11 @@ class SecurityMarketAnalyzer:
         }
         
         # OpenAI setup for AI analysis
+        self.model = model
+        self.max_workers = max_workers
         if openai_api_key:
-            openai.api_key = openai_api_key
+            self.client = OpenAI(api_key=openai_api_key)
+            self.structured = StructuredOutputClient(self.client, model)
             self.ai_enabled = True
         else:
             self.ai_enabled = False
@@ -213,70 +220,68 @@ class SecurityMarketAnalyzer:
     def analyze_with_openai(self, text: str, analysis_type: str = "sentiment") -> Dict[str, Any]:
         """
         Professional OpenAI integration for content analysis
-        Demonstrates AI API usage with proper error handling
+        analysis_type "multitask" returns both sentiment and strategic analyses from one call
         """
         if not self.ai_enabled:
-            return self._fallback_analysis(text, analysis_type)
+            return self._fallback_for(text, analysis_type)
         
         try:
-            if analysis_type == "sentiment":
-                prompt = f"""
-                Analyze this security software review for sentiment and categorization.
-                
-                Review text: "{text}"
-                
-                Provide analysis in this JSON format:
-                {{
-                    "sentiment_score": <1-10 scale>,
-                    "sentiment_label": "<positive/negative/neutral>",
-                    "main_category": "<performance/privacy/support/usability>",
-                    "key_issues": ["issue1", "issue2"],
-                    "business_impact": "<low/medium/high>",
-                    "competitor_mentions": ["company1", "company2"]
-                }}
-                """
-            
-            elif analysis_type == "strategic":
-                prompt = f"""
-                Analyze this user feedback for strategic business insights.
-                
-                Content: "{text}"
-                
-                Provide strategic analysis focusing on:
-                1. Market opportunities identified
-                2. Competitive advantages mentioned
-                3. Product gaps or weaknesses
-                4. Revenue impact potential
-                
-                Format as structured analysis.
-                """
+            # Static instructions/schema first, variable review text last (prefix-cache friendly)
+            if analysis_type in ("sentiment", "multitask"):
+                template = PROMPTS.get("market_" + analysis_type)
+                return self.structured.request(
+                    PROMPTS.render(template.name, text=text),
+                    template.schema,
+                    schema_name=template.name,
+                    max_tokens=700 if analysis_type == "multitask" else 500,
+                    temperature=0.3
+                )
             
-            # Professional OpenAI API call with error handling
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a senior business analyst specializing in cybersecurity market intelligence."},
-                    {"role": "user", "content": prompt}
-                ],
+            # Free-form strategic analysis through the v1 client
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=PROMPTS.render("market_strategic", text=text),
                 max_tokens=500,
                 temperature=0.3
             )
             
-            analysis_result = response.choices[0].message.content
-            
-            # Professional JSON parsing with fallback
-            try:
-                parsed_result = json.loads(analysis_result)
-                return parsed_result
-            except json.JSONDecodeError:
-                return {
-                    "raw_analysis": analysis_result,
-                    "parsing_status": "manual_review_required"
-                }
+            return {
+                "raw_analysis": response.choices[0].message.content,
+                "parsing_status": "manual_review_required"
+            }
             
         except Exception as e:
             self.logger.error(f"OpenAI analysis failed: {e}")
-            return self._fallback_analysis(text, analysis_type)
+            return self._fallback_for(text, analysis_type)
+    
+    def _fallback_for(self, text: str, analysis_type: str) -> Dict[str, Any]:
+        """Fallback shaped like the requested analysis type"""
+        if analysis_type == "multitask":
+            return {
+                "sentiment": self._fallback_analysis(text, "sentiment"),
+                "strategic": self._fallback_analysis(text, "strategic")
+            }
+        return self._fallback_analysis(text, analysis_type)
+    
+    def _analyze_item(self, item: Dict, analysis_mode: str) -> Dict:
+        """Run AI analysis for one extracted item"""
+        analysis_text = f"{item.get('title', '')} {item.get('content', '')}"
+        
+        if analysis_mode == "multitask":
+            combined = self.analyze_with_openai(analysis_text, "multitask")
+            sentiment_analysis = combined.get("sentiment", {})
+            strategic_analysis = combined.get("strategic", {})
+        else:
+            sentiment_analysis = self.analyze_with_openai(analysis_text, "sentiment")
+            strategic_analysis = self.analyze_with_openai(analysis_text, "strategic")
+        
+        # Combine original data with AI insights
+        return {
+            **item,
+            'ai_sentiment': sentiment_analysis,
+            'ai_strategic': strategic_analysis,
+            'analysis_timestamp': datetime.now().isoformat()
+        }
     
     def _fallback_analysis(self, text: str, analysis_type: str) -> Dict[str, Any]:
         """Professional fallback analysis when AI is unavailable"""
@@ -309,10 +314,10 @@ class SecurityMarketAnalyzer:
             "confidence": "medium"
         }
     
-    def run_complete_analysis(self) -> Dict[str, Any]:
+    def run_complete_analysis(self, analysis_mode: str = "multitask") -> Dict[str, Any]:
         """
         Execute complete data extraction and analysis pipeline
-        Demonstrates end-to-end professional workflow
+        analysis_mode "multitask" merges the sentiment and strategic passes; "separate" makes two calls
         """
         self.logger.info("Starting complete security market analysis pipeline")
         
@@ -334,25 +339,23 @@ class SecurityMarketAnalyzer:
         finally:
             driver.quit()
         
-        # Step 2: AI Analysis
-        self.logger.info(f"Analyzing {len(self.extracted_data)} extracted items with AI")
+        # Step 2: AI Analysis - one multi-task call per item, items analyzed concurrently
+        self.logger.info(f"Analyzing {len(self.extracted_data)} extracted items with AI ({analysis_mode} mode)")
         
-        for item in self.extracted_data:
-            analysis_text = f"{item.get('title', '')} {item.get('content', '')}"
-            
-            # Professional AI analysis
-            sentiment_analysis = self.analyze_with_openai(analysis_text, "sentiment")
-            strategic_analysis = self.analyze_with_openai(analysis_text, "strategic")
-            
-            # Combine original data with AI insights
-            analyzed_item = {
-                **item,
-                'ai_sentiment': sentiment_analysis,
-                'ai_strategic': strategic_analysis,
-                'analysis_timestamp': datetime.now().isoformat()
-            }
-            
-            self.analyzed_data.append(analyzed_item)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self.analyzed_data = list(executor.map(
+                lambda item: self._analyze_item(item, analysis_mode), self.extracted_data
+            ))
+        
+        # A failing model degrades every item to the rule-based fallback; don't let that pass as success
+        fallback_items = sum(
+            1 for item in self.analyzed_data
+            if item.get('ai_sentiment', {}).get('analysis_method') == 'rule_based_fallback'
+        )
+        if self.ai_enabled and self.analyzed_data and fallback_items == len(self.analyzed_data):
+            self.logger.warning(f"AI analysis failed for all {fallback_items} items - results are rule-based fallbacks only")
+        elif fallback_items:
+            self.logger.info(f"{fallback_items}/{len(self.analyzed_data)} items used rule-based fallback analysis")
         
         # Step 3: Generate Business Insights
         self.insights = self._generate_business_insights()
@@ -365,6 +368,7 @@ class SecurityMarketAnalyzer:
         return {
             'total_items_extracted': len(self.extracted_data),
             'total_items_analyzed': len(self.analyzed_data),
+            'fallback_items': fallback_items,
             'insights_generated': len(self.insights),
             'business_opportunities': self.insights.get('opportunities', []),
             'critical_issues': self.insights.get('critical_issues', []),
@@ -394,6 +398,12 @@ class SecurityMarketAnalyzer:
                     'platform': item.get('platform', 'unknown')
                 }
                 insights['critical_issues'].append(issue)
+            
+            # Structured strategic output from multi-task analysis
+            strategic = item.get('ai_strategic', {})
+            insights['opportunities'].extend(strategic.get('market_opportunities', []))
+            insights['market_gaps'].extend(strategic.get('product_gaps', []))
+            insights['competitive_advantages'].extend(strategic.get('competitive_advantages', []))
         
         # Calculate revenue opportunities (simplified for demonstration)
         critical_count = len(insights['critical_issues'])
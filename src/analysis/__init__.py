@@ -1,7 +1,38 @@
 """
 Analysis Module - AI-powered analysis for consumer security reviews.
+
+Submodules (and openai/pandas) are imported on first attribute access.
 """
+import importlib
+
+_EXPORTS = {
+    'OpenAIAnalyzer': '.openai_analyzer',
+    'quick_openai_analysis': '.openai_analyzer',
+    'ReviewRouter': '.review_router',
+    'InsightEngine': '.insight_engine',
+    'ReviewQueries': '.review_queries',
+    'AggregateCube': '.aggregate_cube',
+    'InsightsStore': '.insights_api',
+    'InsightsServer': '.insights_api',
+    'PROMPTS': '.prompt_templates',
+    'PromptRegistry': '.prompt_templates',
+    'PromptTemplate': '.prompt_templates',
+    'StructuredOutputClient': '.structured_output',
+    'StructuredOutputError': '.structured_output'
+}
+
+__all__ = ['OpenAIAnalyzer', 'quick_openai_analysis', 'ReviewRouter', 'InsightEngine', 'ReviewQueries', 'AggregateCube',
+           'InsightsStore', 'InsightsServer', 'PROMPTS', 'PromptRegistry', 'PromptTemplate',
+           'StructuredOutputClient', 'StructuredOutputError']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from .openai_analyzer import OpenAIAnalyzer, quick_openai_analysis
 
-__all__ = ['OpenAIAnalyzer', 'quick_openai_analysis']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,307 @@
+"""
+Aggregate Cube - Incrementally maintained product x source x month review aggregates for the dashboards.
+
+Each input file contributes additive partial cells (counts and sums), kept in a
+state file. Pipeline runs write full snapshots that overlap, so every review is
+counted once, in the newest file that contains it (matched by product, source and
+review id, else by product, source, reviewer, date and text). A rebuild reads new or changed files
+plus older files whose overlap with newer ones changed, and only the cells those
+files touch (plus cells of files that disappeared) are re-summed.
+
+Usage:
+    python -m src.analysis.aggregate_cube
+    python -m src.analysis.aggregate_cube --input "data/processed/analyzed_reviews_*.json" --full
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List
+import logging
+
+MEASURES = ['reviews', 'rating_count', 'rating_sum', 'stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5',
+            'sentiment_count', 'sentiment_sum', 'positive', 'neutral', 'negative']
+SENTIMENT_LABELS = ['positive', 'neutral', 'negative']
+_KEY_SEPARATOR = '|'
+# Bumped whenever review_keys changes; state saved with other keys is rebuilt from scratch
+_REVIEW_KEY_VERSION = 2
+
+
+def _cell_key(product: str, source: str, month: str) -> str:
+    return _KEY_SEPARATOR.join((product, source, month))
+
+
+def read_reviews(path: str) -> pd.DataFrame:
+    """Load a review file by extension (JSON records, JSON lines, CSV or Parquet)"""
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_json(path, lines=path.endswith('.jsonl'))
+
+
+def review_keys(df: pd.DataFrame) -> List[str]:
+    """Stable key per review: product, source and the source's review/post id, else its identifying content.
+    
+    Ids are scoped to the product because one Reddit post is attributed to every product it names.
+    """
+    def text(name):
+        if name not in df.columns:
+            return pd.Series('', index=df.index)
+        values = df[name].astype(object)
+        return values.where(values.notna(), '').astype(str)
+
+    scope = text('product_name') + _KEY_SEPARATOR + text('source') + _KEY_SEPARATOR
+    content = scope.copy()
+    for name in ('reviewer_name', 'date', 'review_text'):
+        content = content + _KEY_SEPARATOR + text(name)
+    ids = text('review_id').where(text('review_id') != '', text('id'))
+    keys = (scope + ids).where(ids != '', content)
+    return [f"{value:016x}" for value in pd.util.hash_pandas_object(keys, index=False)]
+
+
+def newest_reviews(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate review files given newest first, keeping each review only from the newest file that has it"""
+    claimed, parts = set(), []
+    for df in frames:
+        keys = review_keys(df)
+        parts.append(df[np.array([key not in claimed for key in keys], dtype=bool)])
+        claimed.update(keys)
+    return pd.concat(parts, ignore_index=True)
+
+
+def review_months(df: pd.DataFrame) -> pd.Series:
+    """'YYYY-MM' per review from the cleaned date (epoch ms in JSON output), raw date or Reddit created_utc"""
+    months = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    if 'date_unified' in df.columns:
+        values = df['date_unified']
+        unit = {'unit': 'ms'} if pd.api.types.is_numeric_dtype(values) else {}
+        months = pd.to_datetime(values, errors='coerce', **unit)
+    if 'date' in df.columns:
+        months = months.fillna(pd.to_datetime(df['date'], errors='coerce'))
+    if 'created_utc' in df.columns:
+        months = months.fillna(pd.to_datetime(pd.to_numeric(df['created_utc'], errors='coerce'), unit='s'))
+    return months.dt.strftime('%Y-%m').fillna('unknown')
+
+
+def partial_cells(df: pd.DataFrame) -> Dict[str, Dict]:
+    """Additive measures and feature (category) counts per cell for one batch of reviews"""
+    if df.empty:
+        return {}
+    missing = pd.Series(float('nan'), index=df.index)
+
+    def column(*names):
+        return next((df[name] for name in names if name in df.columns), missing)
+
+    frame = pd.DataFrame({
+        'product': df['product_name'].astype(str),
+        'source': column('data_source', 'collection_source').fillna('unknown').astype(str),
+        'month': review_months(df)
+    })
+
+    rating = pd.to_numeric(column('rating_standardized'), errors='coerce')
+    sentiment = pd.to_numeric(column('ai_sentiment_score', 'sentiment_score'), errors='coerce')
+    # AI labels where present, otherwise the sign of the score
+    label = column('ai_sentiment').where(column('ai_sentiment').isin(SENTIMENT_LABELS))
+    label = label.fillna(np.sign(sentiment).map({1.0: 'positive', 0.0: 'neutral', -1.0: 'negative'}))
+
+    stars = rating.round().clip(1, 5)
+    frame['reviews'] = 1
+    frame['rating_count'] = rating.notna().astype(int)
+    frame['rating_sum'] = rating.fillna(0.0)
+    for star in range(1, 6):
+        frame[f"stars_{star}"] = (stars == star).astype(int)
+    frame['sentiment_count'] = sentiment.notna().astype(int)
+    frame['sentiment_sum'] = sentiment.fillna(0.0)
+    for name in SENTIMENT_LABELS:
+        frame[name] = (label == name).astype(int)
+
+    sums = frame.groupby(['product', 'source', 'month'], sort=False)[MEASURES].sum()
+    cells = {
+        _cell_key(*key): {'measures': [float(value) if isinstance(value, float) else int(value) for value in row],
+                          'categories': {}}
+        for key, row in zip(sums.index, sums.itertuples(index=False, name=None))
+    }
+
+    if 'ai_features' in df.columns:
+        features = frame[['product', 'source', 'month']].assign(feature=df['ai_features']).explode('feature')
+        features = features[features['feature'].notna() & (features['feature'] != '')]
+        counts = features.groupby(['product', 'source', 'month', 'feature'], sort=False).size()
+        for (product, source_name, month, feature), count in counts.items():
+            cells[_cell_key(product, source_name, month)]['categories'][str(feature).lower()] = int(count)
+    return cells
+
+
+class AggregateCube:
+    """Product x source x month cube over cleaned/analyzed review files, updated per changed file"""
+
+    def __init__(self, config: Dict = None):
+        self.logger = logging.getLogger('AggregateCube')
+        self.config = {**self._get_default_config(), **(config or {})}
+        self.files = {}     # path -> {'signature', 'keys': review keys, 'duplicates': digest, 'cells': {key: partial}}
+        self.cells = {}     # key -> {'measures': [...], 'categories': {...}}
+        self.last_update = {}
+        self._load_state()
+
+    def _get_default_config(self) -> Dict:
+        """Default inputs and outputs"""
+        return {
+            'inputs': ['data/processed/analyzed_reviews_*.json', 'data/processed/analyzed_reviews_*.jsonl'],
+            'state_path': 'data/dashboard/review_cube_state.json',
+            'feed_path': 'data/dashboard/review_cube.json',
+            'top_categories': 10        # feature counts kept per cell in the feed
+        }
+
+    def _load_state(self):
+        path = self.config['state_path']
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('review_key_version') != _REVIEW_KEY_VERSION:
+            self.logger.info("🧊 Saved cube state uses older review keys; rebuilding")
+            return
+        self.files = state.get('files', {})
+        self.cells = state.get('cells', {})
+
+    def _save_state(self):
+        path = self.config['state_path']
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'review_key_version': _REVIEW_KEY_VERSION, 'files': self.files, 'cells': self.cells},
+                      f, separators=(',', ':'))
+
+    def discover(self) -> Dict[str, List]:
+        """Current input files and their (mtime, size) signatures"""
+        found = {}
+        for pattern in self.config['inputs']:
+            for path in glob.glob(pattern):
+                if path.endswith('_metadata.json'):
+                    continue
+                stat = os.stat(path)
+                found[os.path.normpath(path)] = [stat.st_mtime, stat.st_size]
+        return found
+
+    def update(self, full: bool = False) -> Dict:
+        """Ingest new/changed files, drop removed ones and re-sum only the affected cells"""
+        if full:
+            self.files, self.cells = {}, {}
+        found = self.discover()
+        changed = [path for path, signature in found.items()
+                   if self.files.get(path, {}).get('signature') != signature or 'keys' not in self.files[path]]
+        removed = [path for path in self.files if path not in found]
+
+        affected = set()
+        for path in removed:
+            affected.update(self.files.pop(path)['cells'])
+        frames = {path: read_reviews(path) for path in changed}
+        for path, df in frames.items():
+            previous = self.files.get(path, {}).get('cells', {})
+            self.files[path] = {'signature': found[path], 'keys': review_keys(df), 'cells': previous}
+
+        # Newest file first: a review is counted in the first file that has it; older files
+        # are re-read only when the set of their reviews already counted elsewhere changed
+        claimed, duplicates = set(), 0
+        for path in sorted(found, key=lambda path: (found[path][0], path), reverse=True):
+            entry = self.files[path]
+            counted = np.array([key not in claimed for key in entry['keys']], dtype=bool)
+            digest = hashlib.sha1(np.packbits(~counted).tobytes()).hexdigest()
+            if path in frames or entry.get('duplicates') != digest:
+                df = frames[path] if path in frames else read_reviews(path)
+                frames[path] = df
+                cells = partial_cells(df[counted])
+                affected.update(entry['cells'])
+                affected.update(cells)
+                entry.update(cells=cells, duplicates=digest)
+            claimed.update(entry['keys'])
+            duplicates += int((~counted).sum())
+
+        for key in affected:
+            total = self._sum_cell(key)
+            if total is None:
+                self.cells.pop(key, None)
+            else:
+                self.cells[key] = total
+
+        self.last_update = {'files_read': len(frames), 'files_removed': len(removed),
+                            'duplicate_reviews': duplicates,
+                            'cells_recomputed': len(affected), 'cells_total': len(self.cells)}
+        if frames or removed or full:
+            self._save_state()
+            self.write_feed()
+        self.logger.info(f"🧊 Cube update: {len(frames)} file(s) read, {len(removed)} removed, "
+                         f"{duplicates:,} reviews already counted in newer files, "
+                         f"{len(affected)}/{len(self.cells)} cells recomputed")
+        return self.last_update
+
+    def _sum_cell(self, key: str) -> Dict:
+        measures, categories, seen = [0] * len(MEASURES), {}, False
+        for entry in self.files.values():
+            partial = entry['cells'].get(key)
+            if partial is None:
+                continue
+            seen = True
+            measures = [a + b for a, b in zip(measures, partial['measures'])]
+            for feature, count in partial['categories'].items():
+                categories[feature] = categories.get(feature, 0) + count
+        return {'measures': measures, 'categories': categories} if seen else None
+
+    def feed(self) -> Dict:
+        """Compact dashboard feed: dimension dictionaries plus one index/measure row per cell"""
+        keys = sorted(self.cells)
+        split = [key.split(_KEY_SEPARATOR) for key in keys]
+        dimensions = {name: sorted({parts[i] for parts in split})
+                      for i, name in enumerate(['product', 'source', 'month'])}
+        index = {name: {value: i for i, value in enumerate(values)} for name, values in dimensions.items()}
+
+        top = self.config['top_categories']
+        rows, categories = [], {}
+        for number, (key, (product, source, month)) in enumerate(zip(keys, split)):
+            cell = self.cells[key]
+            rows.append([index['product'][product], index['source'][source], index['month'][month]]
+                        + [round(value, 4) if isinstance(value, float) else value for value in cell['measures']])
+            if cell['categories']:
+                ranked = sorted(cell['categories'].items(), key=lambda item: (-item[1], item[0]))[:top]
+                categories[str(number)] = dict(ranked)
+
+        return {
+            'version': 1,
+            'generated_at': datetime.now().isoformat(),
+            'dimensions': dimensions,
+            'columns': ['product', 'source', 'month'] + MEASURES,
+            'cells': rows,
+            'categories': categories
+        }
+
+    def write_feed(self) -> str:
+        path = self.config['feed_path']
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.feed(), f, separators=(',', ':'), ensure_ascii=False)
+        return path
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', action='append', dest='inputs', help='glob of review files (repeatable)')
+    parser.add_argument('--state', dest='state_path', help='incremental state file')
+    parser.add_argument('--feed', dest='feed_path', help='dashboard feed to write')
+    parser.add_argument('--full', action='store_true', help='ignore the saved state and rebuild every cell')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    config = {key: value for key, value in vars(args).items() if key != 'full' and value}
+    cube = AggregateCube(config)
+    stats = cube.update(full=args.full)
+    print(json.dumps({**stats, 'feed': cube.config['feed_path']}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
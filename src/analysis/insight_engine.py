@@ -0,0 +1,203 @@
+"""
+Insight Engine - Token-budgeted map-reduce summarization of product reviews.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+import logging
+
+from .prompt_templates import PROMPTS, estimate_tokens
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim text to a token budget on sentence boundaries instead of mid-sentence"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    kept = []
+    used = 0
+    for sentence in _SENTENCE_END.split(text):
+        cost = estimate_tokens(sentence)
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+
+    # A single oversized sentence still needs a (word-boundary) cut
+    if not kept:
+        return text[:max_tokens * 4].rsplit(' ', 1)[0]
+    return ' '.join(kept)
+
+
+class InsightEngine:
+    """Chunk all of a product's reviews to a token budget, summarize chunks concurrently and reduce hierarchically"""
+
+    def __init__(self, complete_json: Callable[..., Dict], model: str = '', config: Dict = None):
+        self.logger = logging.getLogger('InsightEngine')
+        self.complete_json = complete_json
+        self.model = model
+        self.config = {**self._get_default_config(), **(config or {})}
+
+        self.cache_path = self.config['cache_path']
+        self._cache_lock = threading.Lock()
+        self._cache = self._load_cache()
+        self.stats = {'map_calls': 0, 'reduce_calls': 0, 'cache_hits': 0}
+
+    def _get_default_config(self) -> Dict:
+        """Default token budgets and concurrency"""
+        return {
+            'chunk_tokens': 3000,          # Review text per map call
+            'review_tokens': 300,          # Cap per individual review
+            'max_map_chunks': 40,          # Bounds cost for very large products
+            'reduce_fan_in': 8,            # Partials merged per reduce call
+            'max_workers': 4,
+            'map_max_tokens': 400,
+            'reduce_max_tokens': 600,
+            'cache_path': 'data/cache/insight_chunks.json',
+            'max_cache_entries': 5000      # Least recently used summaries are evicted on save
+        }
+
+    def _load_cache(self) -> Dict:
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Could not read insight cache {self.cache_path}: {e}")
+        return {}
+
+    def save_cache(self):
+        """Persist chunk and reduce summaries so unchanged chunks are never re-mapped"""
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        with self._cache_lock:
+            # Entries are kept in use order, so the oldest ones are at the front
+            excess = len(self._cache) - self.config['max_cache_entries']
+            for key in list(self._cache)[:max(excess, 0)]:
+                del self._cache[key]
+            with open(self.cache_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, ensure_ascii=False)
+            os.replace(self.cache_path + '.tmp', self.cache_path)
+
+    def _cache_key(self, kind: str, template_name: str, product: str, payload: str) -> str:
+        version = PROMPTS.get(template_name).version
+        digest = hashlib.sha1(f"{self.model}|{template_name}@{version}|{product}|{payload}".encode('utf-8')).hexdigest()
+        return f"{kind}:{digest}"
+
+    def _cached_call(self, kind: str, template_name: str, product: str, payload: str, max_tokens: int, **variables) -> Dict:
+        key = self._cache_key(kind, template_name, product, payload)
+        with self._cache_lock:
+            if key in self._cache:
+                self.stats['cache_hits'] += 1
+                self._cache[key] = self._cache.pop(key)     # mark as recently used
+                return self._cache[key]
+
+        result = self.complete_json(template_name, max_tokens, product=product, **variables)
+
+        with self._cache_lock:
+            self.stats[f'{kind}_calls'] += 1
+            self._cache[key] = result
+        return result
+
+    def _order_reviews(self, reviews: pd.DataFrame, text_column: str) -> pd.DataFrame:
+        """Stable order (oldest first, undated last, hash tie-break) so new reviews land in the trailing chunks"""
+        ordered = reviews.copy()
+        ordered['_text'] = ordered[text_column].fillna('').astype(str)
+        ordered['_hash'] = ordered['_text'].map(lambda t: hashlib.sha1(t.encode('utf-8')).hexdigest())
+        sort_columns = ['_hash']
+        if 'date_unified' in ordered.columns:
+            ordered['_date'] = pd.to_datetime(ordered['date_unified'], errors='coerce')
+            sort_columns = ['_date', '_hash']
+        return ordered.sort_values(sort_columns, na_position='last', kind='mergesort')
+
+    def _sample_to_budget(self, ordered: pd.DataFrame, total_tokens: int) -> pd.DataFrame:
+        """Deterministic stratified sample across rating and month when a product exceeds the budget"""
+        budget = self.config['chunk_tokens'] * self.config['max_map_chunks']
+        if total_tokens <= budget:
+            return ordered
+
+        fraction = budget / total_tokens
+        strata = []
+        if 'rating_standardized' in ordered.columns:
+            strata.append(ordered['rating_standardized'].fillna(0).round())
+        if '_date' in ordered.columns:
+            strata.append(ordered['_date'].dt.to_period('M').astype(str))
+        if not strata:
+            strata = [pd.Series(0, index=ordered.index)]
+
+        # Lowest hashes per stratum are kept, so the sample is stable as reviews are appended
+        hash_value = ordered['_hash'].str[:12].map(lambda h: int(h, 16))
+        rank = hash_value.groupby(strata).rank(method='first', pct=True)
+        sampled = ordered[rank <= fraction]
+        self.logger.info(f"Sampled {len(sampled)}/{len(ordered)} reviews to fit {budget} token budget")
+        return sampled
+
+    def build_chunks(self, reviews: pd.DataFrame, text_column: str = 'review_text_unified') -> List[List[str]]:
+        """Pack whole reviews into chunks that respect the per-chunk token budget"""
+        ordered = self._order_reviews(reviews, text_column)
+        review_cap = self.config['review_tokens']
+        ordered['_text'] = ordered['_text'].map(lambda t: truncate_to_tokens(' '.join(t.split()), review_cap))
+        ordered['_tokens'] = ordered['_text'].map(estimate_tokens)
+        ordered = ordered[ordered['_text'].str.len() > 0]
+        ordered = self._sample_to_budget(ordered, int(ordered['_tokens'].sum()))
+
+        chunks, current, used = [], [], 0
+        chunk_tokens = self.config['chunk_tokens']
+        for text, tokens in zip(ordered['_text'], ordered['_tokens']):
+            if current and used + tokens > chunk_tokens:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(text)
+            used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _map_chunk(self, product: str, chunk: List[str]) -> Dict:
+        reviews_text = '\n'.join(f"- {text}" for text in chunk)
+        result = self._cached_call(
+            'map', 'product_insight_map', product, reviews_text, self.config['map_max_tokens'],
+            count=len(chunk), reviews=reviews_text
+        )
+        return {**result, 'review_count': len(chunk)}
+
+    def _reduce_group(self, product: str, partials: List[Dict]) -> Dict:
+        if len(partials) == 1:
+            return partials[0]
+        count = sum(p.get('review_count', 0) for p in partials)
+        partials_text = '\n'.join(json.dumps(p, ensure_ascii=False, sort_keys=True) for p in partials)
+        result = self._cached_call(
+            'reduce', 'product_insight_reduce', product, partials_text, self.config['reduce_max_tokens'],
+            count=count, partials=partials_text
+        )
+        return {**result, 'review_count': count}
+
+    def generate(self, product: str, reviews: pd.DataFrame, text_column: str = 'review_text_unified') -> Dict:
+        """Map every chunk concurrently, then reduce partials level by level into one insight"""
+        chunks = self.build_chunks(reviews, text_column)
+        if not chunks:
+            return {'summary': f'No reviews available for {product}', 'strengths': [], 'weaknesses': [], 'recommendations': []}
+
+        self.logger.info(f"🧩 {product}: {len(reviews)} reviews packed into {len(chunks)} chunks")
+
+        with ThreadPoolExecutor(max_workers=self.config['max_workers']) as executor:
+            partials = list(executor.map(lambda chunk: self._map_chunk(product, chunk), chunks))
+
+            fan_in = max(2, self.config['reduce_fan_in'])
+            while len(partials) > 1:
+                groups = [partials[i:i + fan_in] for i in range(0, len(partials), fan_in)]
+                partials = list(executor.map(lambda group: self._reduce_group(product, group), groups))
+
+        insight = partials[0]
+        insight['total_reviews'] = len(reviews)
+        insight['chunks_analyzed'] = len(chunks)
+        return insight
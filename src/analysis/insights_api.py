@@ -0,0 +1,340 @@
+"""
+Insights API - Local read-only HTTP service over the processed review store.
+
+Serves per-product sentiment, rating distributions, recent complaints and top
+issues as JSON. Every processed run is loaded and each review is taken from the
+newest run that has it, so a partial run (only the units that were due) doesn't
+hide the products it skipped; --latest-only serves just the newest file instead.
+Answers are computed once per data version and held in memory; the processed
+directory is re-checked at most every `check_interval` seconds and a new or
+changed file invalidates the cache. Every answer carries an ETag, so
+polling clients get 304 Not Modified until the data changes.
+
+Usage:
+    python -m src.analysis.insights_api                 # port from config.yaml (visualization.dashboard_port)
+    python -m src.analysis.insights_api --port 8600 --processed-dir data/processed
+
+Endpoints (all GET, optional ?product=&source= filters):
+    /health  /products  /sentiment  /ratings  /complaints?limit=20  /issues?limit=10
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import logging
+
+from .aggregate_cube import newest_reviews, read_reviews, review_months
+from .review_queries import discover_runs
+from .review_router import FEATURE_TERMS, compile_terms
+
+DEFAULT_PORT = 8501
+PROCESSED_PREFIXES = ['analyzed_reviews_', 'cleaned_reviews_']
+# Negative terms that name a problem rather than just a mood
+ISSUE_TERMS = FEATURE_TERMS + ['slow', 'crash', 'crashes', 'bloated', 'refund', 'drain', 'scam', 'uninstall', 'ripoff']
+
+
+class InsightsStore:
+    """Processed reviews (newest copy of each across runs) plus per-query answers cached until the files change"""
+
+    def __init__(self, processed_dir: str = 'data/processed', check_interval: float = 2.0,
+                 latest_only: bool = False):
+        self.logger = logging.getLogger('InsightsStore')
+        self.processed_dir = processed_dir
+        self.check_interval = check_interval
+        self.latest_only = latest_only
+        self.issue_pattern = compile_terms(ISSUE_TERMS)
+
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked_at = 0.0
+        self._cache = {}
+        self.df = None
+        self.files = []
+        self.version = 0
+        self.load_error = None
+        self.stats = {'hits': 0, 'misses': 0, 'reloads': 0, 'load_errors': 0}
+
+    def _current_signature(self) -> Tuple:
+        files = discover_runs(self.processed_dir, PROCESSED_PREFIXES, self.latest_only)
+        return tuple((path, os.path.getmtime(path), os.path.getsize(path)) for path in files)
+
+    def refresh(self, force: bool = False):
+        """Reload the processed files if any changed since the last check.
+        
+        A file that can't be read yet (the analyzer is still writing it) keeps the last
+        good data in service; the load is retried on the next check.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            signature = self._current_signature()
+            if signature == self._signature and not force:
+                return
+            try:
+                frames = [read_reviews(path) for path, _, _ in reversed(signature)]
+                df = self._prepare(newest_reviews(frames)) if frames else None
+            except Exception as e:
+                self.load_error = f"{', '.join(os.path.basename(path) for path, _, _ in signature)}: {e}"
+                self.stats['load_errors'] += 1
+                self.logger.warning(f"⚠️ Could not load {self.load_error}; serving the previous data")
+                return
+            self.df = df
+            self.load_error = None
+            self.files = [path for path, _, _ in signature]
+            self._signature = signature
+            self._cache = {}
+            self.version += 1
+            self.stats['reloads'] += 1
+            self.logger.info(f"🔄 Loaded {0 if self.df is None else len(self.df):,} reviews "
+                             f"from {', '.join(os.path.basename(path) for path in self.files) or 'nothing'}")
+
+    def _prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Normalize the columns the answers use"""
+        def column(*names):
+            return next((df[name] for name in names if name in df.columns), pd.Series(np.nan, index=df.index))
+
+        sentiment = pd.to_numeric(column('ai_sentiment_score', 'sentiment_score'), errors='coerce')
+        label = column('ai_sentiment').where(column('ai_sentiment').isin(['positive', 'neutral', 'negative']))
+        label = label.fillna(np.sign(sentiment).map({1.0: 'positive', 0.0: 'neutral', -1.0: 'negative'}))
+        rating = pd.to_numeric(column('rating_standardized'), errors='coerce')
+        date = column('date_unified')
+        date = pd.to_datetime(date, unit='ms', errors='coerce') if pd.api.types.is_numeric_dtype(date) \
+            else pd.to_datetime(date, errors='coerce')
+
+        return pd.DataFrame({
+            'product': df['product_name'].astype(str),
+            'source': column('data_source', 'collection_source').fillna('unknown').astype(str),
+            'rating': rating,
+            'sentiment': sentiment,
+            'label': label,
+            'date': date,
+            'month': review_months(df),
+            'text': column('review_text_unified', 'review_text').fillna('').astype(str),
+            'features': column('ai_features'),
+            'summary': column('ai_summary')
+        })
+
+    def answer(self, endpoint: str, params: Dict[str, str]) -> Tuple[bytes, str]:
+        """(JSON body, ETag) for one query, from cache when the data hasn't changed"""
+        self.refresh()
+        key = (endpoint, tuple(sorted(params.items())))
+        with self._lock:
+            cached = self._cache.get(key)
+            df, version, files, load_error = self.df, self.version, self.files, self.load_error
+            self.stats['hits' if cached is not None else 'misses'] += 1
+        if cached is not None:
+            return cached
+
+        if endpoint == 'health':
+            payload = {'status': 'ok' if df is not None else 'no_data', 'files': [os.path.basename(p) for p in files],
+                       'reviews': 0 if df is None else len(df)}
+            if load_error:
+                payload['load_error'] = load_error
+        elif df is None:
+            raise LookupError(load_error or f"No processed review files in {self.processed_dir}")
+        else:
+            payload = getattr(self, f"_{endpoint}")(self._filter(df, params), params)
+        payload = {'data_version': version, **payload}
+
+        body = json.dumps(payload, default=str, ensure_ascii=False).encode('utf-8')
+        result = (body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"')
+        with self._lock:
+            # Health also reports load errors, which don't bump the version
+            if self.version == version and endpoint != 'health':
+                self._cache[key] = result
+        return result
+
+    @staticmethod
+    def _filter(df: pd.DataFrame, params: Dict[str, str]) -> pd.DataFrame:
+        if params.get('product'):
+            df = df[df['product'].str.lower() == params['product'].strip().lower()]
+        if params.get('source'):
+            df = df[df['source'] == params['source']]
+        return df
+
+    @staticmethod
+    def _limit(params: Dict[str, str], default: int) -> int:
+        try:
+            return max(1, min(int(params.get('limit', default)), 500))
+        except ValueError:
+            raise ValueError(f"limit must be an integer, not {params['limit']!r}")
+
+    @staticmethod
+    def _mean(values: pd.Series) -> Optional[float]:
+        return None if values.notna().sum() == 0 else round(float(values.mean()), 4)
+
+    def _products(self, df: pd.DataFrame, params: Dict) -> Dict:
+        products = []
+        for product, group in df.groupby('product', sort=True):
+            products.append({'product': product, 'reviews': len(group),
+                             'avg_rating': self._mean(group['rating']),
+                             'avg_sentiment': self._mean(group['sentiment']),
+                             'sources': group['source'].value_counts().to_dict()})
+        return {'products': products}
+
+    def _sentiment(self, df: pd.DataFrame, params: Dict) -> Dict:
+        by_month = df.groupby('month', sort=True)['sentiment'].mean().round(4)
+        return {
+            'reviews': len(df),
+            'avg_sentiment': self._mean(df['sentiment']),
+            'labels': df['label'].value_counts().to_dict(),
+            'by_source': {source: self._mean(group['sentiment']) for source, group in df.groupby('source')},
+            'by_month': {month: (None if pd.isna(value) else float(value)) for month, value in by_month.items()}
+        }
+
+    def _ratings(self, df: pd.DataFrame, params: Dict) -> Dict:
+        stars = df['rating'].dropna().round().clip(1, 5).astype(int)
+        counts = stars.value_counts().reindex(range(1, 6), fill_value=0)
+        total = int(counts.sum())
+        return {
+            'rated_reviews': total,
+            'avg_rating': self._mean(df['rating']),
+            'distribution': {str(star): {'reviews': int(count), 'share': round(count / total, 4) if total else 0.0}
+                             for star, count in counts.items()}
+        }
+
+    def _complaints_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        negative = (df['label'] == 'negative') | (df['rating'] <= 2)
+        return df[negative]
+
+    def _complaints(self, df: pd.DataFrame, params: Dict) -> Dict:
+        limit = self._limit(params, 20)
+        complaints = self._complaints_frame(df).sort_values('date', ascending=False, na_position='last').head(limit)
+        return {'complaints': [
+            {'product': row.product, 'source': row.source,
+             'date': None if pd.isna(row.date) else row.date.isoformat(),
+             'rating': None if pd.isna(row.rating) else float(row.rating),
+             'sentiment': None if pd.isna(row.sentiment) else float(row.sentiment),
+             'summary': row.summary if isinstance(row.summary, str) and row.summary else None,
+             'text': row.text[:500]}
+            for row in complaints.itertuples(index=False)
+        ]}
+
+    def _issues(self, df: pd.DataFrame, params: Dict) -> Dict:
+        limit = self._limit(params, 10)
+        complaints = self._complaints_frame(df)
+        # AI-extracted features where the analyzer ran, otherwise issue terms found in the text
+        found = complaints['text'].str.findall(self.issue_pattern)
+        mentions = pd.Series([features if isinstance(features, list) and features else terms
+                              for features, terms in zip(complaints['features'], found)], dtype=object)
+        counts = mentions.explode().dropna().astype(str).str.lower().value_counts().head(limit)
+        return {'complaints': len(complaints),
+                'issues': [{'issue': issue, 'mentions': int(count)} for issue, count in counts.items()]}
+
+
+class InsightsServer:
+    """Threaded HTTP server exposing an InsightsStore (GET only, JSON, ETag/304)"""
+
+    ENDPOINTS = ('health', 'products', 'sentiment', 'ratings', 'complaints', 'issues')
+
+    def __init__(self, store: InsightsStore = None, port: int = DEFAULT_PORT, host: str = '127.0.0.1'):
+        self.logger = logging.getLogger('InsightsServer')
+        self.store = store or InsightsStore()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                endpoint = parts.path.strip('/') or 'health'
+                params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                if endpoint not in server.ENDPOINTS:
+                    return self._send(404, {'error': f"unknown endpoint /{endpoint}"})
+                try:
+                    body, etag = server.store.answer(endpoint, params)
+                except LookupError as e:
+                    return self._send(503, {'error': str(e)})
+                except ValueError as e:
+                    return self._send(400, {'error': str(e)})
+
+                if etag in [tag.strip().removeprefix('W/') for tag in self.headers.get('If-None-Match', '').split(',')]:
+                    return self._send_raw(304, b'', etag)
+                self._send_raw(200, body, etag)
+
+            def _send(self, status: int, payload: Dict):
+                self._send_raw(status, json.dumps(payload).encode('utf-8'))
+
+            def _send_raw(self, status: int, body: bytes, etag: str = None):
+                self.send_response(status)
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                if status != 304:
+                    self.send_header('Content-Type', 'application/json; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                server.logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> 'InsightsServer':
+        self.store.refresh(force=True)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _configured_port(config_path: str) -> int:
+    try:
+        import yaml
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return int(yaml.safe_load(f).get('visualization', {}).get('dashboard_port', DEFAULT_PORT))
+    except (ImportError, OSError, AttributeError, TypeError, ValueError):
+        return DEFAULT_PORT
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--port', type=int, default=None, help='defaults to visualization.dashboard_port')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--processed-dir', default='data/processed')
+    parser.add_argument('--check-interval', type=float, default=2.0, help='seconds between file change checks')
+    parser.add_argument('--latest-only', action='store_true', help='serve only the newest processed file')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    store = InsightsStore(args.processed_dir, args.check_interval, args.latest_only)
+    server = InsightsServer(store, args.port or _configured_port(args.config), args.host)
+    store.refresh(force=True)
+    print(f"Serving review insights on {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,11 +6,13 @@ import pandas as pd
 import numpy as np
 import json
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime
-import openai
-from openai import OpenAI
+from .review_router import ReviewRouter
+from .insight_engine import InsightEngine
+from .structured_output import StructuredOutputClient, StructuredOutputError
+from .prompt_templates import PROMPTS
 
 class OpenAIAnalyzer:
     """OpenAI-powered analysis for consumer security reviews"""
@@ -24,9 +26,28 @@ class OpenAIAnalyzer:
         if not api_key:
             raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
         
+        # Deferred so importing the analysis package stays cheap
+        from openai import OpenAI
         self.client = OpenAI(api_key=api_key)
         self.model = self.config.get('openai', {}).get('model', 'gpt-4o-mini')
         
+        # Schema-constrained, streamed responses with repair and targeted re-asks
+        self.structured = StructuredOutputClient(
+            self.client,
+            self.model,
+            stream=self.config.get('openai', {}).get('stream', True)
+        )
+        
+        # Cheap pre-scoring so only low-confidence reviews reach the API
+        self.router = ReviewRouter(self.config.get('analysis', {}).get('routing', {}))
+        
+        # Map-reduce product insights over all reviews, with cached chunk summaries
+        self.insight_engine = InsightEngine(
+            self._complete_json,
+            model=self.model,
+            config=self.config.get('analysis', {}).get('insights', {})
+        )
+        
     def _setup_logger(self):
         logger = logging.getLogger('OpenAIAnalyzer')
         logger.setLevel(logging.INFO)
@@ -46,26 +67,27 @@ class OpenAIAnalyzer:
             return {'openai': {'model': 'gpt-4o-mini', 'max_tokens': 1500, 'temperature': 0.1}}
     
     def analyze_batch_sentiment(self, df: pd.DataFrame, batch_size: int = 10) -> pd.DataFrame:
-        """Analyze sentiment using OpenAI API in batches"""
+        """Analyze sentiment using OpenAI API in batches, escalating only low-confidence reviews"""
         self.logger.info(f"🤖 Starting OpenAI sentiment analysis for {len(df)} reviews...")
         
+        routing = self.router.route(df)
+        escalated = df[routing['route'] == 'llm']
+        
         results = []
         
-        for i in range(0, len(df), batch_size):
-            batch = df.iloc[i:i+batch_size]
-            self.logger.info(f"Processing batch {i//batch_size + 1}/{(len(df)-1)//batch_size + 1}")
+        # Confident reviews are labelled from the heuristic score without an API call
+        for idx in routing.index[routing['route'] == 'heuristic']:
+            analysis = self.router.heuristic_analysis(df.at[idx, 'review_text_unified'], routing.at[idx, 'route_score'])
+            results.append(self._build_result_row(idx, analysis, routing.at[idx, 'route_confidence']))
+        
+        for i in range(0, len(escalated), batch_size):
+            batch = escalated.iloc[i:i+batch_size]
+            self.logger.info(f"Processing batch {i//batch_size + 1}/{(len(escalated)-1)//batch_size + 1}")
             
             for idx, row in batch.iterrows():
                 try:
                     analysis = self._analyze_single_review(row['review_text_unified'], row['product_name'])
-                    results.append({
-                        'index': idx,
-                        'ai_sentiment': analysis.get('sentiment', 'neutral'),
-                        'ai_sentiment_score': analysis.get('score', 0.0),
-                        'ai_key_points': analysis.get('key_points', []),
-                        'ai_features': analysis.get('features', []),
-                        'ai_summary': analysis.get('summary', '')
-                    })
+                    results.append(self._build_result_row(idx, analysis, routing.at[idx, 'route_confidence']))
                 except Exception as e:
                     self.logger.error(f"Error analyzing review {idx}: {e}")
                     results.append({
@@ -74,54 +96,61 @@ class OpenAIAnalyzer:
                         'ai_sentiment_score': 0.0,
                         'ai_key_points': [],
                         'ai_features': [],
-                        'ai_summary': 'Analysis failed'
+                        'ai_summary': 'Analysis failed',
+                        'ai_route': 'failed',
+                        'ai_route_confidence': routing.at[idx, 'route_confidence']
                     })
         
         # Merge results back to dataframe
         results_df = pd.DataFrame(results).set_index('index')
         df = df.join(results_df, how='left')
         
-        self.logger.info(f"✅ Completed OpenAI analysis for {len(df)} reviews")
+        llm_stats = self.structured.get_stats()
+        self.logger.info(
+            f"✅ Completed OpenAI analysis for {len(df)} reviews "
+            f"({len(escalated)} escalated, {self.router.stats.get('llm_call_reduction', 0):.0%} saved by routing, "
+            f"{llm_stats['failed_parse_rate']:.1%} failed parses, {llm_stats['wasted_calls']} wasted calls)"
+        )
         return df
     
+    def _build_result_row(self, idx, analysis: Dict, route_confidence: float) -> Dict:
+        """Flatten an analysis dict into result columns, recording which path produced it"""
+        return {
+            'index': idx,
+            'ai_sentiment': analysis.get('sentiment', 'neutral'),
+            'ai_sentiment_score': analysis.get('score', 0.0),
+            'ai_key_points': analysis.get('key_points', []),
+            'ai_features': analysis.get('features', []),
+            'ai_summary': analysis.get('summary', ''),
+            'ai_route': analysis.get('analysis_method', 'llm'),
+            'ai_route_confidence': route_confidence
+        }
+    
     def _analyze_single_review(self, review_text: str, product_name: str) -> Dict:
         """Analyze a single review using OpenAI"""
         
-        prompt = f"""Analyze this security software review for {product_name}:
-
-"{review_text}"
-
-Return ONLY a JSON object with:
-{{
-  "sentiment": "positive", "negative", or "neutral",
-  "score": float between -1 and 1,
-  "key_points": ["list of main points mentioned"],
-  "features": ["security features discussed"],
-  "summary": "brief 1-sentence summary"
-}}"""
-
+        template = PROMPTS.get('review_analysis')
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.1
+            analysis = self.structured.request(
+                PROMPTS.render('review_analysis', product=product_name, review=review_text),
+                template.schema,
+                schema_name=template.name,
+                max_tokens=800
             )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # Clean up the response to ensure valid JSON
-            if result_text.startswith('```json'):
-                result_text = result_text.replace('```json', '').replace('```', '').strip()
-            
-            return json.loads(result_text)
-            
-        except json.JSONDecodeError as e:
-            self.logger.error(f"JSON decode error: {e}")
+        except StructuredOutputError as e:
+            self.logger.error(f"Unusable structured output: {e}")
             return self._get_fallback_analysis(review_text)
         except Exception as e:
             self.logger.error(f"OpenAI API error: {e}")
             return self._get_fallback_analysis(review_text)
+        
+        # Salvage partial responses: only the labels themselves need the keyword fallback
+        if 'sentiment' not in analysis or 'score' not in analysis:
+            fallback = self._get_fallback_analysis(review_text)
+            return {**fallback, **{k: v for k, v in analysis.items() if k not in ('sentiment', 'score')}}
+        
+        return {'key_points': [], 'features': [], 'summary': '', **analysis}
     
     def _get_fallback_analysis(self, review_text: str) -> Dict:
         """Fallback analysis if OpenAI fails"""
@@ -148,11 +177,12 @@ Return ONLY a JSON object with:
             'score': score,
             'key_points': ['Analysis unavailable'],
             'features': [],
-            'summary': 'Fallback analysis used'
+            'summary': 'Fallback analysis used',
+            'analysis_method': 'keyword_fallback'
         }
     
     def generate_product_insights(self, df: pd.DataFrame) -> Dict:
-        """Generate insights by product using OpenAI"""
+        """Generate insights by product using map-reduce summarization over all reviews"""
         self.logger.info("🔍 Generating product insights...")
         
         insights = {}
@@ -160,15 +190,8 @@ Return ONLY a JSON object with:
         for product in df['product_name'].unique():
             product_reviews = df[df['product_name'] == product]
             
-            # Sample reviews for analysis (max 20 for cost efficiency)
-            sample_reviews = product_reviews.sample(min(20, len(product_reviews)))
-            
-            # Combine review texts
-            combined_text = ' '.join(sample_reviews['review_text_unified'].astype(str))
-            
             try:
-                insight = self._get_product_insight(product, combined_text, len(product_reviews))
-                insights[product] = insight
+                insights[product] = self.insight_engine.generate(product, product_reviews)
             except Exception as e:
                 self.logger.error(f"Error generating insight for {product}: {e}")
                 insights[product] = {
@@ -178,47 +201,31 @@ Return ONLY a JSON object with:
                     'recommendations': []
                 }
         
+        self.insight_engine.save_cache()
+        stats = self.insight_engine.stats
+        self.logger.info(
+            f"📚 Insight calls: {stats['map_calls']} map, {stats['reduce_calls']} reduce, "
+            f"{stats['cache_hits']} served from cache"
+        )
+        
         return insights
     
-    def _get_product_insight(self, product: str, combined_text: str, total_reviews: int) -> Dict:
-        """Get insights for a specific product"""
-        
-        prompt = f"""Analyze these {total_reviews} reviews for {product} security software:
-
-{combined_text[:4000]}...
-
-Return ONLY a JSON object with:
-{{
-  "summary": "2-sentence overall assessment",
-  "strengths": ["top 3 strengths mentioned"],
-  "weaknesses": ["top 3 weaknesses mentioned"],
-  "recommendations": ["2-3 recommendations for improvement"]
-}}"""
-
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-                temperature=0.1
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # Clean up the response
-            if result_text.startswith('```json'):
-                result_text = result_text.replace('```json', '').replace('```', '').strip()
-            
-            return json.loads(result_text)
-            
-        except Exception as e:
-            self.logger.error(f"Error in product insight: {e}")
-            return {
-                'summary': f'Analysis unavailable for {product}',
-                'strengths': [],
-                'weaknesses': [],
-                'recommendations': []
-            }
+    def _complete_json(self, template_name: str, max_tokens: int = 1000, **variables) -> Dict:
+        """Render a registered prompt template and request its JSON object through the structured output layer"""
+        template = PROMPTS.get(template_name)
+        return self.structured.request(
+            PROMPTS.render(template_name, **variables),
+            template.schema,
+            schema_name=template.name,
+            max_tokens=max_tokens
+        )
+    
+    def get_token_report(self) -> Dict:
+        """Input tokens per prompt template plus provider-reported usage"""
+        return {
+            'templates': PROMPTS.token_report(),
+            'usage': self.structured.get_stats()
+        }
     
     def save_analysis_results(self, df: pd.DataFrame, insights: Dict, output_dir: str = 'data/processed'):
         """Save analysis results"""
@@ -0,0 +1,244 @@
+"""
+Prompt Templates - Versioned static prefixes and variable suffixes for every LLM call.
+
+Static instructions and the response schema go first so provider-side prompt-prefix
+caching can reuse them across calls; only the short variable suffix changes per review.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import logging
+
+from .structured_output import describe_schema, object_schema
+
+_ENCODER = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Count tokens with tiktoken when installed, otherwise approximate at ~4 chars/token"""
+    global _ENCODER
+    if _ENCODER is None:
+        try:
+            import tiktoken
+            _ENCODER = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            _ENCODER = False
+    if _ENCODER:
+        return len(_ENCODER.encode(text))
+    return max(1, len(text) // 4)
+
+
+REVIEW_SCHEMA = object_schema({
+    'sentiment': {'type': 'string', 'enum': ['positive', 'negative', 'neutral']},
+    'score': {'type': 'number'},
+    'key_points': {'type': 'array', 'items': {'type': 'string'}},
+    'features': {'type': 'array', 'items': {'type': 'string'}},
+    'summary': {'type': 'string'}
+})
+
+INSIGHT_SCHEMA = object_schema({
+    'summary': {'type': 'string'},
+    'strengths': {'type': 'array', 'items': {'type': 'string'}},
+    'weaknesses': {'type': 'array', 'items': {'type': 'string'}},
+    'recommendations': {'type': 'array', 'items': {'type': 'string'}}
+})
+
+MARKET_SENTIMENT_SCHEMA = object_schema({
+    'sentiment_score': {'type': 'integer'},
+    'sentiment_label': {'type': 'string', 'enum': ['positive', 'negative', 'neutral']},
+    'main_category': {'type': 'string', 'enum': ['performance', 'privacy', 'support', 'usability']},
+    'key_issues': {'type': 'array', 'items': {'type': 'string'}},
+    'business_impact': {'type': 'string', 'enum': ['low', 'medium', 'high']},
+    'competitor_mentions': {'type': 'array', 'items': {'type': 'string'}}
+})
+MARKET_MULTITASK_SCHEMA = object_schema({
+    'sentiment': MARKET_SENTIMENT_SCHEMA,
+    'strategic': object_schema({
+        'market_opportunities': {'type': 'array', 'items': {'type': 'string'}},
+        'competitive_advantages': {'type': 'array', 'items': {'type': 'string'}},
+        'product_gaps': {'type': 'array', 'items': {'type': 'string'}},
+        'revenue_impact': {'type': 'string', 'enum': ['low', 'medium', 'high']},
+        'revenue_rationale': {'type': 'string'}
+    })
+})
+
+SOLUTION_SCHEMA = object_schema({
+    'solution_title': {'type': 'string'},
+    'action_items': {'type': 'array', 'items': {'type': 'string'}},
+    'evidence_strategy': {'type': 'array', 'items': {'type': 'string'}},
+    'roi_projection': {'type': 'string'},
+    'timeline': {'type': 'string'},
+    'investment_required': {'type': 'string'}
+})
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A static system+schema prefix followed by a variable user suffix"""
+    name: str
+    version: str
+    system: str
+    user_template: str
+    schema: Optional[Dict] = None
+
+    @property
+    def prefix(self) -> str:
+        """The byte-identical static part shared by every call of this template"""
+        if self.schema:
+            return f"{self.system}\nReply with ONLY one JSON object: {describe_schema(self.schema)}"
+        return self.system
+
+    def render(self, **variables) -> List[Dict]:
+        """Messages with the static prefix first and the variable suffix last"""
+        return [
+            {'role': 'system', 'content': self.prefix},
+            {'role': 'user', 'content': self.user_template.format(**variables)}
+        ]
+
+
+class PromptRegistry:
+    """Registry of prompt templates that tracks input tokens per template"""
+
+    def __init__(self):
+        self.logger = logging.getLogger('PromptRegistry')
+        self._templates = {}
+        self._usage = {}
+        self._lock = threading.Lock()
+
+    def register(self, template: PromptTemplate) -> PromptTemplate:
+        self._templates[template.name] = template
+        self._usage[template.name] = {
+            'calls': 0,
+            'prefix_tokens': estimate_tokens(template.prefix),
+            'suffix_tokens': 0
+        }
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        if name not in self._templates:
+            raise KeyError(f"Unknown prompt template: {name}")
+        return self._templates[name]
+
+    def render(self, name: str, **variables) -> List[Dict]:
+        """Render a template and record its prefix/suffix token counts"""
+        template = self.get(name)
+        messages = template.render(**variables)
+        suffix_tokens = estimate_tokens(messages[-1]['content'])
+        with self._lock:
+            usage = self._usage[name]
+            usage['calls'] += 1
+            usage['suffix_tokens'] += suffix_tokens
+        return messages
+
+    def token_report(self) -> Dict:
+        """Per-template input-token accounting: static prefix vs. variable suffix"""
+        report = {}
+        with self._lock:
+            for name, usage in self._usage.items():
+                calls = usage['calls']
+                avg_suffix = usage['suffix_tokens'] / calls if calls else 0.0
+                report[name] = {
+                    'version': self._templates[name].version,
+                    'calls': calls,
+                    'prefix_tokens': usage['prefix_tokens'],
+                    'avg_suffix_tokens': round(avg_suffix, 1),
+                    'avg_input_tokens': round(usage['prefix_tokens'] + avg_suffix, 1),
+                    'total_input_tokens': usage['prefix_tokens'] * calls + usage['suffix_tokens'],
+                    'cacheable_share': round(usage['prefix_tokens'] / (usage['prefix_tokens'] + avg_suffix), 3) if calls else 0.0
+                }
+        return report
+
+
+PROMPTS = PromptRegistry()
+
+PROMPTS.register(PromptTemplate(
+    name='review_analysis',
+    version='2',
+    system=(
+        "You analyze consumer security software reviews. "
+        "sentiment: overall polarity; score: -1 (very negative) to 1 (very positive); "
+        "key_points: main points; features: security features discussed; summary: one sentence."
+    ),
+    user_template="Product: {product}\nReview: {review}",
+    schema=REVIEW_SCHEMA
+))
+
+PROMPTS.register(PromptTemplate(
+    name='product_insight_map',
+    version='2',
+    system=(
+        "You summarize batches of consumer security software reviews (one per line). "
+        "summary: 2 sentences; strengths, weaknesses, recommendations: short phrases."
+    ),
+    user_template="Product: {product}\nReviews ({count}):\n{reviews}",
+    schema=INSIGHT_SCHEMA
+))
+
+PROMPTS.register(PromptTemplate(
+    name='product_insight_reduce',
+    version='2',
+    system=(
+        "You merge partial analyses of consumer security software reviews into one assessment, "
+        "weighing each partial by its review_count. "
+        "summary: 2 sentences; top 3 strengths; top 3 weaknesses; 2-3 recommendations."
+    ),
+    user_template="Product: {product}\nReviews covered: {count}\nPartials:\n{partials}",
+    schema=INSIGHT_SCHEMA
+))
+
+PROMPTS.register(PromptTemplate(
+    name='market_sentiment',
+    version='2',
+    system=(
+        "You are a senior business analyst specializing in cybersecurity market intelligence. "
+        "Analyze a security software review for sentiment and categorization. "
+        "sentiment_score: 1-10; key_issues and competitor_mentions: short lists."
+    ),
+    user_template="Review: {text}",
+    schema=MARKET_SENTIMENT_SCHEMA
+))
+
+PROMPTS.register(PromptTemplate(
+    name='market_strategic',
+    version='2',
+    system=(
+        "You are a senior business analyst specializing in cybersecurity market intelligence. "
+        "Analyze user feedback for strategic business insights: market opportunities, "
+        "competitive advantages, product gaps or weaknesses, and revenue impact potential. "
+        "Format as structured analysis."
+    ),
+    user_template="Content: {text}"
+))
+
+PROMPTS.register(PromptTemplate(
+    name='market_multitask',
+    version='2',
+    system=(
+        "You are a senior business analyst specializing in cybersecurity market intelligence. "
+        "For one piece of user feedback, produce both analyses in a single object. "
+        "sentiment: sentiment and categorization (sentiment_score 1-10; key_issues and competitor_mentions: short lists). "
+        "strategic: market opportunities, competitive advantages, product gaps or weaknesses, "
+        "and revenue impact potential with a one-sentence rationale."
+    ),
+    user_template="Content: {text}",
+    schema=MARKET_MULTITASK_SCHEMA
+))
+
+PROMPTS.register(PromptTemplate(
+    name='strategic_solution',
+    version='2',
+    system=(
+        "You are a senior strategy consultant with expertise in cybersecurity market dynamics "
+        "and business transformation. Given a critical market issue, provide a strategic solution: "
+        "solution_title: concise and action-oriented; action_items: 4-5 concrete steps; "
+        "evidence_strategy: how to prove effectiveness; roi_projection: quantified business impact; "
+        "timeline: implementation timeline; investment_required: investment requirements. "
+        "Focus on practical, measurable strategies that address root causes and create competitive advantage."
+    ),
+    user_template=(
+        "Company: {company}\nProblem: {issue_type} - {description}\nEvidence: {evidence}\n"
+        "Market Impact: {market_impact}\nSeverity: {severity}"
+    ),
+    schema=SOLUTION_SCHEMA
+))
@@ -0,0 +1,251 @@
+"""
+Review Queries - DuckDB views and canned analytical queries over collected and cleaned review files.
+"""
+
+import glob
+import os
+import re
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+# Preferred format first when a run saved the same data several ways (e.g. .json and .csv)
+FORMATS = ['.parquet', '.jsonl', '.json', '.csv']
+READERS = {
+    '.parquet': "read_parquet({files}, union_by_name = true, filename = true)",
+    '.jsonl': "read_json_auto({files}, format = 'newline_delimited', union_by_name = true, filename = true)",
+    '.json': "read_json_auto({files}, union_by_name = true, filename = true)",
+    '.csv': "read_csv_auto({files}, union_by_name = true, filename = true)"
+}
+# view -> (directory key, file-name prefix groups); latest_only keeps the newest run of each group
+VIEW_FILES = {
+    'raw_reviews': ('raw', [['combined_reviews_']]),
+    'product_info': ('raw', [[f"{source}_product_info_"] for source in ('amazon', 'appstore', 'playstore', 'reddit')]),
+    'processed_reviews': ('processed', [['analyzed_reviews_', 'cleaned_reviews_']])
+}
+# Views whose every run is a full snapshot, so only the newest run of each group is read
+SNAPSHOT_VIEWS = {'product_info'}
+CANNED_QUERIES = ['sentiment_by_product', 'rating_distribution', 'source_comparison', 'temporal_analysis']
+
+_TIMESTAMP = re.compile(r'(\d{8}_\d{6})')
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _sql_list(values: Sequence[str]) -> str:
+    return '[' + ', '.join(_sql_string(value) for value in values) + ']'
+
+
+def discover_runs(directory: str, prefixes: List[str], latest_only: bool = True) -> List[str]:
+    """Data files whose names start with one of `prefixes`, one (preferred) format per run, oldest run first"""
+    runs = {}
+    for prefix in prefixes:
+        for path in glob.glob(os.path.join(directory, f"{prefix}*")):
+            stem, ext = os.path.splitext(path)
+            if ext not in FORMATS or stem.endswith('_metadata'):
+                continue
+            best = runs.get(stem)
+            if best is None or FORMATS.index(ext) < FORMATS.index(os.path.splitext(best)[1]):
+                runs[stem] = path
+
+    def run_key(stem):
+        match = _TIMESTAMP.search(os.path.basename(stem))
+        return (match.group(1) if match else '', os.path.getmtime(runs[stem]))
+
+    stems = sorted(runs, key=run_key)
+    if latest_only:
+        stems = stems[-1:]
+    return [runs[stem] for stem in stems]
+
+
+class ReviewQueries:
+    """Register review outputs as DuckDB views and answer chart queries in SQL.
+    
+    By default every run is read and the `reviews` view keeps each review from the newest
+    run that has it (same keys as aggregate_cube.review_keys), so partial runs don't hide
+    the products they skipped. latest_only=True reads just the newest run instead.
+    """
+
+    def __init__(self, raw_dir: str = 'data/raw', processed_dir: str = 'data/processed',
+                 latest_only: bool = False, database: str = ':memory:'):
+        import duckdb
+
+        self.logger = logging.getLogger('ReviewQueries')
+        self.dirs = {'raw': raw_dir, 'processed': processed_dir}
+        self.latest_only = latest_only
+        self.con = duckdb.connect(database)
+        self.views = {}
+        self.refresh()
+
+    def discover(self, directory: str, groups: List[List[str]], latest_only: bool = None) -> List[str]:
+        """Data files for each prefix group, one format per run (latest run per group if latest_only)"""
+        latest_only = self.latest_only if latest_only is None else latest_only
+        files = []
+        for prefixes in groups:
+            files.extend(discover_runs(directory, prefixes, latest_only))
+        return files
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """(Re)create the file views and the normalized `reviews` view; returns files per view"""
+        self.views = {}
+        for view, (dir_key, groups) in VIEW_FILES.items():
+            files = self.discover(self.dirs[dir_key], groups, self.latest_only or view in SNAPSHOT_VIEWS)
+            if not files:
+                self.con.execute(f"DROP VIEW IF EXISTS {view}")
+                continue
+            by_format = {}
+            for path in files:
+                by_format.setdefault(os.path.splitext(path)[1], []).append(path)
+            selects = [f"SELECT * FROM {READERS[ext].format(files=_sql_list(paths))}"
+                       for ext, paths in by_format.items()]
+            self.con.execute(f"CREATE OR REPLACE VIEW {view} AS " + ' UNION ALL BY NAME '.join(selects))
+            self.views[view] = files
+
+        source = 'processed_reviews' if 'processed_reviews' in self.views else 'raw_reviews'
+        if source in self.views:
+            self.con.execute(f"CREATE OR REPLACE VIEW reviews AS {self._normalized_reviews(source)}")
+        else:
+            self.con.execute("DROP VIEW IF EXISTS reviews")
+        self.logger.info(f"🦆 Registered views: " + ', '.join(
+            f"{view} ({len(files)} file{'s' if len(files) != 1 else ''})" for view, files in self.views.items()))
+        return dict(self.views)
+
+    def columns(self, view: str) -> Dict[str, str]:
+        """Column name -> DuckDB type"""
+        return {row[0]: row[1] for row in self.con.execute(f"DESCRIBE {view}").fetchall()}
+
+    def _normalized_reviews(self, view: str) -> str:
+        """One row per review with product, source, rating (1-5), sentiment and date, from cleaned or raw files"""
+        columns = self.columns(view)
+
+        def timestamp(column: str) -> Optional[str]:
+            kind = columns.get(column)
+            if kind is None:
+                return None
+            if kind.startswith('TIMESTAMP') or kind == 'DATE':
+                return f"CAST({column} AS TIMESTAMP)"
+            if kind in ('BIGINT', 'DOUBLE', 'INTEGER', 'HUGEINT'):
+                # pandas to_json writes datetimes as epoch milliseconds
+                return f"epoch_ms(CAST({column} AS BIGINT))"
+            return f"TRY_CAST({column} AS TIMESTAMP)"
+
+        source = 'data_source' if 'data_source' in columns else 'collection_source'
+        if 'rating_standardized' in columns:
+            rating = 'CAST(rating_standardized AS DOUBLE)'
+        else:
+            # Same mapping as DataCleaner._standardize_ratings
+            rating = (f"CASE WHEN rating IS NULL THEN NULL "
+                      f"WHEN {source} = 'reddit' THEN CASE WHEN rating >= 100 THEN 5 WHEN rating >= 50 THEN 4 "
+                      f"WHEN rating >= 10 THEN 3 WHEN rating >= 0 THEN 2 ELSE 1 END "
+                      f"ELSE greatest(1, least(5, CAST(rating AS DOUBLE))) END")
+        scores = [column for column in ('ai_sentiment_score', 'sentiment_score') if column in columns]
+        sentiment = f"CAST(coalesce({', '.join(scores)}) AS DOUBLE)" if scores else 'CAST(NULL AS DOUBLE)'
+
+        dates = [timestamp(column) for column in ('date_unified', 'date') if column in columns]
+        if 'created_utc' in columns:
+            dates.append("to_timestamp(TRY_CAST(created_utc AS DOUBLE))::TIMESTAMP")
+        review_date = f"coalesce({', '.join(dates)})" if dates else 'CAST(NULL AS TIMESTAMP)'
+
+        return (f"SELECT product_name, {source} AS data_source, {rating} AS rating, "
+                f"{sentiment} AS sentiment, {review_date} AS review_date, filename FROM {self._newest_rows(view)}")
+
+    def _newest_rows(self, view: str) -> str:
+        """`view`, or with several runs only each review's rows from the newest run that has it"""
+        files = self.views[view]
+        if len(files) < 2:
+            return view
+        columns = self.columns(view)
+
+        def text(column: str) -> str:
+            return f"coalesce(CAST({column} AS VARCHAR), '')" if column in columns else "''"
+
+        # Same identity as aggregate_cube.review_keys: product, source and id, else identifying content
+        ids = [f"nullif({text(column)}, '')" for column in ('review_id', 'id') if column in columns]
+        content = " || '|' || ".join(text(column) for column in ('reviewer_name', 'date', 'review_text'))
+        key = f"{text('product_name')} || '|' || {text('source')} || '|' || coalesce({', '.join(ids + [content])})"
+        run = 'CASE filename ' + ' '.join(
+            f"WHEN {_sql_string(path)} THEN {number}" for number, path in enumerate(files)) + ' END'
+        return (f"(SELECT * FROM (SELECT *, {run} AS _run, {key} AS _review_key FROM {view}) "
+                f"QUALIFY _run = max(_run) OVER (PARTITION BY _review_key))")
+
+    def query(self, sql: str, params: Sequence = None) -> pd.DataFrame:
+        """Run any SQL against the registered views"""
+        return self.con.execute(sql, params or []).df()
+
+    def _filters(self, products: Sequence[str] = None, sources: Sequence[str] = None) -> Tuple[str, List]:
+        clauses, params = [], []
+        if products:
+            clauses.append(f"product_name IN ({', '.join('?' for _ in products)})")
+            params.extend(products)
+        if sources:
+            clauses.append(f"data_source IN ({', '.join('?' for _ in sources)})")
+            params.extend(sources)
+        return ('WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def sentiment_by_product(self, products: Sequence[str] = None, sources: Sequence[str] = None) -> pd.DataFrame:
+        """Review count, mean sentiment and rating, and positive/negative shares per product"""
+        where, params = self._filters(products, sources)
+        return self.query(f"""
+            SELECT product_name,
+                   count(*) AS reviews,
+                   avg(sentiment) AS avg_sentiment,
+                   avg(rating) AS avg_rating,
+                   avg(CAST(sentiment > 0 AS DOUBLE)) AS positive_share,
+                   avg(CAST(sentiment < 0 AS DOUBLE)) AS negative_share
+            FROM reviews {where}
+            GROUP BY product_name
+            ORDER BY reviews DESC, product_name""", params)
+
+    def rating_distribution(self, products: Sequence[str] = None, sources: Sequence[str] = None) -> pd.DataFrame:
+        """Reviews per product and whole-star rating, with each star's share of the product"""
+        where, params = self._filters(products, sources)
+        where = f"{where} AND rating IS NOT NULL" if where else "WHERE rating IS NOT NULL"
+        return self.query(f"""
+            SELECT product_name,
+                   CAST(round(rating) AS INTEGER) AS stars,
+                   count(*) AS reviews,
+                   count(*) / sum(count(*)) OVER (PARTITION BY product_name) AS share
+            FROM reviews {where}
+            GROUP BY product_name, stars
+            ORDER BY product_name, stars""", params)
+
+    def source_comparison(self, products: Sequence[str] = None, sources: Sequence[str] = None) -> pd.DataFrame:
+        """Volume, rating and sentiment per source and product"""
+        where, params = self._filters(products, sources)
+        return self.query(f"""
+            SELECT data_source,
+                   product_name,
+                   count(*) AS reviews,
+                   avg(rating) AS avg_rating,
+                   avg(sentiment) AS avg_sentiment
+            FROM reviews {where}
+            GROUP BY data_source, product_name
+            ORDER BY data_source, reviews DESC""", params)
+
+    def temporal_analysis(self, period: str = 'quarter', products: Sequence[str] = None,
+                          sources: Sequence[str] = None) -> pd.DataFrame:
+        """Volume, rating and sentiment per product and month / quarter / year"""
+        if period not in ('month', 'quarter', 'year'):
+            raise ValueError(f"period must be month, quarter or year, not {period!r}")
+        where, params = self._filters(products, sources)
+        where = f"{where} AND review_date IS NOT NULL" if where else "WHERE review_date IS NOT NULL"
+        return self.query(f"""
+            SELECT product_name,
+                   date_trunc('{period}', review_date) AS period,
+                   count(*) AS reviews,
+                   avg(rating) AS avg_rating,
+                   avg(sentiment) AS avg_sentiment
+            FROM reviews {where}
+            GROUP BY product_name, period
+            ORDER BY product_name, period""", params)
+
+    def chart(self, name: str, **kwargs) -> pd.DataFrame:
+        """Run one of the canned chart queries (visualization.charts in config.yaml) by name"""
+        if name not in CANNED_QUERIES:
+            raise ValueError(f"Unknown chart query {name!r}; use one of {CANNED_QUERIES}")
+        return getattr(self, name)(**kwargs)
+
+    def close(self):
+        self.con.close()
@@ -0,0 +1,165 @@
+"""
+Review Router - Cheap confidence scoring to decide which reviews need the LLM.
+"""
+
+import re
+import pandas as pd
+import numpy as np
+from typing import Dict, List
+import logging
+
+# Word-boundary lexicons; compiled once and applied column-wise with str.count
+POSITIVE_TERMS = [
+    'good', 'great', 'excellent', 'amazing', 'love', 'best', 'perfect', 'fantastic',
+    'recommend', 'reliable', 'easy', 'fast', 'awesome', 'solid', 'works well', 'lightweight'
+]
+NEGATIVE_TERMS = [
+    'bad', 'terrible', 'awful', 'hate', 'worst', 'horrible', 'useless', 'garbage',
+    'scam', 'slow', 'crash', 'crashes', 'bloated', 'refund', 'drain', 'annoying',
+    'uninstall', 'ripoff', 'rip off', 'waste'
+]
+# Markers of mixed or hedged opinions that keyword counts handle poorly
+CONTRAST_TERMS = ['but', 'however', 'although', 'though', 'except', 'otherwise']
+FEATURE_TERMS = [
+    'vpn', 'firewall', 'password manager', 'real-time protection', 'web protection',
+    'identity theft', 'parental control', 'scan', 'malware', 'ransomware', 'phishing'
+]
+
+
+def compile_terms(terms: List[str]) -> re.Pattern:
+    """Case-insensitive whole-word pattern matching any of the terms (longest first)"""
+    alternation = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+
+class ReviewRouter:
+    """Score reviews with rating, lexicon and length heuristics and route hard ones to the LLM"""
+
+    def __init__(self, config: Dict = None):
+        self.logger = logging.getLogger('ReviewRouter')
+        self.config = {**self._get_default_config(), **(config or {})}
+
+        self.positive_pattern = compile_terms(POSITIVE_TERMS)
+        self.negative_pattern = compile_terms(NEGATIVE_TERMS)
+        self.contrast_pattern = compile_terms(CONTRAST_TERMS)
+        self.negation_pattern = re.compile(r"(?<!\w)(?:not|never|no longer|hardly)(?!\w)|n't(?!\w)", re.IGNORECASE)
+        self.feature_pattern = compile_terms(FEATURE_TERMS)
+
+        self.stats = {}
+
+    def _get_default_config(self) -> Dict:
+        """Default routing thresholds"""
+        return {
+            'enabled': True,
+            'confidence_threshold': 0.75,
+            'disagreement_threshold': 0.4,
+            'short_review_words': 40,
+            'long_review_words': 150,
+            'rating_weight': 0.6,
+            'lexicon_weight': 0.4
+        }
+
+    def score(self, df: pd.DataFrame, text_column: str = 'review_text_unified') -> pd.DataFrame:
+        """Compute heuristic polarity, confidence and disagreement for every review"""
+        text = df[text_column].fillna('').astype(str)
+
+        pos = text.str.count(self.positive_pattern)
+        neg = text.str.count(self.negative_pattern)
+        contrast = text.str.count(self.contrast_pattern)
+        negations = text.str.count(self.negation_pattern)
+        words = text.str.split().str.len().fillna(0)
+
+        hits = pos + neg
+        lexicon_polarity = ((pos - neg) / hits.where(hits > 0)).fillna(0.0)
+        lexicon_strength = np.minimum(hits / 3.0, 1.0)
+
+        if 'rating_standardized' in df.columns:
+            rating = pd.to_numeric(df['rating_standardized'], errors='coerce')
+        else:
+            rating = pd.Series(np.nan, index=df.index)
+        rating_polarity = ((rating - 3.0) / 2.0).clip(-1, 1)
+        has_rating = rating_polarity.notna()
+
+        rating_weight = self.config['rating_weight']
+        lexicon_weight = self.config['lexicon_weight']
+        combined = np.where(
+            has_rating,
+            rating_weight * rating_polarity.fillna(0) + lexicon_weight * lexicon_polarity,
+            lexicon_polarity
+        )
+
+        # Rating and text point in opposite directions with meaningful strength
+        threshold = self.config['disagreement_threshold']
+        disagreement = (
+            has_rating
+            & (rating_polarity.abs() >= threshold)
+            & (lexicon_polarity.abs() >= threshold)
+            & (np.sign(rating_polarity.fillna(0)) != np.sign(lexicon_polarity))
+        )
+
+        # Confidence: an extreme rating backed (not contradicted) by the text lexicon
+        rating_confidence = rating_polarity.abs().fillna(0)
+        agrees = ~has_rating | (np.sign(rating_polarity.fillna(0)) == np.sign(lexicon_polarity)) | (hits == 0)
+        lexicon_support = np.where(agrees, lexicon_strength, -lexicon_strength)
+        confidence = 0.2 + 0.55 * rating_confidence + 0.35 * lexicon_support
+
+        short_words = self.config['short_review_words']
+        long_words = self.config['long_review_words']
+        length_penalty = np.where(
+            words <= short_words, 0.0,
+            np.minimum((words - short_words) / max(long_words - short_words, 1), 1.0) * 0.3
+        )
+        hedge_penalty = np.minimum(contrast * 0.15 + negations * 0.1, 0.4)
+        confidence = np.clip(confidence - length_penalty - hedge_penalty, 0.0, 1.0)
+        confidence = np.where(disagreement, 0.0, confidence)
+
+        return pd.DataFrame({
+            'route_score': np.clip(combined, -1.0, 1.0),
+            'route_confidence': confidence,
+            'route_disagreement': disagreement.astype(bool),
+            'route_lexicon_hits': hits
+        }, index=df.index)
+
+    def route(self, df: pd.DataFrame, text_column: str = 'review_text_unified') -> pd.DataFrame:
+        """Score reviews and mark each one 'heuristic' or 'llm'"""
+        scores = self.score(df, text_column)
+
+        if not self.config['enabled']:
+            scores['route'] = 'llm'
+        else:
+            confident = (scores['route_confidence'] >= self.config['confidence_threshold']) & ~scores['route_disagreement']
+            scores['route'] = np.where(confident, 'heuristic', 'llm')
+
+        escalated = int((scores['route'] == 'llm').sum())
+        self.stats = {
+            'total_reviews': len(scores),
+            'escalated_to_llm': escalated,
+            'resolved_heuristically': len(scores) - escalated,
+            'disagreements': int(scores['route_disagreement'].sum()),
+            'llm_call_reduction': (len(scores) - escalated) / len(scores) if len(scores) else 0.0
+        }
+        self.logger.info(
+            f"🔀 Routed {len(scores)} reviews: {escalated} to LLM, "
+            f"{len(scores) - escalated} resolved heuristically"
+        )
+        return scores
+
+    def heuristic_analysis(self, review_text: str, route_score: float) -> Dict:
+        """Build an analysis dict for a confidently-scored review in the LLM output shape"""
+        if route_score > 0.2:
+            sentiment = 'positive'
+        elif route_score < -0.2:
+            sentiment = 'negative'
+        else:
+            sentiment = 'neutral'
+
+        features = sorted({match.lower() for match in self.feature_pattern.findall(str(review_text))})
+
+        return {
+            'sentiment': sentiment,
+            'score': round(float(route_score), 3),
+            'key_points': [],
+            'features': features,
+            'summary': f'Heuristic {sentiment} classification',
+            'analysis_method': 'heuristic'
+        }
@@ -0,0 +1,359 @@
+"""
+Structured Output - Schema-constrained, streamed JSON responses from the OpenAI API.
+"""
+
+import json
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+_FENCE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+
+# Output modes tried in order; models that reject a response_format drop to the next one
+_RESPONSE_FORMATS = ('json_schema', 'json_object', None)
+
+_JSON_TYPES = {
+    'string': str,
+    'number': (int, float),
+    'integer': int,
+    'boolean': bool,
+    'array': list,
+    'object': dict
+}
+
+
+class StructuredOutputError(Exception):
+    """Raised when a response cannot be turned into any of the requested fields"""
+
+    def __init__(self, message: str, partial: Dict = None):
+        super().__init__(message)
+        self.partial = partial or {}
+
+
+def object_schema(properties: Dict[str, Dict]) -> Dict:
+    """Build a strict JSON schema where every listed property is required"""
+    return {
+        'type': 'object',
+        'properties': properties,
+        'required': list(properties.keys()),
+        'additionalProperties': False
+    }
+
+
+def _describe_type(spec: Dict) -> str:
+    if 'properties' in spec:
+        return describe_schema(spec)
+    return spec.get('type', 'string')
+
+
+def describe_schema(schema: Dict) -> str:
+    """Compact one-line field listing (nested objects spelled out) used to ask for specific fields in a prompt"""
+    parts = []
+    for name, spec in schema.get('properties', {}).items():
+        if 'enum' in spec:
+            kind = '|'.join(spec['enum'])
+        elif spec.get('type') == 'array':
+            kind = f"[{_describe_type(spec.get('items', {}))}]"
+        elif 'properties' in spec:
+            kind = describe_schema(spec)
+        else:
+            kind = spec.get('type', 'string')
+        parts.append(f'"{name}": {kind}')
+    return '{' + ', '.join(parts) + '}'
+
+
+def missing_fields(data: Dict, schema: Dict) -> List[str]:
+    """Required top-level fields that are absent, have the wrong JSON type or fail their nested schema"""
+    missing = []
+    for name in schema.get('required', []):
+        spec = schema.get('properties', {}).get(name, {})
+        if name not in data:
+            missing.append(name)
+            continue
+        expected = _JSON_TYPES.get(spec.get('type'))
+        value = data[name]
+        if expected and (not isinstance(value, expected) or (spec.get('type') == 'number' and isinstance(value, bool))):
+            missing.append(name)
+        elif 'enum' in spec and value not in spec['enum']:
+            missing.append(name)
+        elif 'properties' in spec and missing_fields(value, spec):
+            missing.append(name)
+        elif 'properties' in spec.get('items', {}) and isinstance(value, list) and any(
+                not isinstance(item, dict) or missing_fields(item, spec['items']) for item in value):
+            missing.append(name)
+    return missing
+
+
+def _scan_json(text: str) -> Tuple[str, List[str], bool]:
+    """Drop trailing commas outside string literals; returns (text, closers still open, inside a string)"""
+    out, stack = [], []
+    in_string = escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]' and stack:
+            stack.pop()
+        elif ch == ',' and text[i + 1:].lstrip()[:1] in ('}', ']'):
+            continue
+        out.append(ch)
+    return ''.join(out), stack, in_string
+
+
+def repair_json(text: str) -> Optional[Dict]:
+    """Best-effort repair of fenced, truncated or trailing-comma JSON objects"""
+    text = _FENCE.sub('', text or '').strip()
+    start = text.find('{')
+    if start == -1:
+        return None
+    candidate, stack, in_string = _scan_json(text[start:])
+
+    end = candidate.rfind('}')
+    if end != -1:
+        try:
+            return json.loads(candidate[:end + 1])
+        except json.JSONDecodeError:
+            pass
+
+    # Truncated output: close the open string and brackets in reverse order
+    closed = candidate + ('"' if in_string else '')
+    closed = re.sub(r'[,:]\s*$', '', closed.rstrip())
+    closed, _, _ = _scan_json(closed + ''.join(reversed(stack)))
+    try:
+        parsed = json.loads(closed)
+        return parsed if isinstance(parsed, dict) else None
+    except json.JSONDecodeError:
+        return None
+
+
+class IncrementalJSONParser:
+    """Parse a streamed JSON object, emitting each top-level field as soon as its value closes"""
+
+    def __init__(self, on_field: Callable[[str, object], None] = None):
+        self.on_field = on_field
+        self.text = ''
+        self.fields = {}
+        self.complete = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+
+    def feed(self, delta: str):
+        """Consume the next streamed fragment"""
+        self.text += delta
+        text = self.text
+
+        while self._pos < len(text) and not self.complete:
+            ch = text[self._pos]
+
+            if self._member_start is None and self._depth == 0:
+                # Skip fences or prose before the object opens
+                if ch == '{':
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(text[self._member_start:self._pos])
+                    self.complete = True
+            elif ch == ',' and self._depth == 1:
+                self._emit(text[self._member_start:self._pos])
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+    def _emit(self, member: str):
+        member = member.strip()
+        if not member:
+            return
+        try:
+            parsed = json.loads('{' + member + '}')
+        except json.JSONDecodeError:
+            return
+        for name, value in parsed.items():
+            self.fields[name] = value
+            if self.on_field:
+                self.on_field(name, value)
+
+
+class StructuredOutputClient:
+    """Request schema-constrained JSON, parse it while it streams and re-ask only for missing fields"""
+
+    def __init__(self, client, model: str, stream: bool = True, max_reasks: int = 1):
+        self.logger = logging.getLogger('StructuredOutput')
+        self.client = client
+        self.model = model
+        self.stream = stream
+        self.max_reasks = max_reasks
+        self._format = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'api_calls': 0,
+            'parsed_clean': 0,
+            'parse_failures': 0,
+            'repaired': 0,
+            'reasks': 0,
+            'reask_recovered': 0,
+            'incomplete': 0,
+            'wasted_calls': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0
+        }
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def get_stats(self) -> Dict:
+        """Counters plus failed-parse and wasted-call rates"""
+        with self._lock:
+            stats = dict(self.stats)
+        requests = stats['requests'] or 1
+        stats['failed_parse_rate'] = stats['parse_failures'] / requests
+        stats['unrecovered_rate'] = stats['incomplete'] / requests
+        stats['wasted_call_rate'] = stats['wasted_calls'] / (stats['api_calls'] or 1)
+        return stats
+
+    def _response_format(self, schema: Dict, schema_name: str) -> Optional[Dict]:
+        mode = _RESPONSE_FORMATS[self._format]
+        if mode == 'json_schema':
+            return {
+                'type': 'json_schema',
+                'json_schema': {'name': schema_name, 'schema': schema, 'strict': True}
+            }
+        if mode == 'json_object':
+            return {'type': 'json_object'}
+        return None
+
+    def _create(self, messages: List[Dict], schema: Dict, schema_name: str, max_tokens: int,
+                temperature: float, on_field: Callable = None) -> Tuple[str, Dict]:
+        """Issue one completion (streamed when enabled) and return its raw text and streamed fields"""
+        while True:
+            kwargs = {
+                'model': self.model,
+                'messages': messages,
+                'max_tokens': max_tokens,
+                'temperature': temperature
+            }
+            response_format = self._response_format(schema, schema_name)
+            if response_format:
+                kwargs['response_format'] = response_format
+            else:
+                # Unconstrained: the prompt carries the schema and _parse/missing_fields police the reply
+                kwargs['messages'] = messages + [
+                    {'role': 'user', 'content': f"Return ONLY a JSON object with these fields: {describe_schema(schema)}"}
+                ]
+            try:
+                return self._send(kwargs, on_field)
+            except Exception as e:
+                # Older models reject json_schema (and some json_object); downgrade and retry
+                if response_format and 'response_format' in str(e):
+                    self._format = max(self._format, _RESPONSE_FORMATS.index(response_format['type']) + 1)
+                    next_mode = _RESPONSE_FORMATS[self._format] or 'prompt-only JSON'
+                    self.logger.warning(f"{response_format['type']} output not supported by {self.model}, using {next_mode}")
+                    continue
+                raise
+
+    def _send(self, kwargs: Dict, on_field: Callable = None) -> Tuple[str, Dict]:
+        self._count('api_calls')
+
+        if not self.stream:
+            response = self.client.chat.completions.create(**kwargs)
+            self._record_usage(getattr(response, 'usage', None))
+            return response.choices[0].message.content or '', {}
+
+        parser = IncrementalJSONParser(on_field)
+        response = self.client.chat.completions.create(
+            stream=True, stream_options={'include_usage': True}, **kwargs
+        )
+        for chunk in response:
+            if getattr(chunk, 'usage', None):
+                self._record_usage(chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parser.feed(delta)
+        return parser.text, parser.fields
+
+    def _record_usage(self, usage):
+        if usage is None:
+            return
+        self._count('prompt_tokens', getattr(usage, 'prompt_tokens', 0) or 0)
+        self._count('completion_tokens', getattr(usage, 'completion_tokens', 0) or 0)
+
+    def _parse(self, raw_text: str, streamed_fields: Dict) -> Dict:
+        try:
+            parsed = json.loads(_FENCE.sub('', raw_text).strip())
+            if isinstance(parsed, dict):
+                self._count('parsed_clean')
+                return parsed
+        except json.JSONDecodeError:
+            pass
+
+        self._count('parse_failures')
+        repaired = repair_json(raw_text)
+        if repaired:
+            self._count('repaired')
+            return {**streamed_fields, **repaired}
+        return dict(streamed_fields)
+
+    def request(self, messages: List[Dict], schema: Dict, schema_name: str = 'response',
+                max_tokens: int = 800, temperature: float = 0.1, on_field: Callable = None) -> Dict:
+        """Return a dict matching the schema, repairing or re-asking for any fields that failed"""
+        self._count('requests')
+
+        raw_text, streamed = self._create(messages, schema, schema_name, max_tokens, temperature, on_field)
+        data = self._parse(raw_text, streamed)
+        missing = missing_fields(data, schema)
+
+        reasks = 0
+        while missing and reasks < self.max_reasks:
+            reasks += 1
+            self._count('reasks')
+            sub_schema = object_schema({name: schema['properties'][name] for name in missing})
+            followup = messages + [
+                {'role': 'assistant', 'content': raw_text},
+                {'role': 'user', 'content': f"Return ONLY a JSON object with these fields: {describe_schema(sub_schema)}"}
+            ]
+            raw_text, streamed = self._create(followup, sub_schema, f"{schema_name}_missing", max_tokens, temperature, on_field)
+            patch = self._parse(raw_text, streamed)
+            data.update({name: patch[name] for name in missing if name in patch})
+            missing = missing_fields(data, schema)
+            if not missing:
+                self._count('reask_recovered')
+
+        for name in missing:
+            data.pop(name, None)
+
+        if missing:
+            self._count('incomplete')
+            if not data:
+                self._count('wasted_calls', 1 + reasks)
+                raise StructuredOutputError(f"No usable fields in response for {schema_name}")
+            self.logger.warning(f"Structured output for {schema_name} missing fields: {missing}")
+
+        return data
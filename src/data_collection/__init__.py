@@ -1,12 +1,25 @@
 """
 Data collection module for Consumer Security Product Analysis.
+
+Scrapers are resolved on first attribute access, so importing one scraper does not
+pull in selenium, bs4 or pandas for the others.
 """
-from .collection_manager import DataCollectionManager, quick_collect, test_all_scrapers
-from .base_scraper import BaseScraper
-from .playstore_scraper import PlayStoreScraper
-from .reddit_scraper import RedditScraper
-from .amazon_scraper import AmazonScraper
-from .appstore_scraper import AppStoreScraper
+import importlib
+
+_EXPORTS = {
+    'DataCollectionManager': '.collection_manager',
+    'quick_collect': '.collection_manager',
+    'test_all_scrapers': '.collection_manager',
+    'BaseScraper': '.base_scraper',
+    'PlayStoreScraper': '.playstore_scraper',
+    'RedditScraper': '.reddit_scraper',
+    'AmazonScraper': '.amazon_scraper',
+    'AppStoreScraper': '.appstore_scraper',
+    'RunManifest': '.run_manifest',
+    'RefreshScheduler': '.refresh_scheduler',
+    'WorkQueue': '.work_queue',
+    'CollectionWorker': '.work_queue'
+}
 
 __all__ = [
     'DataCollectionManager',
@@ -15,6 +28,22 @@ __all__ = [
     'RedditScraper',
     'AmazonScraper',
     'AppStoreScraper',
+    'RunManifest',
+    'RefreshScheduler',
+    'WorkQueue',
+    'CollectionWorker',
     'quick_collect',
     'test_all_scrapers'
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
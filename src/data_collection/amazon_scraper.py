@@ -2,18 +2,23 @@
 Amazon reviews scraper for security software products.
 """
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from .html_parser import parse_html
 import re
 from typing import List, Dict
 from datetime import datetime
 from urllib.parse import urlencode
 
+_NUMBER = re.compile(r'(\d+\.?\d*)')
+_COUNT = re.compile(r'([\d,]+)')
+RESULT_SELECTOR = "div[data-component-type='s-search-result']"
+
 class AmazonScraper(BaseScraper):
     """Scraper for Amazon product reviews"""
     
     def __init__(self, delay: float = 2.0, headless: bool = True):
         super().__init__(delay, headless)
         self.base_url = "https://www.amazon.com"
+        self.html_backend = None  # Fastest installed parser unless set
         
         # Update headers for Amazon
         self.session.headers.update({
@@ -73,11 +78,13 @@ class AmazonScraper(BaseScraper):
             return []
         
         try:
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Only the result containers are needed; the soup backend skips building the rest
+            document = parse_html(response.content, self.html_backend,
+                                  only=('div', {'data-component-type': 's-search-result'}))
             products = []
             
             # Find product containers
-            product_containers = soup.find_all('div', {'data-component-type': 's-search-result'})
+            product_containers = document.select(RESULT_SELECTOR)
             
             for container in product_containers[:limit]:
                 product = self._extract_product_info(container)
@@ -97,31 +104,27 @@ class AmazonScraper(BaseScraper):
             product = {}
             
             # Product title
-            title_elem = container.find('h2', class_='s-size-mini')
-            if title_elem:
-                link_elem = title_elem.find('a')
-                if link_elem:
-                    product['title'] = link_elem.get_text(strip=True)
-                    product['url'] = self.base_url + link_elem.get('href', '')
+            link_elem = container.select_one('h2.s-size-mini a')
+            if link_elem:
+                product['title'] = link_elem.text()
+                product['url'] = self.base_url + link_elem.attr('href')
             
             # Price
-            price_elem = container.find('span', class_='a-price-whole')
+            price_elem = container.select_one('span.a-price-whole')
             if price_elem:
-                product['price'] = price_elem.get_text(strip=True)
+                product['price'] = price_elem.text()
             
             # Rating
-            rating_elem = container.find('span', class_='a-icon-alt')
+            rating_elem = container.select_one('span.a-icon-alt')
             if rating_elem:
-                rating_text = rating_elem.get_text()
-                rating_match = re.search(r'(\d+\.?\d*)', rating_text)
+                rating_match = _NUMBER.search(rating_elem.text())
                 if rating_match:
                     product['rating'] = float(rating_match.group(1))
             
             # Number of reviews
-            reviews_elem = container.find('a', {'href': re.compile(r'#customerReviews')})
+            reviews_elem = container.select_one("a[href*='#customerReviews']")
             if reviews_elem:
-                reviews_text = reviews_elem.get_text()
-                reviews_match = re.search(r'([\d,]+)', reviews_text)
+                reviews_match = _COUNT.search(reviews_elem.text())
                 if reviews_match:
                     product['review_count'] = int(reviews_match.group(1).replace(',', ''))
             
@@ -4,18 +4,37 @@ Apple App Store scraper for security app reviews.
 from .base_scraper import BaseScraper
 import json
 import re
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime
 from urllib.parse import urlencode
+import threading
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 class AppStoreScraper(BaseScraper):
     """Scraper for Apple App Store reviews"""
     
+    FEED_PAGE_SIZE = 50  # Entries per customer-review feed page
+    
     def __init__(self, delay: float = 1.5, headless: bool = True):
         super().__init__(delay, headless)
         self.base_url = "https://itunes.apple.com"
         self.search_url = "https://itunes.apple.com/search"
         
+        # Review feed fan-out (overridden from the appstore section of config.yaml)
+        self.countries = ['us']
+        self.max_pages = 10           # The review feed serves at most 10 pages
+        self.max_workers = 4          # Feed pages fetched concurrently
+        self.apps_per_product = 2
+        self.search_limit = 50
+        self._resolved_apps = {}
+        self._apps_lock = threading.Lock()
+        
         # Update headers for App Store API
         self.session.headers.update({
             'Accept': 'application/json',
@@ -25,7 +44,7 @@ class AppStoreScraper(BaseScraper):
     
     def get_product_info(self, app_name: str) -> Dict:
         """Get basic app information from App Store"""
-        apps = self.search_apps(app_name, limit=3)
+        apps = self.resolve_apps(app_name)
         
         if not apps:
             return {}
@@ -38,32 +57,38 @@ class AppStoreScraper(BaseScraper):
             'top_app': apps[0] if apps else None
         }
     
+    def resolve_apps(self, app_name: str) -> List[Dict]:
+        """Resolve a product to its App Store apps once per scraper; later calls reuse the trackIds"""
+        key = app_name.lower()
+        with self._apps_lock:
+            if key in self._resolved_apps:
+                return self._resolved_apps[key]
+        
+        apps = self.search_apps(app_name, limit=self.apps_per_product)
+        with self._apps_lock:
+            self._resolved_apps[key] = apps
+        return apps
+    
     def search_apps(self, query: str, limit: int = 10) -> List[Dict]:
         """Search for apps in the App Store"""
-        search_terms = [
-            f"{query} security",
-            f"{query} antivirus", 
-            f"{query} mobile security",
-            query
-        ]
-        
-        all_apps = []
-        
-        for search_term in search_terms:
-            apps = self._search_itunes_api(search_term, limit // len(search_terms))
-            all_apps.extend(apps)
-            
-            if len(all_apps) >= limit:
-                break
+        # One call with a large limit replaces several narrower sequential searches
+        apps = self._search_itunes_api(query, self.search_limit)
         
         # Remove duplicates based on app ID
         seen_ids = set()
         unique_apps = []
-        for app in all_apps:
+        for app in apps:
             if app.get('trackId') not in seen_ids:
                 seen_ids.add(app.get('trackId'))
                 unique_apps.append(app)
         
+        # The vendor's own apps first, then the most reviewed
+        query_lower = query.lower()
+        unique_apps.sort(key=lambda app: (
+            query_lower not in f"{app.get('artistName') or ''} {app.get('trackName') or ''}".lower(),
+            -(app.get('userRatingCount') or 0)
+        ))
+        
         return unique_apps[:limit]
     
     def _search_itunes_api(self, search_term: str, limit: int = 5) -> List[Dict]:
@@ -73,7 +98,7 @@ class AppStoreScraper(BaseScraper):
             'media': 'software',
             'entity': 'software',
             'country': 'US',
-            'limit': min(limit, 50)  # API limit
+            'limit': min(limit, 200)  # API limit
         }
         
         full_url = f"{self.search_url}?{urlencode(params)}"
@@ -83,7 +108,7 @@ class AppStoreScraper(BaseScraper):
             return []
         
         try:
-            data = response.json()
+            data = _loads(response.content)
             apps = []
             
             for app_data in data.get('results', []):
@@ -141,8 +166,120 @@ class AppStoreScraper(BaseScraper):
         return has_security or is_good_genre
     
     def scrape_reviews(self, app_name: str, max_reviews: int = 100) -> List[Dict]:
-        """Scrape reviews for a security app"""
-        # For now, create sample data since App Store RSS feeds are limited
+        """Scrape reviews for a security app from the customer-review feeds of every configured country"""
+        return [review for page in self.iter_review_pages(app_name, max_reviews) for review in page]
+    
+    def iter_review_pages(self, app_name: str, max_reviews: int = 100,
+                          cursor: Dict = None) -> Iterator[List[Dict]]:
+        """Validated reviews one fetch wave at a time; `cursor` holds the feed positions after each wave"""
+        cursor = {} if cursor is None else cursor
+        apps = cursor.get('apps') or self.resolve_apps(app_name)
+        if not apps:
+            self.logger.warning(f"No App Store apps found for {app_name}")
+            yield self._sample_reviews(app_name, max_reviews)
+            return
+        
+        if 'feeds' in cursor:
+            self.logger.info(f"Resuming App Store feeds for {app_name} after {cursor['collected']} reviews")
+        collected = cursor.get('collected', 0)
+        seen_ids = set(cursor.get('seen_ids', []))
+        # (app, country) feeds still worth paging, with the next page to fetch
+        feeds = {(app['trackId'], country): 1 for app in apps for country in self.countries}
+        if 'feeds' in cursor:
+            feeds = {(track_id, country): page for track_id, country, page in cursor['feeds']}
+        apps_by_id = {app['trackId']: app for app in apps}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while feeds and collected < max_reviews:
+                # Each wave requests just enough pages per feed to cover the remaining need
+                pages_needed = -(-(max_reviews - collected) // (self.FEED_PAGE_SIZE * len(feeds)))
+                tasks = []
+                for (track_id, country), next_page in feeds.items():
+                    last_page = min(next_page + pages_needed - 1, self.max_pages)
+                    tasks.extend((track_id, country, page) for page in range(next_page, last_page + 1))
+                
+                results = executor.map(lambda task: (task, self._fetch_review_page(*task)), tasks)
+                
+                wave = []
+                exhausted = set()
+                for (track_id, country, page), entries in results:
+                    if len(entries) < self.FEED_PAGE_SIZE or page >= self.max_pages:
+                        exhausted.add((track_id, country))
+                    feeds[(track_id, country)] = max(feeds.get((track_id, country), 1), page + 1)
+                    for entry in entries:
+                        review = self._extract_review(entry, app_name, apps_by_id[track_id], country)
+                        if review and review['review_id'] not in seen_ids:
+                            seen_ids.add(review['review_id'])
+                            wave.append(review)
+                
+                for feed in exhausted:
+                    feeds.pop(feed, None)
+                
+                wave = wave[:max_reviews - collected]
+                collected += len(wave)
+                cursor.update(apps=apps, collected=collected, seen_ids=sorted(seen_ids),
+                              feeds=[[track_id, country, page] for (track_id, country), page in feeds.items()])
+                if wave:
+                    yield self.validate_data(wave)
+        
+        if not collected:
+            self.logger.warning(f"App Store feeds returned no reviews for {app_name}")
+            yield self._sample_reviews(app_name, max_reviews)
+            return
+        
+        self.logger.info(f"Collected {collected} App Store reviews for {app_name} "
+                         f"from {len(apps)} apps in {len(self.countries)} countries")
+    
+    def _fetch_review_page(self, track_id: int, country: str, page: int) -> List[Dict]:
+        """Fetch one page of an app's most recent customer reviews for a country"""
+        url = f"{self.base_url}/{country}/rss/customerreviews/page={page}/id={track_id}/sortby=mostrecent/json"
+        response = self.safe_request(url)
+        
+        if not response:
+            return []
+        
+        try:
+            entries = _loads(response.content).get('feed', {}).get('entry', [])
+        except Exception as e:
+            self.logger.error(f"Error parsing App Store review feed {url}: {e}")
+            return []
+        
+        # A feed with a single entry returns an object instead of a list
+        if isinstance(entries, dict):
+            entries = [entries]
+        return entries
+    
+    def _extract_review(self, entry: Dict, app_name: str, app: Dict, country: str) -> Optional[Dict]:
+        """Extract review data from one feed entry"""
+        try:
+            # The first entry of older feeds describes the app itself and has no rating
+            rating = entry.get('im:rating', {}).get('label')
+            if not rating:
+                return None
+            
+            updated = entry.get('updated', {}).get('label', '')
+            return {
+                'product_name': app_name,
+                'source': 'Apple App Store',
+                'review_id': entry.get('id', {}).get('label'),
+                'review_text': entry.get('content', {}).get('label', ''),
+                'rating': int(rating),
+                'title': entry.get('title', {}).get('label', ''),
+                'reviewer_name': entry.get('author', {}).get('name', {}).get('label', ''),
+                'date': updated[:10] if updated else None,
+                'app_version': entry.get('im:version', {}).get('label'),
+                'helpful_votes': int(entry.get('im:voteCount', {}).get('label') or 0),
+                'app_id': app.get('trackId'),
+                'app_title': app.get('trackName'),
+                'country': country,
+                'scraped_at': datetime.now().isoformat()
+            }
+        except Exception as e:
+            self.logger.warning(f"Error extracting App Store review: {e}")
+            return None
+    
+    def _sample_reviews(self, app_name: str, max_reviews: int) -> List[Dict]:
+        """Sample data used when the review feeds are unavailable"""
         self.logger.info(f"App Store scraper: Creating sample data for {app_name}")
         
         sample_reviews = [
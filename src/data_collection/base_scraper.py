@@ -2,24 +2,44 @@
 Base scraper class for consistent data collection across different sources.
 """
 import time
+import threading
 import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import pandas as pd
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, TYPE_CHECKING
 import logging
 from abc import ABC, abstractmethod
 
+from .telemetry import ScraperTelemetry
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+class RateLimiter:
+    """Thread-safe minimum interval between requests, shared by every thread of a scraper"""
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+    
+    def wait(self) -> float:
+        """Block until the next request slot and return the seconds slept"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
 class BaseScraper(ABC):
     """Abstract base class for all scrapers"""
     
     def __init__(self, delay: float = 1.0, headless: bool = True):
         self.delay = delay
         self.headless = headless
+        # Spacing between requests is enforced per scraper, so concurrent fetches keep the same rate
+        self.rate_limiter = RateLimiter(delay)
+        self.telemetry = ScraperTelemetry()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -36,8 +56,18 @@ class BaseScraper(ABC):
         logger.addHandler(handler)
         return logger
     
-    def get_driver(self) -> webdriver.Chrome:
+    def use_transport(self, mode: str, cassette_path: str = None, stub_url: str = None):
+        """Route this scraper's HTTP traffic live, through a record/replay cassette or to a stub server"""
+        from .transport import mount_transport
+        self.transport = mount_transport(self.session, mode, cassette_path, stub_url)
+        self.logger.info(f"Using {mode} transport" + (f" ({cassette_path or stub_url})" if mode != 'live' else ''))
+    
+    def get_driver(self) -> 'webdriver.Chrome':
         """Create and return a Chrome WebDriver instance"""
+        # Selenium is only needed by browser-driven scrapers
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
         options = Options()
         if self.headless:
             options.add_argument('--headless')
@@ -59,8 +89,13 @@ class BaseScraper(ABC):
             timeout = getattr(self, 'timeout_seconds', 10)
             
         for attempt in range(max_retries):
+            if attempt:
+                self.telemetry.record_retry()
+            self.telemetry.record_sleep(self.rate_limiter.wait())
+            
+            response = None
+            start = time.perf_counter()
             try:
-                time.sleep(self.delay)
                 response = self.session.get(url, timeout=timeout)
                 response.raise_for_status()
                 return response
@@ -69,13 +104,37 @@ class BaseScraper(ABC):
                 if attempt == max_retries - 1:
                     self.logger.error(f"All {max_retries} attempts failed for {url}")
                     return None
+            finally:
+                self.telemetry.record_request(time.perf_counter() - start, response)
         return None
     
+    def load_page(self, driver, url: str):
+        """Navigate a Selenium driver and record the page-load time"""
+        start = time.perf_counter()
+        try:
+            driver.get(url)
+        finally:
+            self.telemetry.record_page_load(time.perf_counter() - start)
+    
+    def pause(self, seconds: float):
+        """Fixed wait (e.g. for page scripts), counted as sleep time"""
+        time.sleep(seconds)
+        self.telemetry.record_sleep(seconds)
+    
     @abstractmethod
     def scrape_reviews(self, product_name: str, max_reviews: int = 100) -> List[Dict]:
         """Abstract method to scrape reviews for a product"""
         pass
     
+    def iter_review_pages(self, product_name: str, max_reviews: int = 100,
+                          cursor: Dict = None) -> Iterator[List[Dict]]:
+        """Reviews in batches as they are fetched; scrapers that page override this.
+        
+        A resumable scraper updates `cursor` before each yield, so a run checkpointed after
+        that page can continue from it; this single-page default leaves it empty.
+        """
+        yield self.scrape_reviews(product_name, max_reviews)
+    
     @abstractmethod
     def get_product_info(self, product_name: str) -> Dict:
         """Abstract method to get basic product information"""
@@ -86,7 +145,8 @@ class BaseScraper(ABC):
         if not data:
             self.logger.warning("No data to save")
             return
-            
+        
+        import pandas as pd
         df = pd.DataFrame(data)
         
         if format.lower() == 'csv':
@@ -5,13 +5,12 @@ import os
 import yaml
 import pandas as pd
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import logging
-from .playstore_scraper import PlayStoreScraper
-from .reddit_scraper import RedditScraper
-from .amazon_scraper import AmazonScraper
-from .appstore_scraper import AppStoreScraper
+
+from .run_manifest import RunManifest
+from .refresh_scheduler import RefreshScheduler
 
 class DataCollectionManager:
     """Manages data collection from multiple sources"""
@@ -23,8 +22,8 @@ class DataCollectionManager:
         # Load configuration
         self.config = self._load_config(config_path)
         
-        # Initialize scrapers with config values
-        self.scrapers = self._initialize_scrapers()
+        # Scrapers (and their selenium/bs4 imports) are created on first use
+        self._scrapers = None
         
         # Create data directories if they don't exist
         self.raw_data_dir = "data/raw"
@@ -83,8 +82,20 @@ class DataCollectionManager:
         logger.addHandler(handler)
         return logger
     
+    @property
+    def scrapers(self) -> Dict:
+        """Scraper instances keyed by source name, initialized lazily"""
+        if self._scrapers is None:
+            self._scrapers = self._initialize_scrapers()
+        return self._scrapers
+    
     def _initialize_scrapers(self) -> Dict:
         """Initialize all available scrapers with config values"""
+        from .playstore_scraper import PlayStoreScraper
+        from .reddit_scraper import RedditScraper
+        from .amazon_scraper import AmazonScraper
+        from .appstore_scraper import AppStoreScraper
+        
         # Get scraper config
         scraper_config = self.config.get('scrapers', {})
         
@@ -96,31 +107,78 @@ class DataCollectionManager:
         reddit = RedditScraper(delay=scraper_config.get('reddit_delay', 1.5))
         reddit.max_retries = scraper_config.get('max_retries', 3)
         reddit.timeout_seconds = scraper_config.get('timeout_seconds', 15)
+        reddit_config = self.config.get('reddit', {})
+        reddit.page_size = reddit_config.get('page_size', 100)
+        reddit.max_pages = reddit_config.get('max_pages_per_subreddit', 5)
+        reddit.max_workers = reddit_config.get('max_workers', 4)
+        reddit.time_filter = reddit_config.get('time_filter', 'year')
+        reddit.max_query_length = reddit_config.get('max_query_length', 400)
+        reddit.subreddits = reddit_config.get('subreddits')
+        reddit.comment_config.update(reddit_config.get('comments', {}))
         
         amazon = AmazonScraper(delay=scraper_config.get('amazon_delay', 2.5))
         amazon.max_retries = scraper_config.get('max_retries', 3)
         amazon.timeout_seconds = scraper_config.get('timeout_seconds', 15)
+        amazon.html_backend = scraper_config.get('html_parser')
         
         appstore = AppStoreScraper(delay=scraper_config.get('appstore_delay', 1.5))
         appstore.max_retries = scraper_config.get('max_retries', 3)
         appstore.timeout_seconds = scraper_config.get('timeout_seconds', 15)
-        
-        return {
+        appstore_config = self.config.get('appstore', {})
+        appstore.countries = appstore_config.get('countries', ['us'])
+        appstore.max_pages = appstore_config.get('max_pages_per_country', 10)
+        appstore.max_workers = appstore_config.get('max_workers', 4)
+        appstore.apps_per_product = appstore_config.get('apps_per_product', 2)
+        appstore.search_limit = appstore_config.get('search_limit', 50)
+        
+        scrapers = {
             'playstore': playstore,
             'reddit': reddit,
             'amazon': amazon,
             'appstore': appstore
         }
+        
+        # Offline runs: replay recorded responses, record live ones, or target a local stub server
+        transport_config = scraper_config.get('transport', {})
+        mode = transport_config.get('mode', 'live')
+        if mode != 'live':
+            cassette_dir = transport_config.get('cassette_dir', 'data/cassettes')
+            for source_name, scraper in scrapers.items():
+                scraper.use_transport(
+                    mode,
+                    cassette_path=os.path.join(cassette_dir, f"{source_name}.json"),
+                    stub_url=transport_config.get('stub_url')
+                )
+        
+        return scrapers
     
-    def collect_all_data(self, companies: List[str] = None, max_reviews_per_source: int = None) -> Dict:
-        """Collect data from all sources for specified companies"""
+    def collect_all_data(self, companies: List[str] = None, max_reviews_per_source: int = None,
+                         resume: bool = False, run_id: str = None) -> Dict:
+        """Collect data from all sources for specified companies.
+        
+        Each (source, company) unit is checkpointed to a run manifest as it completes (page by
+        page for scrapers with a resumable cursor). With resume=True the latest unfinished run
+        (or `run_id`) is continued: completed units are restored and partial ones pick up
+        from their last saved page.
+        
+        With `data_collection.refresh.enabled`, `max_reviews_per_source` becomes the average
+        per-unit budget: a RefreshScheduler skips units not yet due and splits the rest by
+        each unit's observed new-review rate.
+        """
         if companies is None:
             companies = self.config['data_collection']['target_companies']
         
         if max_reviews_per_source is None:
             max_reviews_per_source = self.config['data_collection']['max_reviews_per_product']
         
+        # A resumed run keeps the companies and limits it started with
+        manifest = self._open_manifest(companies, max_reviews_per_source, resume, run_id)
+        if manifest is not None:
+            companies = manifest.state['companies']
+            max_reviews_per_source = manifest.state['max_reviews_per_source']
+        
         min_reviews = self.config['data_collection'].get('min_reviews_per_product', 5)
+        scheduler, budgets = self._plan_refresh(companies, max_reviews_per_source, manifest)
         
         all_data = {
             'companies': companies,
@@ -132,83 +190,374 @@ class DataCollectionManager:
                 'total_companies': len(companies)
             }
         }
+        if manifest is not None:
+            all_data['run_id'] = manifest.run_id
+        if budgets is not None:
+            all_data['config_used']['refresh_budgets'] = budgets
         
         self.logger.info(f"Starting comprehensive data collection for {len(companies)} companies: {companies}")
         
         for source_name, scraper in self.scrapers.items():
             self.logger.info(f"Collecting data from {source_name} for ALL companies")
-            source_data = self._collect_from_source(scraper, companies, max_reviews_per_source, min_reviews)
+            scraper.telemetry.reset()
+            if hasattr(scraper, 'start_run'):
+                scraper.start_run(review_limit=max_reviews_per_source)
+            limits = None
+            if budgets is not None:
+                limits = {company: budgets[f"{source_name}/{company}"] for company in companies}
+            if hasattr(scraper, 'scrape_reviews_multi'):
+                source_data = self._collect_multi_product(scraper, companies, max_reviews_per_source, min_reviews,
+                                                          manifest, source_name, limits)
+            else:
+                source_data = self._collect_from_source(scraper, companies, max_reviews_per_source, min_reviews,
+                                                        manifest, source_name, limits)
             all_data['sources'][source_name] = source_data
+            if scheduler is not None:
+                self._record_refresh(scheduler, source_name, source_data, manifest)
+            all_data.setdefault('telemetry', {})[source_name] = scraper.telemetry.snapshot()
             
             # Save individual source data
             self._save_source_data(source_data, source_name)
         
         # Combine and save all data
         combined_data = self._combine_all_data(all_data)
-        self._save_combined_data(combined_data)
+        self._save_combined_data(combined_data, all_data.get('telemetry'))
         
         # Generate comprehensive summary
         summary = self._generate_collection_summary(all_data)
         all_data['summary'] = summary
         
+        if manifest is not None:
+            manifest.finish()
+            self.logger.info(f"🏁 Run {manifest.run_id} {manifest.state['status']}: {manifest.summary()}")
+            # Checkpoints hold a second copy of every review; finished runs only need the combined output
+            pruned = RunManifest.prune(os.path.dirname(manifest.run_dir),
+                                       self.config['data_collection'].get('keep_completed_runs', 1))
+            if pruned:
+                self.logger.info(f"🧹 Pruned {len(pruned)} completed run checkpoint(s): {pruned}")
+        
+        return all_data
+    
+    def _plan_refresh(self, companies: List[str], max_reviews: int,
+                      manifest: RunManifest = None) -> Tuple[Optional[RefreshScheduler], Optional[Dict[str, int]]]:
+        """Refresh scheduler and per-unit budgets, or (None, None) when adaptive refresh is off"""
+        refresh_config = self.config['data_collection'].get('refresh', {})
+        if not refresh_config.get('enabled', False):
+            return None, None
+        
+        scheduler = RefreshScheduler(refresh_config)
+        # A resumed run keeps the budgets it was planned with
+        budgets = manifest.state.get('budgets') if manifest is not None else None
+        if budgets is None:
+            budgets = scheduler.plan(list(self.scrapers), companies, max_reviews)
+            if manifest is not None:
+                manifest.state['budgets'] = budgets
+                manifest.save()
+        return scheduler, budgets
+    
+    def _record_refresh(self, scheduler: RefreshScheduler, source_name: str, source_data: Dict,
+                        manifest: RunManifest = None):
+        """Feed a source's successful units to the scheduler (once per unit, even across resumes)"""
+        recorded = set(manifest.state.get('refresh_recorded', [])) if manifest is not None else set()
+        for company, stats in source_data['collection_stats'].items():
+            key = f"{source_name}/{company}"
+            if stats['status'] != 'success' or key in recorded:
+                continue
+            reviews = [review for review in source_data['reviews'] if review.get('product_name') == company]
+            new_reviews = scheduler.record(source_name, company, reviews)
+            self.logger.info(f"🆕 {company}: {new_reviews}/{len(reviews)} {source_name} reviews are new")
+            recorded.add(key)
+        
+        scheduler.save()
+        if manifest is not None:
+            manifest.state['refresh_recorded'] = sorted(recorded)
+            manifest.save()
+    
+    def _open_manifest(self, companies: List[str], max_reviews: int, resume: bool,
+                       run_id: str = None) -> Optional[RunManifest]:
+        """Checkpoint manifest for this run: a resumed one, or a new one unless checkpoints are disabled"""
+        collection_config = self.config['data_collection']
+        runs_dir = collection_config.get('checkpoint_dir', os.path.join(self.raw_data_dir, 'runs'))
+        
+        if resume:
+            if run_id:
+                manifest = RunManifest.load(os.path.join(runs_dir, run_id))
+            else:
+                manifest = RunManifest.latest(runs_dir)
+            if manifest is not None:
+                self.logger.info(f"🔁 Resuming run {manifest.run_id} for {manifest.state['companies']}: "
+                                 f"{manifest.summary()}")
+                return manifest
+            self.logger.info("No unfinished run to resume; starting a new one")
+        
+        if not collection_config.get('checkpoints', True):
+            return None
+        return RunManifest.create(runs_dir, companies, max_reviews, run_id)
+    
+    def enqueue_collection(self, queue, companies: List[str] = None, max_reviews_per_source: int = None,
+                           sources: List[str] = None, run_id: str = None) -> str:
+        """Queue one task per (source, company) (one per source for multi-product sources); returns the run id"""
+        companies = companies or self.config['data_collection']['target_companies']
+        max_reviews = max_reviews_per_source or self.config['data_collection']['max_reviews_per_product']
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        queue.create_run(run_id, companies, max_reviews)
+        
+        payload = {'max_reviews': max_reviews}
+        for source_name, scraper in self.scrapers.items():
+            if sources and source_name not in sources:
+                continue
+            if hasattr(scraper, 'scrape_reviews_multi'):
+                queue.enqueue(run_id, source_name, None, {**payload, 'companies': companies})
+            else:
+                for company in companies:
+                    queue.enqueue(run_id, source_name, company, payload)
+        
+        self.logger.info(f"📥 Queued run {run_id}: {queue.stats(run_id)['total']} tasks for {len(companies)} companies")
+        return run_id
+    
+    def collect_queued_run(self, queue, run_id: str = None) -> Dict:
+        """Assemble a queued run's finished tasks into the usual per-source and combined outputs"""
+        info = queue.run_info(run_id)
+        if info is None:
+            raise ValueError(f"No queued run {run_id!r} in {queue.path}" if run_id else f"No queued runs in {queue.path}")
+        run_id, companies = info['run_id'], info['companies']
+        min_reviews = self.config['data_collection'].get('min_reviews_per_product', 5)
+        
+        stats = queue.stats(run_id)
+        if stats['depth']:
+            self.logger.warning(f"⚠️ Run {run_id} still has {stats['depth']} unfinished tasks; collecting what is done")
+        
+        pages, product_info, failures = {}, {}, {}
+        for task in queue.tasks(run_id):
+            if task['status'] == 'failed':
+                for company in ([task['company']] if task['company'] else task['payload']['companies']):
+                    failures[(task['source'], company)] = task['last_error']
+            if task['status'] != 'done':
+                continue
+            with open(queue.result_path(task), 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            for company, unit in result['units'].items():
+                pages.setdefault((task['source'], company), []).extend(unit['reviews'])
+                if unit['product_info'] is not None:
+                    product_info[(task['source'], company)] = unit['product_info']
+        
+        all_data = {
+            'run_id': run_id,
+            'companies': companies,
+            'collection_date': datetime.now().isoformat(),
+            'sources': {},
+            'config_used': {
+                'max_reviews_per_source': info['max_reviews'],
+                'min_reviews_per_product': min_reviews,
+                'total_companies': len(companies)
+            },
+            'queue_stats': stats
+        }
+        for source_name in sorted({source for source, _ in list(pages) + list(failures)}):
+            source_data = self._new_source_data()
+            for company in companies:
+                key = (source_name, company)
+                if key in failures:
+                    self._record_failure(source_data, company, RuntimeError(failures[key]))
+                elif key in pages:
+                    self._record_company(source_data, company, pages[key], product_info.get(key), min_reviews)
+            all_data['sources'][source_name] = source_data
+            self._save_source_data(source_data, source_name)
+        
+        combined_data = self._combine_all_data(all_data)
+        self._save_combined_data(combined_data)
+        all_data['summary'] = self._generate_collection_summary(all_data)
         return all_data
     
-    def _collect_from_source(self, scraper, companies: List[str], max_reviews: int, min_reviews: int = 5) -> Dict:
-        """Collect data from a single source for ALL companies"""
-        source_data = {
+    def _new_source_data(self) -> Dict:
+        return {
             'reviews': [],
             'product_info': [],
             'collection_stats': {},
             'companies_processed': [],
             'companies_failed': []
         }
+    
+    def _record_company(self, source_data: Dict, company: str, reviews: List[Dict],
+                        product_info: Dict, min_reviews: int):
+        """Add one company's reviews and product info to the source results"""
+        if product_info:
+            source_data['product_info'].append(product_info)
+        
+        if len(reviews) >= min_reviews:
+            source_data['reviews'].extend(reviews)
+            source_data['companies_processed'].append(company)
+            self.logger.info(f"✅ {company}: Collected {len(reviews)} reviews (meets minimum {min_reviews})")
+        else:
+            self.logger.warning(f"⚠️ {company}: Only {len(reviews)} reviews (below minimum {min_reviews})")
+            if reviews:  # Still add them if we got some
+                source_data['reviews'].extend(reviews)
+                source_data['companies_processed'].append(company)
+        
+        source_data['collection_stats'][company] = {
+            'reviews_collected': len(reviews),
+            'has_product_info': bool(product_info),
+            'meets_minimum': len(reviews) >= min_reviews,
+            'status': 'success'
+        }
+    
+    def _record_skipped(self, source_data: Dict, company: str):
+        self.logger.info(f"⏸️ {company}: not due for a refresh, skipped")
+        source_data['collection_stats'][company] = {
+            'reviews_collected': 0,
+            'has_product_info': False,
+            'meets_minimum': False,
+            'status': 'skipped'
+        }
+    
+    def _record_failure(self, source_data: Dict, company: str, error: Exception):
+        self.logger.error(f"❌ Error collecting data for {company}: {error}")
+        source_data['companies_failed'].append(company)
+        source_data['collection_stats'][company] = {
+            'reviews_collected': 0,
+            'has_product_info': False,
+            'meets_minimum': False,
+            'status': 'failed',
+            'error': str(error)
+        }
+    
+    def _collect_from_source(self, scraper, companies: List[str], max_reviews: int, min_reviews: int = 5,
+                             manifest: RunManifest = None, source_name: str = None,
+                             limits: Dict[str, int] = None) -> Dict:
+        """Collect data from a single source for ALL companies (`limits` overrides max_reviews per company)"""
+        source_data = self._new_source_data()
         
         for company in companies:
+            if limits is not None:
+                max_reviews = limits.get(company, 0)
+                if not max_reviews:
+                    self._record_skipped(source_data, company)
+                    continue
+            if manifest is not None and manifest.is_complete(source_name, company):
+                self._restore_company(source_data, manifest, source_name, company, min_reviews)
+                continue
+            
             self.logger.info(f"Processing {company} from {scraper.__class__.__name__}")
             
             try:
-                # Get product information
-                product_info = scraper.get_product_info(company)
-                if product_info:
-                    source_data['product_info'].append(product_info)
+                with scraper.telemetry.scope(company):
+                    if manifest is None:
+                        # Get product information
+                        product_info = scraper.get_product_info(company)
+                        
+                        # Get reviews
+                        reviews = scraper.scrape_reviews(company, max_reviews)
+                        scraper.telemetry.record_reviews(len(reviews))
+                    else:
+                        product_info, reviews = self._collect_unit(scraper, manifest, source_name, company,
+                                                                   max_reviews)
                 
-                # Get reviews
-                reviews = scraper.scrape_reviews(company, max_reviews)
-                
-                if len(reviews) >= min_reviews:
-                    source_data['reviews'].extend(reviews)
-                    source_data['companies_processed'].append(company)
-                    self.logger.info(f"✅ {company}: Collected {len(reviews)} reviews (meets minimum {min_reviews})")
-                else:
-                    self.logger.warning(f"⚠️ {company}: Only {len(reviews)} reviews (below minimum {min_reviews})")
-                    if reviews:  # Still add them if we got some
-                        source_data['reviews'].extend(reviews)
-                        source_data['companies_processed'].append(company)
-                
-                source_data['collection_stats'][company] = {
-                    'reviews_collected': len(reviews),
-                    'has_product_info': bool(product_info),
-                    'meets_minimum': len(reviews) >= min_reviews,
-                    'status': 'success'
-                }
+                self._record_company(source_data, company, reviews, product_info, min_reviews)
                 
             except Exception as e:
-                self.logger.error(f"❌ Error collecting data for {company}: {e}")
-                source_data['companies_failed'].append(company)
-                source_data['collection_stats'][company] = {
-                    'reviews_collected': 0,
-                    'has_product_info': False,
-                    'meets_minimum': False,
-                    'status': 'failed',
-                    'error': str(e)
-                }
+                if manifest is not None:
+                    manifest.fail_unit(source_name, company, e)
+                self._record_failure(source_data, company, e)
         
-        # Log final stats for this source
+        self._log_source_summary(scraper, source_data, companies)
+        return source_data
+    
+    def _collect_unit(self, scraper, manifest: RunManifest, source_name: str, company: str,
+                      max_reviews: int) -> Tuple[Dict, List[Dict]]:
+        """Product info and reviews for one (source, company), checkpointed after every page"""
+        unit = manifest.resume_unit(source_name, company)
+        product_info = unit['product_info']
+        if product_info is None:
+            product_info = scraper.get_product_info(company)
+            manifest.set_product_info(source_name, company, product_info)
+        
+        reviews = manifest.reviews(source_name, company)
+        if reviews:
+            self.logger.info(f"🔁 {company}: continuing after {len(reviews)} checkpointed reviews")
+        cursor = dict(unit['cursor'])
+        for page in scraper.iter_review_pages(company, max_reviews, cursor=cursor):
+            scraper.telemetry.record_reviews(len(page))
+            manifest.add_page(source_name, company, page, cursor)
+            reviews.extend(page)
+        
+        manifest.complete_unit(source_name, company)
+        return product_info, reviews
+    
+    def _restore_company(self, source_data: Dict, manifest: RunManifest, source_name: str, company: str,
+                         min_reviews: int):
+        """Record a unit completed by an earlier attempt of this run from its checkpoint"""
+        reviews = manifest.reviews(source_name, company)
+        self.logger.info(f"⏭️ {company}: restored {len(reviews)} {source_name} reviews from checkpoint")
+        self._record_company(source_data, company, reviews, manifest.unit(source_name, company)['product_info'],
+                             min_reviews)
+    
+    def _collect_multi_product(self, scraper, companies: List[str], max_reviews: int, min_reviews: int = 5,
+                               manifest: RunManifest = None, source_name: str = None,
+                               limits: Dict[str, int] = None) -> Dict:
+        """Collect ALL companies from a source that can search for many products at once"""
+        source_data = self._new_source_data()
+        
+        if limits is not None:
+            # One shared search, so it runs at the largest budget among the companies that are due
+            for company in companies:
+                if not limits.get(company, 0):
+                    self._record_skipped(source_data, company)
+            companies = [company for company in companies if limits.get(company, 0)]
+            max_reviews = max((limits[company] for company in companies), default=0)
+        
+        # Companies finished by an earlier attempt of this run are restored instead of searched again
+        pending = [company for company in companies
+                   if manifest is None or not manifest.is_complete(source_name, company)]
+        reviews_by_company = {}
+        if pending:
+            self.logger.info(f"Processing {len(pending)} companies in one pass from {scraper.__class__.__name__}")
+            try:
+                # One shared fetch for every company, so telemetry is recorded for the whole pass
+                with scraper.telemetry.scope('all_companies'):
+                    reviews_by_company = scraper.scrape_reviews_multi(pending, max_reviews)
+                    scraper.telemetry.record_reviews(sum(len(reviews) for reviews in reviews_by_company.values()))
+            except Exception as e:
+                for company in pending:
+                    if manifest is not None:
+                        manifest.fail_unit(source_name, company, e)
+                    self._record_failure(source_data, company, e)
+                pending = []
+        
+        for company in companies:
+            if company not in pending:
+                if manifest is not None and manifest.is_complete(source_name, company):
+                    self._restore_company(source_data, manifest, source_name, company, min_reviews)
+                continue
+            reviews = reviews_by_company.get(company, [])
+            if limits is not None:
+                reviews = reviews[:limits[company]]
+            # Product info comes from the posts already fetched instead of another search
+            posts = [review for review in reviews if review.get('source') == 'Reddit']
+            product_info = scraper.product_info_from_posts(company, posts)
+            if manifest is not None:
+                manifest.resume_unit(source_name, company)
+                manifest.set_product_info(source_name, company, product_info)
+                manifest.add_page(source_name, company, reviews)
+                manifest.complete_unit(source_name, company)
+            self._record_company(source_data, company, reviews, product_info, min_reviews)
+        
+        self._log_source_summary(scraper, source_data, companies)
+        return source_data
+    
+    def _log_source_summary(self, scraper, source_data: Dict, companies: List[str]):
+        """Log final stats for this source"""
         total_reviews = len(source_data['reviews'])
         successful_companies = len(source_data['companies_processed'])
         self.logger.info(f"📊 {scraper.__class__.__name__} Summary: {total_reviews} reviews from {successful_companies}/{len(companies)} companies")
         
-        return source_data
+        telemetry = scraper.telemetry.snapshot()['total']
+        latency = telemetry['latency_ms']
+        self.logger.info(
+            f"📡 {telemetry['requests']} requests ({telemetry['retries']} retries, {telemetry['bytes'] / 1e6:.1f} MB), "
+            f"p50/p95 {latency.get('p50')}/{latency.get('p95')} ms, "
+            f"network {telemetry['network_seconds']:.1f}s vs sleep {telemetry['sleep_seconds']:.1f}s, "
+            f"{telemetry['reviews_per_second'] or 0:.2f} reviews/s"
+        )
     
     def _save_source_data(self, source_data: Dict, source_name: str):
         """Save data from a single source in both JSON and CSV formats"""
@@ -254,14 +603,22 @@ class DataCollectionManager:
         else:
             return pd.DataFrame()
     
-    def _save_combined_data(self, combined_df: pd.DataFrame):
+    def _save_combined_data(self, combined_df: pd.DataFrame, telemetry: Dict = None):
         """Save combined data from all sources in JSON and CSV formats"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Run telemetry is saved even when nothing was collected; that is when it matters most
+        telemetry_file = None
+        if telemetry:
+            telemetry_file = f"{self.raw_data_dir}/collection_telemetry_{timestamp}.json"
+            with open(telemetry_file, 'w', encoding='utf-8') as f:
+                json.dump({'collection_timestamp': timestamp, 'sources': telemetry}, f, indent=2)
+            self.logger.info(f"📡 Saved run telemetry to {telemetry_file}")
+        
         if combined_df.empty:
             self.logger.warning("⚠️ No data to save")
             return
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
         # Save as JSON (primary format)
         combined_json_file = f"{self.raw_data_dir}/combined_reviews_{timestamp}.json"
         combined_dict = combined_df.to_dict('records')
@@ -286,6 +643,9 @@ class DataCollectionManager:
             }
         }
         
+        if telemetry_file:
+            metadata['telemetry_file'] = os.path.basename(telemetry_file)
+        
         metadata_file = f"{self.raw_data_dir}/collection_metadata_{timestamp}.json"
         with open(metadata_file, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2, default=str)  # default=str handles datetime objects
@@ -369,9 +729,13 @@ class DataCollectionManager:
         if summary['companies_missing_data']:
             summary['recommendations'].append(f"No data collected for: {', '.join(summary['companies_missing_data'])}")
         
-        best_source = max(summary['source_performance'].items(), 
-                         key=lambda x: x[1]['total_reviews'])
-        summary['recommendations'].append(f"Best performing source: {best_source[0]} ({best_source[1]['total_reviews']} reviews)")
+        # A queued run collected before any task finished has no sources yet
+        if summary['source_performance']:
+            best_source = max(summary['source_performance'].items(), 
+                             key=lambda x: x[1]['total_reviews'])
+            summary['recommendations'].append(f"Best performing source: {best_source[0]} ({best_source[1]['total_reviews']} reviews)")
+        else:
+            summary['recommendations'].append("No source has finished yet; collect the run again once tasks complete")
         
         # Convert set to list for JSON serialization
         summary['companies_with_data'] = list(summary['companies_with_data'])
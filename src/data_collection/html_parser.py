@@ -0,0 +1,119 @@
+"""
+Pluggable HTML parsing for scrapers.
+
+Uses the fastest installed backend (selectolax, then lxml, then BeautifulSoup's
+html.parser) behind one small CSS-selector interface.
+"""
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_PREFERENCE = ['selectolax', 'lxml', 'html.parser']
+
+_available = None
+
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first"""
+    global _available
+    if _available is None:
+        _available = []
+        if _selectolax_parser() is not None:
+            _available.append('selectolax')
+        try:
+            import lxml.html  # noqa: F401
+            import cssselect  # noqa: F401
+            _available.append('lxml')
+        except ImportError:
+            pass
+        try:
+            import bs4  # noqa: F401
+            _available.append('html.parser')
+        except ImportError:
+            pass
+    return list(_available)
+
+
+def _selectolax_parser():
+    """The Lexbor parser class (selectolax >= 0.3.13), else the older Modest one"""
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborHTMLParser
+    except ImportError:
+        pass
+    try:
+        from selectolax.parser import HTMLParser
+        return HTMLParser
+    except ImportError:
+        return None
+
+
+def default_backend() -> str:
+    backends = available_backends()
+    if not backends:
+        raise ImportError("No HTML parser installed: install selectolax, lxml+cssselect or beautifulsoup4")
+    return backends[0]
+
+
+class HTMLNode:
+    """Backend-neutral element: CSS selection, stripped text and attributes"""
+
+    def __init__(self, node, backend: str):
+        self._node = node
+        self.backend = backend
+
+    def select(self, selector: str) -> List['HTMLNode']:
+        if self.backend == 'selectolax':
+            found = self._node.css(selector)
+        elif self.backend == 'lxml':
+            found = self._node.cssselect(selector)
+        else:
+            found = self._node.select(selector)
+        return [HTMLNode(node, self.backend) for node in found]
+
+    def select_one(self, selector: str) -> Optional['HTMLNode']:
+        if self.backend == 'selectolax':
+            node = self._node.css_first(selector)
+        elif self.backend == 'lxml':
+            found = self._node.cssselect(selector)
+            node = found[0] if found else None
+        else:
+            node = self._node.select_one(selector)
+        return HTMLNode(node, self.backend) if node is not None else None
+
+    def text(self) -> str:
+        if self.backend == 'selectolax':
+            return self._node.text(strip=True)
+        if self.backend == 'lxml':
+            return self._node.text_content().strip()
+        return self._node.get_text(strip=True)
+
+    def attr(self, name: str, default: str = '') -> str:
+        if self.backend == 'selectolax':
+            value = self._node.attributes.get(name)
+        else:
+            value = self._node.get(name)
+        return value if value is not None else default
+
+
+def parse_html(content, backend: str = None, only: Tuple[str, Dict] = None) -> HTMLNode:
+    """Parse a page with the chosen (or fastest) backend.
+
+    `only` is a (tag, attrs) hint; the BeautifulSoup backend builds just those
+    subtrees with a SoupStrainer, the faster backends parse everything anyway.
+    """
+    backend = backend or default_backend()
+
+    if backend == 'selectolax':
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='replace')
+        return HTMLNode(_selectolax_parser()(content), backend)
+
+    if backend == 'lxml':
+        import lxml.html
+        return HTMLNode(lxml.html.fromstring(content), backend)
+
+    if backend == 'html.parser':
+        from bs4 import BeautifulSoup, SoupStrainer
+        strainer = SoupStrainer(only[0], attrs=only[1]) if only else None
+        return HTMLNode(BeautifulSoup(content, 'html.parser', parse_only=strainer), backend)
+
+    raise ValueError(f"Unknown HTML parser backend: {backend}")
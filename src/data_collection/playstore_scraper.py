@@ -2,15 +2,12 @@
 Google Play Store scraper for security app reviews.
 """
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
 import re
 from typing import List, Dict
 from datetime import datetime
 
+_DETAILS_LINK = re.compile(r'/store/apps/details\?id=([^"\s&]+)')
+
 class PlayStoreScraper(BaseScraper):
     """Scraper for Google Play Store app reviews"""
     
@@ -80,15 +77,15 @@ class PlayStoreScraper(BaseScraper):
                 response = self.safe_request(search_url)
                 
                 if response and response.status_code == 200:
-                    # Look for app URLs in the HTML
-                    content = response.text
-                    
-                    # Find app detail URLs
-                    import re
-                    pattern = r'/store/apps/details\?id=([^"\s&]+)'
-                    matches = re.findall(pattern, content)
+                    # Find app detail URLs, stopping after the first 5 distinct packages
+                    matches = []
+                    for match in _DETAILS_LINK.finditer(response.text):
+                        if match.group(1) not in matches:
+                            matches.append(match.group(1))
+                            if len(matches) == 5:
+                                break
                     
-                    for package_id in matches[:5]:  # Check first 5 results
+                    for package_id in matches:  # Check first 5 results
                         app_url = f"{self.base_url}/details?id={package_id}"
                         
                         # Quick check if it's a security app
@@ -117,6 +114,8 @@ class PlayStoreScraper(BaseScraper):
     
     def _search_via_selenium(self, app_name: str) -> str:
         """Search using Selenium as last resort"""
+        from selenium.webdriver.common.by import By
+        
         search_terms = [f"{app_name} mobile security", f"{app_name} antivirus"]
         
         for search_term in search_terms:
@@ -124,8 +123,8 @@ class PlayStoreScraper(BaseScraper):
                 driver = self.get_driver()
                 search_url = f"{self.base_url}/search?q={search_term.replace(' ', '+')}&c=apps"
                 
-                driver.get(search_url)
-                time.sleep(3)
+                self.load_page(driver, search_url)
+                self.pause(3)
                 
                 # Try multiple selectors
                 selectors = [
@@ -157,8 +156,8 @@ class PlayStoreScraper(BaseScraper):
     def _is_security_app_selenium(self, driver, app_url: str, app_name: str) -> bool:
         """Check if the found app is actually a security app using selenium"""
         try:
-            driver.get(app_url)
-            time.sleep(2)
+            self.load_page(driver, app_url)
+            self.pause(2)
             
             # Check app title and description for security-related terms
             page_text = driver.page_source.lower()
@@ -179,14 +178,16 @@ class PlayStoreScraper(BaseScraper):
     
     def get_product_info(self, app_name: str) -> Dict:
         """Get basic app information from Play Store"""
+        from selenium.webdriver.common.by import By
+        
         app_url = self.search_app(app_name)
         if not app_url:
             return {}
         
         driver = self.get_driver()
         try:
-            driver.get(app_url)
-            time.sleep(3)
+            self.load_page(driver, app_url)
+            self.pause(3)
             
             info = {
                 'name': app_name,
@@ -239,6 +240,10 @@ class PlayStoreScraper(BaseScraper):
     
     def scrape_reviews(self, product_name: str, max_reviews: int = 100) -> List[Dict]:
         """Scrape reviews for a given app"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         app_url = self.search_app(product_name)
         if not app_url:
             # If we can't find the app, provide sample data to demonstrate infrastructure
@@ -252,8 +257,8 @@ class PlayStoreScraper(BaseScraper):
         reviews = []
         
         try:
-            driver.get(reviews_url)
-            time.sleep(3)
+            self.load_page(driver, reviews_url)
+            self.pause(3)
             
             # Click on reviews tab if needed
             try:
@@ -261,7 +266,7 @@ class PlayStoreScraper(BaseScraper):
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Reviews')]"))
                 )
                 reviews_tab.click()
-                time.sleep(2)
+                self.pause(2)
             except:
                 pass  # Reviews might already be showing
             
@@ -272,7 +277,7 @@ class PlayStoreScraper(BaseScraper):
             while reviews_collected < max_reviews:
                 # Scroll down
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                self.pause(2)
                 
                 # Wait for new content to load
                 new_height = driver.execute_script("return document.body.scrollHeight")
@@ -316,6 +321,8 @@ class PlayStoreScraper(BaseScraper):
     
     def _extract_review_data(self, review_element) -> Dict:
         """Extract data from a single review element"""
+        from selenium.webdriver.common.by import By
+        
         review_data = {}
         
         try:
@@ -352,6 +359,7 @@ class PlayStoreScraper(BaseScraper):
                 review_data['helpful_votes'] = 0
             
             review_data['scraped_at'] = datetime.now().isoformat()
+            return review_data
             
         except Exception as e:
             self.logger.warning(f"Error extracting review data: {e}")
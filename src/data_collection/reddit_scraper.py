@@ -2,19 +2,89 @@
 Reddit scraper for security product discussions and reviews.
 """
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
 import json
+import os
 import re
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlencode
 
+
+class ProductMatcher:
+    """Precompiled multi-product matcher: one regex pass finds every product a post names"""
+    
+    def __init__(self, product_names: List[str]):
+        self.product_names = list(product_names)
+        self._lookup = {' '.join(name.lower().split()): name for name in self.product_names}
+        alternation = '|'.join(
+            r'\s+'.join(re.escape(word) for word in name.split())
+            for name in sorted(self._lookup, key=len, reverse=True)
+        )
+        self.pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+    
+    def match(self, text: str) -> List[str]:
+        """Products mentioned in the text, in the order they were configured"""
+        found = {self._lookup[' '.join(m.lower().split())] for m in self.pattern.findall(text or '')}
+        return [name for name in self.product_names if name in found]
+
+
+class RedditRunContext:
+    """State shared by every call in one collection run: subreddits resolved once and search results by query"""
+    
+    def __init__(self, subreddits: List[str], review_limit: int = 100):
+        self.subreddits = subreddits
+        self.review_limit = review_limit
+        self.started_at = datetime.now().isoformat()
+        self.stats = {'searches': 0, 'reused': 0}
+        self._results = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple, limit: int) -> Optional[List[Dict]]:
+        """Cached posts for a search that fetched at least `limit` posts (or ran out before it)"""
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            fetched_limit, posts = entry
+            if fetched_limit < limit and len(posts) >= fetched_limit:
+                return None
+            self.stats['reused'] += 1
+        return [dict(post) for post in posts[:limit]]
+    
+    def put(self, key: Tuple, limit: int, posts: List[Dict]):
+        with self._lock:
+            self.stats['searches'] += 1
+            self._results[key] = (limit, [dict(post) for post in posts])
+
+
 class RedditScraper(BaseScraper):
     """Scraper for Reddit posts and comments about security products"""
     
     def __init__(self, delay: float = 2.0, headless: bool = True):
         super().__init__(delay, headless)
         self.base_url = "https://www.reddit.com"
+        
+        # Listing pagination (overridden from the reddit section of config.yaml)
+        self.page_size = 100          # Reddit listing maximum
+        self.max_pages = 5            # Per subreddit per query
+        self.max_workers = 4          # Subreddits fetched concurrently
+        self.time_filter = 'year'
+        self.max_query_length = 400   # Reddit rejects very long search queries
+        self.subreddits = None        # Set from reddit.subreddits; read from config.yaml once per run otherwise
+        self._run = None
+        
+        # Comment harvesting for the top posts of each product
+        self.comment_config = {
+            'enabled': False,
+            'top_k_posts': 10,
+            'rank_by': 'num_comments',
+            'max_depth': 3,
+            'max_comments_per_post': 200,
+            'max_comments_total': 500,
+            'stream_dir': None        # Write comments to JSON lines here instead of returning them
+        }
         # Add Reddit-specific headers
         self.session.headers.update({
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -25,105 +95,204 @@ class RedditScraper(BaseScraper):
             'Upgrade-Insecure-Requests': '1'
         })
     
+    def start_run(self, review_limit: int = 100) -> RedditRunContext:
+        """Begin a collection run: resolve subreddits once and start a fresh search result cache"""
+        subreddits = self.subreddits or self._load_subreddits()
+        self._run = RedditRunContext(subreddits, review_limit)
+        self.logger.info(f"Reddit run using {len(subreddits)} subreddits: {subreddits}")
+        return self._run
+    
+    @property
+    def run(self) -> RedditRunContext:
+        if self._run is None:
+            self.start_run()
+        return self._run
+    
+    def _load_subreddits(self) -> List[str]:
+        """Get subreddits from config if available, otherwise use defaults"""
+        subreddits = ['antivirus', 'cybersecurity', 'techsupport', 'security', 'privacy']  # fallback
+        try:
+            import yaml
+            import os
+            config_paths = ["config.yaml", "../config.yaml", "../../config.yaml"]
+            
+            for config_path in config_paths:
+                if os.path.exists(config_path):
+                    with open(config_path, 'r') as f:
+                        config = yaml.safe_load(f) or {}
+                    configured = config.get('reddit', {}).get('subreddits')
+                    if configured:
+                        return configured
+                    break
+        except Exception as e:
+            self.logger.debug(f"Could not load config, using defaults: {e}")
+        return subreddits
+    
     def get_product_info(self, product_name: str) -> Dict:
         """Get basic information about product discussions on Reddit"""
-        search_results = self.search_posts(product_name, limit=5)
+        # Same query and limit as scrape_reviews, so the review scrape reuses these posts
+        search_results = self.search_posts(product_name, limit=self.run.review_limit)
         
         if not search_results:
             return {}
         
+        return self.product_info_from_posts(product_name, search_results)
+    
+    def product_info_from_posts(self, product_name: str, posts: List[Dict]) -> Dict:
+        """Summarize product discussions from posts that were already fetched"""
+        if not posts:
+            return {}
+        
+        subreddit_counts = {}
+        for post in posts:
+            subreddit = post.get('subreddit', '')
+            subreddit_counts[subreddit] = subreddit_counts.get(subreddit, 0) + 1
+        dates = sorted(post['date'] for post in posts if post.get('date'))
+        scores = [post.get('score', 0) or 0 for post in posts]
+        
         return {
             'name': product_name,
             'source': 'Reddit',
-            'total_posts_found': len(search_results),
+            'total_posts_found': len(posts),
             'scraped_at': datetime.now().isoformat(),
-            'subreddits': list(set([post.get('subreddit', '') for post in search_results]))
+            'subreddits': list(subreddit_counts),
+            'posts_by_subreddit': subreddit_counts,
+            'average_score': round(sum(scores) / len(scores), 1),
+            'total_comments': sum(post.get('num_comments', 0) or 0 for post in posts),
+            'earliest_post': dates[0] if dates else None,
+            'latest_post': dates[-1] if dates else None
         }
     
-    def search_posts(self, query: str, subreddits: List[str] = None, limit: int = 100) -> List[Dict]:
-        """Search for posts containing the query"""
+    def search_posts(self, query: str, subreddits: List[str] = None, limit: int = 100,
+                     since_utc: Optional[float] = None, matcher: ProductMatcher = None) -> List[Dict]:
+        """Search for posts containing the query, optionally only those created after since_utc"""
+        run = self.run
         if subreddits is None:
-            # Get subreddits from config if available, otherwise use defaults
-            try:
-                # Try to load config to get subreddits
-                import yaml
-                import os
-                config_paths = ["config.yaml", "../config.yaml", "../../config.yaml"]
-                subreddits = ['antivirus', 'cybersecurity', 'techsupport', 'security', 'privacy']  # fallback
-                
-                for config_path in config_paths:
-                    if os.path.exists(config_path):
-                        with open(config_path, 'r') as f:
-                            config = yaml.safe_load(f)
-                            reddit_subreddits = config.get('data_collection', {}).get('reddit_subreddits')
-                            if reddit_subreddits:
-                                subreddits = reddit_subreddits
-                                self.logger.info(f"Using {len(subreddits)} subreddits from config: {subreddits}")
-                                break
-            except Exception as e:
-                self.logger.debug(f"Could not load config, using defaults: {e}")
-                subreddits = ['antivirus', 'cybersecurity', 'techsupport', 'security', 'privacy']
+            subreddits = run.subreddits
         
-        all_posts = []
+        cache_key = (query, tuple(subreddits), since_utc, matcher is not None)
+        cached = run.get(cache_key, limit)
+        if cached is not None:
+            self.logger.info(f"Reusing {len(cached)} posts already fetched for '{query}'")
+            return cached
         
-        for subreddit in subreddits:
-            posts = self._search_subreddit(query, subreddit, limit // len(subreddits))
-            all_posts.extend(posts)
-            
-            if len(all_posts) >= limit:
-                break
+        # Each subreddit pages toward the full target; results are merged and deduplicated by post id
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(subreddits)))) as executor:
+            per_subreddit = list(executor.map(
+                lambda subreddit: self._search_subreddit(query, subreddit, limit, since_utc, matcher), subreddits
+            ))
         
-        return all_posts[:limit]
+        posts = self._merge_listings(per_subreddit, limit)
+        run.put(cache_key, limit, posts)
+        return posts
     
-    def _search_subreddit(self, query: str, subreddit: str, limit: int = 25) -> List[Dict]:
-        """Search for posts in a specific subreddit"""
-        search_url = f"{self.base_url}/r/{subreddit}/search.json"
-        params = {
-            'q': query,
-            'restrict_sr': 'on',
-            'sort': 'relevance',
-            'limit': min(limit, 25),  # Reddit API limit
-            't': 'year'  # Posts from the last year
-        }
+    def _merge_listings(self, listings: List[List[Dict]], limit: int) -> List[Dict]:
+        """Interleave per-subreddit results (keeping each one's ranking) and drop duplicate post ids"""
+        seen_ids = set()
+        merged = []
         
-        full_url = f"{search_url}?{urlencode(params)}"
-        response = self.safe_request(full_url)
+        for rank in range(max((len(listing) for listing in listings), default=0)):
+            for listing in listings:
+                if rank >= len(listing):
+                    continue
+                post = listing[rank]
+                if post['id'] in seen_ids:
+                    continue
+                seen_ids.add(post['id'])
+                merged.append(post)
         
-        if not response:
-            # Try alternative approach for restricted subreddits
+        return merged[:limit]
+    
+    def _search_subreddit(self, query: str, subreddit: str, limit: int = 100,
+                          since_utc: Optional[float] = None, matcher: ProductMatcher = None) -> List[Dict]:
+        """Search a subreddit, following 'after' cursors until the target count or time window is reached.
+        
+        With since_utc the listing is sorted newest first, so the first page that lies entirely
+        before the window ends the search; relevance order gives no such guarantee.
+        """
+        search_url = f"{self.base_url}/r/{subreddit}/search.json"
+        posts = []
+        after = None
+        
+        for page in range(self.max_pages):
+            params = {
+                'q': query,
+                'restrict_sr': 'on',
+                'sort': 'new' if since_utc else 'relevance',
+                'limit': self.page_size,
+                't': self.time_filter,
+                'raw_json': 1
+            }
+            if after:
+                params['after'] = after
+            
+            response = self.safe_request(f"{search_url}?{urlencode(params)}")
+            
+            if not response and page == 0:
+                # Try alternative approach for restricted subreddits
+                return self._hot_posts(query, subreddit, limit, matcher)
+            if not response:
+                break
+            
             try:
-                # Use hot posts instead of search for restricted subreddits
-                hot_url = f"{self.base_url}/r/{subreddit}/hot.json"
-                hot_params = {'limit': min(limit, 10)}
-                hot_full_url = f"{hot_url}?{urlencode(hot_params)}"
-                response = self.safe_request(hot_full_url)
-                
-                if response:
-                    self.logger.info(f"Using hot posts from r/{subreddit} instead of search")
-            except:
-                pass
+                listing = response.json().get('data', {})
+            except Exception as e:
+                self.logger.error(f"Error parsing Reddit data from r/{subreddit}: {e}")
+                break
+            
+            children = listing.get('children', [])
+            page_posts, window_exhausted = self._parse_listing(children, subreddit, query, since_utc, matcher)
+            posts.extend(page_posts)
+            
+            after = listing.get('after')
+            if len(posts) >= limit or not after or not children or window_exhausted:
+                break
+        
+        posts = posts[:limit]
+        self.logger.info(f"Found {len(posts)} relevant posts in r/{subreddit} ({page + 1} pages)")
+        return posts
+    
+    def _hot_posts(self, query: str, subreddit: str, limit: int, matcher: ProductMatcher = None) -> List[Dict]:
+        """Use hot posts instead of search for restricted subreddits"""
+        hot_url = f"{self.base_url}/r/{subreddit}/hot.json"
+        response = self.safe_request(f"{hot_url}?{urlencode({'limit': min(limit, self.page_size), 'raw_json': 1})}")
         
         if not response:
             self.logger.warning(f"Could not access r/{subreddit} - skipping")
             return []
         
+        self.logger.info(f"Using hot posts from r/{subreddit} instead of search")
         try:
-            data = response.json()
-            posts = []
-            
-            for post_data in data.get('data', {}).get('children', []):
-                post = self._extract_post_data(post_data['data'], subreddit)
-                if post:
-                    # Filter for relevance if we used hot posts
-                    if query.lower() in post.get('review_text', '').lower():
-                        posts.append(post)
-            
-            self.logger.info(f"Found {len(posts)} relevant posts in r/{subreddit}")
-            return posts
-            
+            children = response.json().get('data', {}).get('children', [])
         except Exception as e:
             self.logger.error(f"Error parsing Reddit data from r/{subreddit}: {e}")
             return []
+        
+        posts, _ = self._parse_listing(children, subreddit, query, matcher=matcher)
+        return posts[:limit]
+    
+    def _parse_listing(self, children: List[Dict], subreddit: str, query: str,
+                       since_utc: Optional[float] = None, matcher: ProductMatcher = None) -> Tuple[List[Dict], bool]:
+        """Extract relevant posts from one listing page; also report whether the whole page predates the window"""
+        posts = []
+        older = 0
+        query_lower = query.lower()
+        
+        for post_data in children:
+            post = self._extract_post_data(post_data.get('data', {}), subreddit)
+            if not post:
+                continue
+            if since_utc and (post.get('created_utc') or 0) < since_utc:
+                older += 1
+                continue
+            # Filter for relevance (search can match on fields we do not keep)
+            if matcher:
+                if matcher.match(post.get('review_text', '')):
+                    posts.append(post)
+            elif query_lower in post.get('review_text', '').lower():
+                posts.append(post)
+        
+        return posts, bool(children) and older == len(children)
     
     def _extract_post_data(self, post_data: Dict, subreddit: str) -> Dict:
         """Extract relevant data from a Reddit post"""
@@ -151,18 +320,7 @@ class RedditScraper(BaseScraper):
             full_text = f"{post['title']} {post['selftext']}".strip()
             post['review_text'] = full_text
             
-            # Assign a rating based on score (normalized to 1-5 scale)
-            # This is approximate since Reddit doesn't have traditional ratings
-            if post['score'] >= 50:
-                post['rating'] = 5
-            elif post['score'] >= 20:
-                post['rating'] = 4
-            elif post['score'] >= 5:
-                post['rating'] = 3
-            elif post['score'] >= 0:
-                post['rating'] = 2
-            else:
-                post['rating'] = 1
+            post['rating'] = self._score_to_rating(post['score'])
             
             return post
             
@@ -170,6 +328,20 @@ class RedditScraper(BaseScraper):
             self.logger.warning(f"Error extracting post data: {e}")
             return None
     
+    def _score_to_rating(self, score: int) -> int:
+        """Assign a rating based on score (normalized to 1-5 scale)"""
+        # This is approximate since Reddit doesn't have traditional ratings
+        score = score or 0
+        if score >= 50:
+            return 5
+        elif score >= 20:
+            return 4
+        elif score >= 5:
+            return 3
+        elif score >= 0:
+            return 2
+        return 1
+    
     def scrape_reviews(self, product_name: str, max_reviews: int = 100) -> List[Dict]:
         """Scrape posts/discussions about a security product"""
         # Search for posts mentioning the product
@@ -191,11 +363,143 @@ class RedditScraper(BaseScraper):
         
         self.logger.info(f"Filtered to {len(filtered_posts)} relevant posts for {product_name}")
         
-        return self.validate_data(filtered_posts)
+        reviews = self.validate_data(filtered_posts)
+        reviews.extend(self._harvest_for_product(filtered_posts, product_name))
+        
+        return reviews
+    
+    def scrape_reviews_multi(self, product_names: List[str], max_reviews: int = 100) -> Dict[str, List[Dict]]:
+        """Scrape posts for many products with OR-combined queries, attributing each post to every product it names"""
+        matcher = ProductMatcher(product_names)
+        
+        # Request count scales with subreddits (times query groups), not subreddits x products
+        listings = []
+        for query, group in self._build_queries(product_names):
+            self.logger.info(f"Multi-product search for {len(group)} products: {query}")
+            listings.append(self.search_posts(query, limit=max_reviews * len(group), matcher=matcher))
+        posts = self._merge_listings(listings, sum(len(listing) for listing in listings))
+        
+        attributed = {name: [] for name in product_names}
+        for post in posts:
+            if len(post['review_text']) <= 50:
+                continue
+            mentioned = matcher.match(post['review_text'])
+            for name in mentioned:
+                if len(attributed[name]) < max_reviews:
+                    attributed[name].append({**post, 'product_name': name, 'products_mentioned': mentioned})
+        
+        results = {}
+        for name in product_names:
+            self.logger.info(f"Attributed {len(attributed[name])} posts to {name}")
+            reviews = self.validate_data(attributed[name])
+            reviews.extend(self._harvest_for_product(attributed[name], name))
+            results[name] = reviews
+        
+        return results
+    
+    def _build_queries(self, product_names: List[str]) -> List[Tuple[str, List[str]]]:
+        """Pack product names into as few OR queries as the query length limit allows"""
+        queries = []
+        current = []
+        for name in product_names:
+            term = f'"{name}"' if ' ' in name else name
+            if current and len(' OR '.join(current + [term])) > self.max_query_length:
+                queries.append(current)
+                current = []
+            current.append(term)
+        if current:
+            queries.append(current)
+        
+        groups = []
+        start = 0
+        for terms in queries:
+            groups.append((' OR '.join(terms), product_names[start:start + len(terms)]))
+            start += len(terms)
+        return groups
+    
+    def _harvest_for_product(self, posts: List[Dict], product_name: str) -> List[Dict]:
+        """Comment reviews for a product's top posts, when comment harvesting is enabled.
+        
+        With `stream_dir` set the comments are streamed to a per-run JSON lines file and
+        nothing is returned; otherwise up to `max_comments_total` are kept in memory.
+        """
+        if not self.comment_config.get('enabled'):
+            return []
+        
+        stream_dir = self.comment_config.get('stream_dir')
+        if stream_dir:
+            os.makedirs(stream_dir, exist_ok=True)
+            stamp = datetime.fromisoformat(self.run.started_at).strftime("%Y%m%d_%H%M%S")
+            slug = re.sub(r'[^\w.-]+', '_', product_name)
+            self.harvest_comments(posts, product_name, os.path.join(stream_dir, f"reddit_comments_{slug}_{stamp}.jsonl"))
+            return []
+        
+        max_total = self.comment_config.get('max_comments_total', 500)
+        comment_reviews = []
+        for batch in self.iter_comment_reviews(posts, product_name):
+            comment_reviews.extend(batch[:max_total - len(comment_reviews)])
+            if len(comment_reviews) >= max_total:
+                break
+        self.logger.info(f"Harvested {len(comment_reviews)} comments for {product_name}")
+        return comment_reviews
+    
+    def select_top_posts(self, posts: List[Dict], top_k: int = None, rank_by: str = None) -> List[Dict]:
+        """Pick the top K posts by score or num_comments for comment harvesting"""
+        top_k = top_k if top_k is not None else self.comment_config.get('top_k_posts', 10)
+        rank_by = rank_by or self.comment_config.get('rank_by', 'num_comments')
+        candidates = [post for post in posts if post.get('id') and post.get('num_comments', 0) > 0]
+        return sorted(candidates, key=lambda post: post.get(rank_by, 0) or 0, reverse=True)[:top_k]
+    
+    def iter_comment_reviews(self, posts: List[Dict], product_name: str) -> Iterator[List[Dict]]:
+        """Fetch comment trees of the top posts concurrently, yielding one batch of review records per post"""
+        top_posts = self.select_top_posts(posts)
+        workers = max(1, min(self.max_workers, len(top_posts)))
+        
+        # Only one window of posts is in flight at a time, bounding memory to workers x per-post cap
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for start in range(0, len(top_posts), workers):
+                window = top_posts[start:start + workers]
+                for post, comments in zip(window, executor.map(
+                    lambda post: self.get_comments(post['id'], post.get('subreddit', '')), window
+                )):
+                    records = [self._comment_to_review(comment, post, product_name) for comment in comments]
+                    yield self.validate_data(records)
+    
+    def harvest_comments(self, posts: List[Dict], product_name: str, output_path: str) -> int:
+        """Stream harvested comment records (up to max_comments_total) to a JSON lines file as each post completes"""
+        max_total = self.comment_config.get('max_comments_total', 500)
+        written = 0
+        with open(output_path, 'a', encoding='utf-8') as f:
+            for batch in self.iter_comment_reviews(posts, product_name):
+                batch = batch[:max_total - written]
+                for record in batch:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                written += len(batch)
+                if written >= max_total:
+                    break
+        
+        self.logger.info(f"Streamed {written} comments for {product_name} to {output_path}")
+        return written
+    
+    def _comment_to_review(self, comment: Dict, post: Dict, product_name: str) -> Dict:
+        """Shape a flattened comment like a post-level review record"""
+        return {
+            **comment,
+            'review_text': comment['body'],
+            'rating': self._score_to_rating(comment.get('score', 0)),
+            'product_name': product_name,
+            'subreddit': post.get('subreddit'),
+            'post_id': post.get('id'),
+            'post_title': post.get('title', ''),
+            'url': f"{post.get('url', '')}{comment.get('id', '')}"
+        }
     
     def get_comments(self, post_id: str, subreddit: str) -> List[Dict]:
-        """Get comments for a specific post (optional for deeper analysis)"""
-        comments_url = f"{self.base_url}/r/{subreddit}/comments/{post_id}.json"
+        """Get a post's comment tree, flattened to the configured depth and size caps"""
+        max_depth = self.comment_config.get('max_depth', 3)
+        max_comments = self.comment_config.get('max_comments_per_post', 200)
+        params = {'limit': max_comments, 'depth': max_depth, 'sort': 'top', 'raw_json': 1}
+        comments_url = f"{self.base_url}/r/{subreddit}/comments/{post_id}.json?{urlencode(params)}"
         response = self.safe_request(comments_url)
         
         if not response:
@@ -208,11 +512,7 @@ class RedditScraper(BaseScraper):
             # Reddit returns post + comments, comments are in data[1]
             if len(data) > 1:
                 comments_data = data[1].get('data', {}).get('children', [])
-                
-                for comment_data in comments_data:
-                    comment = self._extract_comment_data(comment_data['data'])
-                    if comment:
-                        comments.append(comment)
+                self._flatten_comments(comments_data, 0, max_depth, max_comments, comments)
             
             return comments
             
@@ -220,6 +520,28 @@ class RedditScraper(BaseScraper):
             self.logger.error(f"Error getting comments for post {post_id}: {e}")
             return []
     
+    def _flatten_comments(self, children: List[Dict], depth: int, max_depth: int,
+                          max_comments: int, out: List[Dict]):
+        """Depth-first walk of a comment tree, stopping at the depth and size caps"""
+        for child in children:
+            if len(out) >= max_comments:
+                return
+            # 'more' stubs are collapsed threads that would need extra requests
+            if child.get('kind') != 't1':
+                continue
+            
+            comment_data = child.get('data', {})
+            comment = self._extract_comment_data(comment_data)
+            if comment:
+                comment['depth'] = depth
+                comment['parent_id'] = comment_data.get('parent_id')
+                out.append(comment)
+            
+            replies = comment_data.get('replies')
+            if depth + 1 < max_depth and isinstance(replies, dict):
+                self._flatten_comments(replies.get('data', {}).get('children', []), depth + 1,
+                                       max_depth, max_comments, out)
+    
     def _extract_comment_data(self, comment_data: Dict) -> Dict:
         """Extract data from a Reddit comment"""
         try:
@@ -0,0 +1,152 @@
+"""
+Refresh Scheduler - Per-(source, company) fetch budgets from the new-review rate seen in earlier runs.
+
+Every collected review is fingerprinted, so each run tells how many reviews of
+a unit were actually new. That gives a smoothed new-reviews-per-day rate per
+unit, which sets when the unit is next due (about `target_new_per_run` new
+reviews away) and how much of the run's review budget it gets. Units that keep
+returning nothing new - sample-data fallbacks, dormant apps - back off
+exponentially, so the same budget buys more fresh reviews.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List
+import logging
+
+_DAY = 86400.0
+
+
+def review_fingerprint(review: Dict) -> str:
+    """Stable short id: the source's review/post id, else a hash of its content"""
+    key = review.get('review_id') or review.get('id')
+    if not key:
+        key = '|'.join(str(review.get(field) or '') for field in
+                       ('product_name', 'source', 'reviewer_name', 'date', 'title', 'review_text'))
+    return hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class RefreshScheduler:
+    """Track new reviews per (source, company) and plan the next run's budgets"""
+
+    def __init__(self, config: Dict = None):
+        self.logger = logging.getLogger('RefreshScheduler')
+        self.config = {**self._get_default_config(), **(config or {})}
+        self.units = self._load_state()
+
+    def _get_default_config(self) -> Dict:
+        """Default budget bounds and refresh intervals"""
+        return {
+            'state_path': 'data/raw/refresh_state.json',
+            'min_reviews': 10,              # smallest budget for a unit that is due
+            'max_reviews': 500,             # largest budget for one unit
+            'target_new_per_run': 50,       # a unit is due once about this many new reviews are expected
+            'min_interval_hours': 6,
+            'max_interval_hours': 336,
+            'smoothing': 0.5,               # weight of the latest run in the rate average
+            'max_fingerprints': 5000        # remembered review ids per unit
+        }
+
+    def _load_state(self) -> Dict:
+        path = self.config['state_path']
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('units', {})
+
+    def save(self):
+        path = self.config['state_path']
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'units': self.units}, f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+
+    @staticmethod
+    def _key(source: str, company: str) -> str:
+        return f"{source}/{company}"
+
+    def interval(self, unit: Dict) -> float:
+        """Seconds until a unit is worth fetching again"""
+        low, high = self.config['min_interval_hours'] * 3600, self.config['max_interval_hours'] * 3600
+        rate = unit.get('rate_per_day')
+        if rate is None:
+            return low          # only a baseline so far; measure a rate soon
+        interval = self.config['target_new_per_run'] / rate * _DAY if rate > 0 else high
+        interval *= 2 ** unit.get('empty_streak', 0)
+        return min(max(interval, low), high)
+
+    def plan(self, sources: List[str], companies: List[str], review_budget: int, now: float = None) -> Dict[str, int]:
+        """Per-unit max_reviews for this run; 0 means not due.
+
+        `review_budget` is the flat per-unit limit; the run's total stays within
+        review_budget x units. Units with no history get the flat limit, due units
+        share the rest in proportion to the new reviews expected since they were
+        last fetched, up to twice that expectation.
+        """
+        now = now or time.time()
+        total = review_budget * len(sources) * len(companies)
+        budgets, expected = {}, {}
+        for source in sources:
+            for company in companies:
+                key = self._key(source, company)
+                unit = self.units.get(key)
+                if unit is not None and now < unit['last_run'] + self.interval(unit):
+                    budgets[key] = 0
+                elif unit is None or unit['rate_per_day'] is None:
+                    budgets[key] = review_budget
+                else:
+                    new_reviews = unit['rate_per_day'] * (now - unit['last_run']) / _DAY
+                    # Every fetched review was new last time, so the rate is only a lower bound
+                    if unit['last_fetched'] and unit['last_new'] >= unit['last_fetched']:
+                        new_reviews *= 2
+                    expected[key] = max(new_reviews, 1.0)
+
+        remaining = max(total - sum(budgets.values()), 0)
+        weight = sum(expected.values())
+        for key, new_reviews in expected.items():
+            # Twice the expected new reviews is headroom enough; beyond that it mostly refetches known ones
+            share = min(remaining * new_reviews / weight, 2 * new_reviews)
+            budgets[key] = int(min(max(share, self.config['min_reviews']), self.config['max_reviews']))
+
+        due = sum(1 for budget in budgets.values() if budget)
+        self.logger.info(f"🗓️ Refresh plan: {due}/{len(budgets)} units due, "
+                         f"{sum(budgets.values()):,} of {total:,} review budget allocated")
+        return budgets
+
+    def record(self, source: str, company: str, reviews: List[Dict], now: float = None) -> int:
+        """Update a unit's history with one run's reviews; returns how many were new"""
+        now = now or time.time()
+        unit = self.units.setdefault(self._key(source, company), {
+            'runs': 0, 'last_run': None, 'rate_per_day': None, 'empty_streak': 0, 'fingerprints': []
+        })
+        known = set(unit['fingerprints'])
+        fresh = []
+        for fingerprint in map(review_fingerprint, reviews):
+            if fingerprint not in known:
+                known.add(fingerprint)
+                fresh.append(fingerprint)
+
+        if unit['last_run'] is not None:
+            # First run only sets the baseline; afterwards new reviews per day since the previous run
+            elapsed_days = max(now - unit['last_run'], self.config['min_interval_hours'] * 3600) / _DAY
+            rate = len(fresh) / elapsed_days
+            previous = unit['rate_per_day']
+            alpha = self.config['smoothing']
+            unit['rate_per_day'] = rate if previous is None else alpha * rate + (1 - alpha) * previous
+            unit['empty_streak'] = 0 if fresh else unit['empty_streak'] + 1
+
+        unit['fingerprints'] = (unit['fingerprints'] + fresh)[-self.config['max_fingerprints']:]
+        unit['runs'] += 1
+        unit['last_run'] = now
+        unit['last_fetched'] = len(reviews)
+        unit['last_new'] = len(fresh)
+        return len(fresh)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Rate, streak and next due time per unit"""
+        return {
+            key: {'runs': unit['runs'], 'rate_per_day': unit['rate_per_day'], 'last_new': unit.get('last_new'),
+                  'empty_streak': unit['empty_streak'], 'next_due': unit['last_run'] + self.interval(unit)}
+            for key, unit in self.units.items()
+        }
@@ -0,0 +1,185 @@
+"""
+Run Manifest - Checkpoints for resumable collection runs.
+
+A run directory holds manifest.json (status, cursor and counts per
+(source, company) unit) and one JSON-lines file of reviews per unit, appended
+page by page. The manifest is rewritten atomically after every page, so an
+interrupted run can be resumed: completed units are restored from disk and
+partial units continue from their saved cursor.
+"""
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def _slug(value: str) -> str:
+    return re.sub(r'[^\w.-]+', '_', value.strip()) or '_'
+
+
+class RunManifest:
+    """Per-unit checkpoint state of one collection run"""
+
+    def __init__(self, run_dir: str, state: Dict):
+        self.logger = logging.getLogger('RunManifest')
+        self.run_dir = run_dir
+        self.state = state
+
+    @classmethod
+    def create(cls, runs_dir: str, companies: List[str], max_reviews: int, run_id: str = None) -> 'RunManifest':
+        if run_id and os.path.exists(os.path.join(runs_dir, run_id, MANIFEST_NAME)):
+            raise ValueError(f"Run {run_id} already exists; resume it instead")
+        if not run_id:
+            run_id = stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            suffix = 1
+            while os.path.exists(os.path.join(runs_dir, run_id)):
+                run_id = f"{stamp}_{suffix}"
+                suffix += 1
+        now = datetime.now().isoformat()
+        manifest = cls(os.path.join(runs_dir, run_id), {
+            'run_id': run_id,
+            'status': 'running',
+            'created_at': now,
+            'updated_at': now,
+            'companies': list(companies),
+            'max_reviews_per_source': max_reviews,
+            'units': {}
+        })
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, run_dir: str) -> 'RunManifest':
+        with open(os.path.join(run_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return cls(run_dir, json.load(f))
+
+    @classmethod
+    def runs(cls, runs_dir: str) -> List['RunManifest']:
+        """Every run in `runs_dir`, oldest first by creation time"""
+        if not os.path.isdir(runs_dir):
+            return []
+        manifests = [cls.load(os.path.join(runs_dir, name)) for name in os.listdir(runs_dir)
+                     if os.path.exists(os.path.join(runs_dir, name, MANIFEST_NAME))]
+        return sorted(manifests, key=lambda manifest: (manifest.state['created_at'], manifest.run_id))
+
+    @classmethod
+    def latest(cls, runs_dir: str, incomplete_only: bool = True) -> Optional['RunManifest']:
+        """Most recently created run (that hasn't finished, by default)"""
+        for manifest in reversed(cls.runs(runs_dir)):
+            if not incomplete_only or manifest.state['status'] != 'complete':
+                return manifest
+        return None
+
+    @classmethod
+    def prune(cls, runs_dir: str, keep_completed: int = 1) -> List[str]:
+        """Delete all but the newest `keep_completed` completed runs; unfinished runs stay resumable"""
+        completed = [manifest for manifest in cls.runs(runs_dir) if manifest.state['status'] == 'complete']
+        pruned = completed[:max(len(completed) - keep_completed, 0)]
+        for manifest in pruned:
+            shutil.rmtree(manifest.run_dir)
+        return [manifest.run_id for manifest in pruned]
+
+    @property
+    def run_id(self) -> str:
+        return self.state['run_id']
+
+    def save(self):
+        """Atomically rewrite manifest.json"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.state['updated_at'] = datetime.now().isoformat()
+        path = os.path.join(self.run_dir, MANIFEST_NAME)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(path + '.tmp', path)
+
+    def _key(self, source: str, company: str) -> str:
+        return f"{source}/{company}"
+
+    def _reviews_path(self, source: str, company: str) -> str:
+        return os.path.join(self.run_dir, _slug(source), f"{_slug(company)}.jsonl")
+
+    def unit(self, source: str, company: str) -> Dict:
+        """Checkpoint state of one unit, created as pending on first use"""
+        return self.state['units'].setdefault(self._key(source, company), {
+            'status': 'pending', 'pages': 0, 'reviews': 0, 'bytes': 0, 'cursor': {}, 'product_info': None
+        })
+
+    def is_complete(self, source: str, company: str) -> bool:
+        return self.unit(source, company)['status'] == 'complete'
+
+    def resume_unit(self, source: str, company: str) -> Dict:
+        """Mark a unit running; saved pages are dropped when the scraper left no cursor to continue from"""
+        unit = self.unit(source, company)
+        if unit['pages'] and not unit['cursor']:
+            self.logger.info(f"↩️ {source}/{company}: no resumable cursor, restarting unit")
+            self.reset_unit(source, company)
+            unit = self.unit(source, company)
+        unit['status'] = 'running'
+        unit.pop('error', None)
+        self.save()
+        return unit
+
+    def reset_unit(self, source: str, company: str):
+        self.state['units'].pop(self._key(source, company), None)
+        path = self._reviews_path(source, company)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def reviews(self, source: str, company: str) -> List[Dict]:
+        """Reviews checkpointed for a unit (bytes past the recorded size are from an unfinished write)"""
+        unit = self.unit(source, company)
+        path = self._reviews_path(source, company)
+        if not unit['bytes'] or not os.path.exists(path):
+            return []
+        with open(path, 'rb') as f:
+            data = f.read(unit['bytes'])
+        return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+    def set_product_info(self, source: str, company: str, product_info: Dict):
+        self.unit(source, company)['product_info'] = product_info
+        self.save()
+
+    def add_page(self, source: str, company: str, reviews: List[Dict], cursor: Dict = None):
+        """Append one page of reviews and checkpoint the scraper's cursor after it"""
+        unit = self.unit(source, company)
+        path = self._reviews_path(source, company)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'ab') as f:
+            f.truncate(unit['bytes'])       # drop anything the manifest never recorded
+            f.write(''.join(json.dumps(review, ensure_ascii=False, default=str) + '\n'
+                            for review in reviews).encode('utf-8'))
+            unit['bytes'] = f.tell()
+        unit['pages'] += 1
+        unit['reviews'] += len(reviews)
+        unit['cursor'] = dict(cursor or {})
+        self.save()
+
+    def complete_unit(self, source: str, company: str):
+        unit = self.unit(source, company)
+        unit['status'] = 'complete'
+        unit['cursor'] = {}
+        self.save()
+
+    def fail_unit(self, source: str, company: str, error: Exception):
+        unit = self.unit(source, company)
+        unit['status'] = 'failed'
+        unit['error'] = str(error)
+        self.save()
+
+    def finish(self):
+        """Close the run; it stays resumable while any unit is unfinished"""
+        done = all(unit['status'] == 'complete' for unit in self.state['units'].values())
+        self.state['status'] = 'complete' if done else 'incomplete'
+        self.save()
+
+    def summary(self) -> Dict:
+        """Unit counts by status"""
+        counts = {}
+        for unit in self.state['units'].values():
+            counts[unit['status']] = counts.get(unit['status'], 0) + 1
+        return counts
@@ -0,0 +1,155 @@
+"""
+Run telemetry for scrapers: requests, retries, bytes, latency and time budgets.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+UNSCOPED = '_unscoped'
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _distribution_ms(values: List[float]) -> Dict:
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'mean': round(sum(values) / len(values) * 1000, 1),
+        'p50': round(percentile(values, 50) * 1000, 1),
+        'p95': round(percentile(values, 95) * 1000, 1),
+        'p99': round(percentile(values, 99) * 1000, 1),
+        'max': round(max(values) * 1000, 1)
+    }
+
+
+class ScraperTelemetry:
+    """Thread-safe counters for one scraper, grouped by the company being collected"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scope = UNSCOPED
+        self._scopes = {}
+
+    def _new_scope(self) -> Dict:
+        return {
+            'requests': 0,
+            'failed_requests': 0,
+            'retries': 0,
+            'bytes': 0,
+            'status_codes': {},
+            'latencies': [],
+            'network_seconds': 0.0,
+            'sleep_seconds': 0.0,
+            'page_loads': [],
+            'reviews': 0,
+            'wall_seconds': 0.0
+        }
+
+    def _current(self) -> Dict:
+        # Caller holds the lock; worker threads record into the scope the manager opened
+        if self._scope not in self._scopes:
+            self._scopes[self._scope] = self._new_scope()
+        return self._scopes[self._scope]
+
+    def reset(self):
+        with self._lock:
+            self._scopes = {}
+            self._scope = UNSCOPED
+
+    @contextmanager
+    def scope(self, name: str):
+        """Attribute everything recorded inside the block (from any thread) to `name`"""
+        with self._lock:
+            previous, self._scope = self._scope, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._current()['wall_seconds'] += time.perf_counter() - start
+                self._scope = previous
+
+    def record_request(self, seconds: float, response=None):
+        """One HTTP attempt; response is None when it failed before any reply"""
+        with self._lock:
+            metrics = self._current()
+            metrics['requests'] += 1
+            metrics['latencies'].append(seconds)
+            metrics['network_seconds'] += seconds
+            if response is None:
+                metrics['failed_requests'] += 1
+                return
+            status = str(response.status_code)
+            metrics['status_codes'][status] = metrics['status_codes'].get(status, 0) + 1
+            metrics['bytes'] += len(response.content or b'')
+            if response.status_code >= 400:
+                metrics['failed_requests'] += 1
+
+    def record_retry(self):
+        with self._lock:
+            self._current()['retries'] += 1
+
+    def record_sleep(self, seconds: float):
+        if seconds > 0:
+            with self._lock:
+                self._current()['sleep_seconds'] += seconds
+
+    def record_page_load(self, seconds: float):
+        with self._lock:
+            self._current()['page_loads'].append(seconds)
+
+    def record_reviews(self, count: int):
+        with self._lock:
+            self._current()['reviews'] += count
+
+    def _summarize(self, metrics: Dict) -> Dict:
+        wall = metrics['wall_seconds']
+        return {
+            'requests': metrics['requests'],
+            'failed_requests': metrics['failed_requests'],
+            'retries': metrics['retries'],
+            'bytes': metrics['bytes'],
+            'status_codes': dict(metrics['status_codes']),
+            'latency_ms': _distribution_ms(metrics['latencies']),
+            'network_seconds': round(metrics['network_seconds'], 3),
+            'sleep_seconds': round(metrics['sleep_seconds'], 3),
+            'page_load_ms': _distribution_ms(metrics['page_loads']),
+            'page_load_seconds': round(sum(metrics['page_loads']), 3),
+            'reviews': metrics['reviews'],
+            'wall_seconds': round(wall, 3),
+            'reviews_per_second': round(metrics['reviews'] / wall, 3) if wall else None
+        }
+
+    def snapshot(self) -> Dict:
+        """Per-scope summaries plus a total across scopes"""
+        with self._lock:
+            scopes = {name: {key: (list(value) if isinstance(value, list) else
+                                   dict(value) if isinstance(value, dict) else value)
+                             for key, value in metrics.items()}
+                      for name, metrics in self._scopes.items()}
+
+        total = self._new_scope()
+        for metrics in scopes.values():
+            for key, value in metrics.items():
+                if isinstance(value, list):
+                    total[key].extend(value)
+                elif isinstance(value, dict):
+                    for code, count in value.items():
+                        total[key][code] = total[key].get(code, 0) + count
+                else:
+                    total[key] += value
+
+        return {
+            'total': self._summarize(total),
+            'by_company': {name: self._summarize(metrics) for name, metrics in scopes.items()}
+        }
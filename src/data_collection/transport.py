@@ -0,0 +1,150 @@
+"""
+Record/replay transport for scraper sessions.
+
+Adapters mounted on a scraper's requests.Session so scrapers can run against
+recorded responses (replay), capture live ones (record) or be pointed at a
+local stub server (stub) without changing any scraper code.
+"""
+import base64
+import json
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+TRANSPORT_MODES = ['live', 'record', 'replay', 'stub']
+
+# Header carrying the original host when a request is redirected to the stub server
+ORIGINAL_HOST_HEADER = 'X-Original-Host'
+
+
+class Cassette:
+    """Recorded GET exchanges keyed by URL, stored as one JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+
+    def get(self, method: str, url: str) -> Optional[Dict]:
+        return self.entries.get(self.key(method, url))
+
+    def put(self, method: str, url: str, status: int, headers: Dict, body: bytes):
+        try:
+            encoded = {'body': body.decode('utf-8'), 'encoding': 'utf-8'}
+        except UnicodeDecodeError:
+            encoded = {'body': base64.b64encode(body).decode('ascii'), 'encoding': 'base64'}
+        with self._lock:
+            self.entries[self.key(method, url)] = {
+                'url': url,
+                'status': status,
+                'headers': {name: value for name, value in headers.items()
+                            if name.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')},
+                **encoded
+            }
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=1, ensure_ascii=False)
+
+    @staticmethod
+    def body_bytes(entry: Dict) -> bytes:
+        if entry.get('encoding') == 'base64':
+            return base64.b64decode(entry['body'])
+        return entry['body'].encode('utf-8')
+
+
+def build_response(request: requests.PreparedRequest, status: int, headers: Dict, body: bytes) -> requests.Response:
+    """A requests.Response built from stored parts, as an adapter would return it"""
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body
+    response.url = request.url
+    response.request = request
+    response.reason = 'OK' if status < 400 else 'Error'
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+    return response
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Send requests live and write every response to the cassette as it arrives"""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.cassette.put(request.method, request.url, response.status_code, dict(response.headers), response.content)
+        self.cassette.save()
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serve responses from a cassette; unrecorded URLs get a 404 (or raise when strict)"""
+
+    def __init__(self, cassette: Cassette, strict: bool = False):
+        super().__init__()
+        self.cassette = cassette
+        self.strict = strict
+        self.misses = 0
+
+    def send(self, request, **kwargs):
+        entry = self.cassette.get(request.method, request.url)
+        if entry is None:
+            self.misses += 1
+            if self.strict:
+                raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}")
+            return build_response(request, 404, {}, b'')
+        return build_response(request, entry['status'], entry['headers'], Cassette.body_bytes(entry))
+
+    def close(self):
+        pass
+
+
+class StubAdapter(HTTPAdapter):
+    """Redirect every request to a local stub server, passing the original host in a header"""
+
+    def __init__(self, target: str, **kwargs):
+        super().__init__(**kwargs)
+        self.target = urlsplit(target)
+
+    def send(self, request, **kwargs):
+        original = urlsplit(request.url)
+        request.headers[ORIGINAL_HOST_HEADER] = original.netloc
+        request.url = urlunsplit((self.target.scheme, self.target.netloc, original.path, original.query, ''))
+        return super().send(request, **kwargs)
+
+
+def mount_transport(session: requests.Session, mode: str, cassette_path: str = None,
+                    stub_url: str = None, pool_size: int = 10) -> Optional[BaseAdapter]:
+    """Mount the adapter for a transport mode on both schemes of a session"""
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"Unknown transport mode {mode!r}, expected one of {TRANSPORT_MODES}")
+
+    if mode == 'live':
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    elif mode == 'record':
+        adapter = RecordingAdapter(Cassette(cassette_path), pool_connections=pool_size, pool_maxsize=pool_size)
+    elif mode == 'replay':
+        adapter = ReplayAdapter(Cassette(cassette_path))
+    else:
+        adapter = StubAdapter(stub_url, pool_connections=pool_size, pool_maxsize=pool_size)
+
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return adapter
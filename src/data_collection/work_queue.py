@@ -0,0 +1,452 @@
+"""
+Work Queue - Durable SQLite task queue for multi-process (and multi-host) collection.
+
+DataCollectionManager.enqueue_collection() turns a run into (source, company)
+tasks; CollectionWorker processes lease them, run one page against the usual
+scraper classes and store the page as a result file. A lease that isn't
+completed or extended within the visibility timeout is handed to another
+worker, failures are retried with exponential backoff, and scrapers that left
+a resumable cursor get a follow-up task for their next page. Request spacing
+per source is shared by every worker through the same database, so adding
+workers never exceeds a source's configured delay.
+
+Usage:
+    python -m src.data_collection.work_queue enqueue --companies McAfee Norton --max-reviews 200
+    python -m src.data_collection.work_queue work --processes 4
+    python -m src.data_collection.work_queue stats
+    python -m src.data_collection.work_queue collect --run-id 20240101_120000
+
+For hosts sharing the database over a network filesystem set journal_mode to
+'delete'; WAL only works on a local disk.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import logging
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    companies TEXT NOT NULL,
+    max_reviews INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    company TEXT,
+    page INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    last_error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, available_at);
+CREATE INDEX IF NOT EXISTS tasks_run ON tasks (run_id, status);
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    next_at REAL NOT NULL
+);
+"""
+
+
+class WorkQueue:
+    """SQLite-backed task queue with leases, visibility timeouts and retry backoff"""
+
+    def __init__(self, path: str = None, config: Dict = None):
+        self.logger = logging.getLogger('WorkQueue')
+        self.config = {**self._get_default_config(), **(config or {})}
+        self.path = path or self.config['path']
+        self.results_dir = os.path.join(os.path.dirname(os.path.abspath(self.path)), 'results')
+        os.makedirs(self.results_dir, exist_ok=True)
+        self._local = threading.local()
+        self.con.executescript(_SCHEMA)
+
+    def _get_default_config(self) -> Dict:
+        """Default queue location and retry policy"""
+        return {
+            'path': 'data/queue/collection.db',
+            'visibility_timeout': 300,      # seconds a lease lasts without a heartbeat
+            'max_attempts': 5,
+            'backoff_seconds': 30,          # first retry delay, doubled per attempt
+            'max_backoff_seconds': 1800,
+            'journal_mode': 'wal'           # 'delete' when hosts share the file over NFS/SMB
+        }
+
+    @property
+    def con(self) -> sqlite3.Connection:
+        """One connection per thread (heartbeats and rate-limit waits run on other threads)"""
+        con = getattr(self._local, 'con', None)
+        if con is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            con = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            con.row_factory = sqlite3.Row
+            con.execute(f"PRAGMA journal_mode={self.config['journal_mode']}")
+            self._local.con = con
+        return con
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction taken up front, so concurrent workers serialize instead of deadlocking"""
+        con = self.con
+        con.execute('BEGIN IMMEDIATE')
+        try:
+            yield con
+        except BaseException:
+            con.execute('ROLLBACK')
+            raise
+        con.execute('COMMIT')
+
+    # Producer side
+
+    def create_run(self, run_id: str, companies: List[str], max_reviews: int):
+        with self._transaction() as con:
+            con.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)",
+                        (run_id, time.time(), json.dumps(companies), max_reviews))
+
+    def run_info(self, run_id: str = None) -> Optional[Dict]:
+        """A run's companies and limit (the latest run when run_id is omitted)"""
+        if run_id:
+            row = self.con.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        else:
+            row = self.con.execute("SELECT * FROM runs ORDER BY created_at DESC LIMIT 1").fetchone()
+        if row is None:
+            return None
+        return {'run_id': row['run_id'], 'companies': json.loads(row['companies']), 'max_reviews': row['max_reviews']}
+
+    def enqueue(self, run_id: str, source: str, company: Optional[str], payload: Dict, page: int = 0,
+                delay: float = 0.0) -> Optional[int]:
+        """Add a task; a task with the same (run, source, company, page) is only added once"""
+        now = time.time()
+        dedupe_key = f"{run_id}|{source}|{company or '*'}|{page}"
+        with self._transaction() as con:
+            cursor = con.execute(
+                "INSERT OR IGNORE INTO tasks (run_id, source, company, page, payload, dedupe_key, available_at, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, source, company, page, json.dumps(payload, default=str), dedupe_key, now + delay, now))
+            return cursor.lastrowid if cursor.rowcount else None
+
+    # Worker side
+
+    def lease(self, worker_id: str, sources: List[str] = None) -> Optional[Dict]:
+        """Claim the oldest ready task (or one whose lease expired) for visibility_timeout seconds"""
+        now = time.time()
+        where = "((status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?))"
+        params = [now, now]
+        if sources:
+            where += f" AND source IN ({', '.join('?' for _ in sources)})"
+            params.extend(sources)
+        with self._transaction() as con:
+            while True:
+                row = con.execute(f"SELECT * FROM tasks WHERE {where} ORDER BY available_at, id LIMIT 1",
+                                  params).fetchone()
+                if row is None:
+                    return None
+                if row['status'] != 'leased':
+                    break
+                # The worker holding it died or stalled; that attempt counts like a failure
+                if row['attempts'] < self.config['max_attempts']:
+                    self.logger.warning(f"⏰ Task {row['id']} lease of {row['lease_owner']} expired; re-leasing")
+                    break
+                con.execute("UPDATE tasks SET status = 'failed', finished_at = ?, last_error = ?, lease_owner = NULL, "
+                            "lease_expires = NULL WHERE id = ?",
+                            (now, f"lease expired after {row['attempts']} attempts", row['id']))
+            con.execute("UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                        "attempts = attempts + 1 WHERE id = ?",
+                        (worker_id, now + self.config['visibility_timeout'], row['id']))
+        task = dict(row)
+        task['payload'] = json.loads(task['payload'])
+        task['attempts'] += 1
+        return task
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend a lease; False when the lease was lost to another worker"""
+        with self._transaction() as con:
+            cursor = con.execute("UPDATE tasks SET lease_expires = ? WHERE id = ? AND lease_owner = ? "
+                                 "AND status = 'leased'",
+                                 (time.time() + self.config['visibility_timeout'], task_id, worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str, result: Dict = None) -> bool:
+        with self._transaction() as con:
+            cursor = con.execute("UPDATE tasks SET status = 'done', finished_at = ?, result = ?, lease_owner = NULL, "
+                                 "lease_expires = NULL WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                                 (time.time(), json.dumps(result or {}, default=str), task_id, worker_id))
+            return cursor.rowcount == 1
+
+    def fail(self, task_id: int, worker_id: str, error: Exception) -> str:
+        """Requeue with exponential backoff (plus jitter), or mark failed after max_attempts"""
+        with self._transaction() as con:
+            row = con.execute("SELECT attempts FROM tasks WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                              (task_id, worker_id)).fetchone()
+            if row is None:
+                return 'lost'
+            if row['attempts'] >= self.config['max_attempts']:
+                con.execute("UPDATE tasks SET status = 'failed', finished_at = ?, last_error = ?, lease_owner = NULL, "
+                            "lease_expires = NULL WHERE id = ?", (time.time(), str(error), task_id))
+                return 'failed'
+            delay = min(self.config['backoff_seconds'] * 2 ** (row['attempts'] - 1),
+                        self.config['max_backoff_seconds']) * random.uniform(0.8, 1.2)
+            con.execute("UPDATE tasks SET status = 'queued', available_at = ?, last_error = ?, lease_owner = NULL, "
+                        "lease_expires = NULL WHERE id = ?", (time.time() + delay, str(error), task_id))
+            return 'retry'
+
+    def acquire_slot(self, key: str, min_interval: float) -> float:
+        """Reserve the next request slot for `key` across every process; returns seconds to wait"""
+        with self._transaction() as con:
+            now = time.time()
+            row = con.execute("SELECT next_at FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            next_at = row['next_at'] if row else 0.0
+            con.execute("INSERT OR REPLACE INTO rate_limits VALUES (?, ?)", (key, max(now, next_at) + min_interval))
+        return max(0.0, next_at - now)
+
+    # Results and monitoring
+
+    def result_path(self, task: Dict) -> str:
+        return os.path.join(self.results_dir, task['run_id'], f"{task['id']}.json")
+
+    def tasks(self, run_id: str, status: str = None) -> List[Dict]:
+        query = "SELECT * FROM tasks WHERE run_id = ?" + (" AND status = ?" if status else "")
+        rows = self.con.execute(query + " ORDER BY source, company, page", (run_id, status) if status else (run_id,))
+        return [{**dict(row), 'payload': json.loads(row['payload'])} for row in rows]
+
+    def stats(self, run_id: str = None, window: float = 300.0) -> Dict:
+        """Depth by state, retries, active workers and completions per minute over the last `window` seconds"""
+        now = time.time()
+        where = "WHERE run_id = :run_id" if run_id else ""
+        row = self.con.execute(f"""
+            SELECT count(*) AS total,
+                   coalesce(sum(status = 'queued' AND available_at <= :now), 0) AS ready,
+                   coalesce(sum(status = 'queued' AND available_at > :now), 0) AS backing_off,
+                   coalesce(sum(status = 'leased' AND lease_expires >= :now), 0) AS leased,
+                   coalesce(sum(status = 'leased' AND lease_expires < :now), 0) AS expired_leases,
+                   coalesce(sum(status = 'done'), 0) AS done,
+                   coalesce(sum(status = 'failed'), 0) AS failed,
+                   coalesce(sum(max(attempts - 1, 0)), 0) AS retries,
+                   coalesce(sum(status = 'done' AND finished_at >= :since), 0) AS recent,
+                   count(DISTINCT CASE WHEN status = 'leased' AND lease_expires >= :now THEN lease_owner END)
+                       AS active_workers,
+                   min(CASE WHEN status = 'queued' AND available_at <= :now THEN available_at END) AS oldest_ready
+            FROM tasks {where}""",
+            {'now': now, 'since': now - window, 'run_id': run_id}).fetchone()
+        stats = {key: row[key] for key in row.keys() if key not in ('recent', 'oldest_ready')}
+        stats['depth'] = stats['ready'] + stats['backing_off'] + stats['leased'] + stats['expired_leases']
+        stats['throughput_per_minute'] = round(row['recent'] / (window / 60.0), 2)
+        stats['oldest_ready_seconds'] = round(now - row['oldest_ready'], 1) if row['oldest_ready'] else 0.0
+        return stats
+
+    def close(self):
+        con = getattr(self._local, 'con', None)
+        if con is not None:
+            con.close()
+            self._local.con = None
+
+
+class SharedRateLimiter:
+    """Drop-in for a scraper's RateLimiter that spaces requests across all processes sharing the queue"""
+
+    def __init__(self, queue: WorkQueue, key: str, min_interval: float):
+        self.queue = queue
+        self.key = key
+        self.min_interval = min_interval
+
+    def wait(self) -> float:
+        wait = self.queue.acquire_slot(self.key, self.min_interval)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class CollectionWorker:
+    """Lease tasks and run them against the manager's scrapers until the queue drains"""
+
+    def __init__(self, queue: WorkQueue, manager=None, worker_id: str = None, sources: List[str] = None,
+                 poll_interval: float = 2.0):
+        from .collection_manager import DataCollectionManager
+
+        self.logger = logging.getLogger('CollectionWorker')
+        self.queue = queue
+        self.manager = manager or DataCollectionManager()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.sources = sources
+        self.poll_interval = poll_interval
+        self.stats = {'done': 0, 'retried': 0, 'failed': 0, 'lost': 0, 'reviews': 0}
+        self._limited = False
+        self._run_ids = {}      # source -> run whose per-run scraper state is loaded
+
+    def _share_rate_limits(self):
+        """Replace each scraper's in-process limiter with one shared through the queue database"""
+        if self._limited:
+            return
+        for source_name, scraper in self.manager.scrapers.items():
+            scraper.rate_limiter = SharedRateLimiter(self.queue, source_name, scraper.delay)
+        self._limited = True
+
+    def run(self, max_tasks: int = None, exit_when_empty: bool = True) -> Dict:
+        """Process tasks; returns this worker's counts"""
+        self._share_rate_limits()
+        processed = 0
+        while max_tasks is None or processed < max_tasks:
+            task = self.queue.lease(self.worker_id, self.sources)
+            if task is None:
+                if exit_when_empty and self.queue.stats()['depth'] == 0:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            self.process(task)
+            processed += 1
+        self.logger.info(f"👷 {self.worker_id} finished: {self.stats}")
+        return self.stats
+
+    def process(self, task: Dict):
+        """Run one task with a heartbeat keeping its lease alive"""
+        label = f"{task['source']}/{task['company'] or 'all companies'} page {task['page']}"
+        stop = threading.Event()
+        interval = self.queue.config['visibility_timeout'] / 3
+
+        def heartbeat():
+            while not stop.wait(interval):
+                if not self.queue.heartbeat(task['id'], self.worker_id):
+                    self.logger.warning(f"⚠️ Lost lease on task {task['id']} ({label})")
+                    return
+
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+        try:
+            result = self._execute(task)
+        except Exception as e:
+            outcome = self.queue.fail(task['id'], self.worker_id, e)
+            key = {'retry': 'retried', 'failed': 'failed', 'lost': 'lost'}[outcome]
+            self.stats[key] += 1
+            self.logger.error(f"❌ Task {task['id']} ({label}, attempt {task['attempts']}): {e} -> {outcome}")
+            return
+        finally:
+            stop.set()
+
+        if self.queue.complete(task['id'], self.worker_id, result):
+            self.stats['done'] += 1
+            self.stats['reviews'] += result['reviews']
+            self.logger.info(f"✅ Task {task['id']} ({label}): {result['reviews']} reviews")
+        else:
+            self.stats['lost'] += 1
+            self.logger.warning(f"⚠️ Task {task['id']} ({label}) finished after its lease expired")
+
+    def _execute(self, task: Dict) -> Dict:
+        scraper = self.manager.scrapers[task['source']]
+        payload = task['payload']
+        max_reviews = payload['max_reviews']
+        units = {}
+        follow_up = None
+
+        # Per-run scraper state (Reddit's search cache and review limit) must not outlive its run
+        if hasattr(scraper, 'start_run') and self._run_ids.get(task['source']) != task['run_id']:
+            scraper.start_run(review_limit=max_reviews)
+            self._run_ids[task['source']] = task['run_id']
+
+        if task['company'] is None:
+            # Multi-product sources search for every company at once
+            with scraper.telemetry.scope('all_companies'):
+                reviews_by_company = scraper.scrape_reviews_multi(payload['companies'], max_reviews)
+            for company in payload['companies']:
+                reviews = reviews_by_company.get(company, [])
+                posts = [review for review in reviews if review.get('source') == 'Reddit']
+                units[company] = {'reviews': reviews, 'product_info': scraper.product_info_from_posts(company, posts)}
+        else:
+            company = task['company']
+            cursor = dict(payload.get('cursor') or {})
+            with scraper.telemetry.scope(company):
+                product_info = scraper.get_product_info(company) if task['page'] == 0 else None
+                pages = scraper.iter_review_pages(company, max_reviews, cursor=cursor)
+                try:
+                    page = next(pages, None)
+                finally:
+                    pages.close()
+            units[company] = {'reviews': page or [], 'product_info': product_info}
+            # A cursor means the scraper can continue; the next page becomes its own task
+            if page is not None and cursor:
+                follow_up = {**payload, 'cursor': cursor}
+
+        path = self.queue.result_path(task)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'task_id': task['id'], 'source': task['source'], 'page': task['page'], 'units': units},
+                      f, ensure_ascii=False, default=str)
+        os.replace(path + '.tmp', path)
+
+        if follow_up is not None:
+            self.queue.enqueue(task['run_id'], task['source'], task['company'], follow_up, page=task['page'] + 1)
+        return {'reviews': sum(len(unit['reviews']) for unit in units.values()), 'path': path,
+                'follow_up': follow_up is not None}
+
+
+def _worker_process(queue_path: str, queue_config: Dict, manager_factory: Optional[Callable],
+                    sources: Optional[List[str]], exit_when_empty: bool):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    queue = WorkQueue(queue_path, queue_config)
+    manager = manager_factory() if manager_factory else None
+    CollectionWorker(queue, manager, sources=sources).run(exit_when_empty=exit_when_empty)
+
+
+def run_workers(processes: int, queue_path: str = None, queue_config: Dict = None,
+                manager_factory: Callable = None, sources: List[str] = None, exit_when_empty: bool = True) -> int:
+    """Start `processes` worker processes on this host and wait for them; returns how many exited cleanly"""
+    workers = [multiprocessing.Process(target=_worker_process, name=f"collector-{i}",
+                                       args=(queue_path, queue_config, manager_factory, sources, exit_when_empty))
+               for i in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(worker.exitcode == 0 for worker in workers)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['enqueue', 'work', 'stats', 'collect'])
+    parser.add_argument('--queue', help='queue database (default: work_queue.path in config.yaml)')
+    parser.add_argument('--companies', nargs='+')
+    parser.add_argument('--max-reviews', type=int)
+    parser.add_argument('--sources', nargs='+', help='only these scrapers (enqueue / work)')
+    parser.add_argument('--processes', type=int, default=1, help='worker processes on this host')
+    parser.add_argument('--run-id')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    from .collection_manager import DataCollectionManager
+    manager = DataCollectionManager()
+    queue_config = manager.config.get('work_queue', {})
+    queue = WorkQueue(args.queue, queue_config)
+
+    if args.command == 'enqueue':
+        run_id = manager.enqueue_collection(queue, args.companies, args.max_reviews, args.sources, args.run_id)
+        print(json.dumps({'run_id': run_id, **queue.stats(run_id)}, indent=2))
+    elif args.command == 'work':
+        clean = run_workers(args.processes, queue.path, queue_config, sources=args.sources)
+        print(json.dumps({'workers_ok': clean, **queue.stats(args.run_id)}, indent=2))
+    elif args.command == 'stats':
+        print(json.dumps(queue.stats(args.run_id), indent=2))
+    else:
+        all_data = manager.collect_queued_run(queue, args.run_id)
+        print(json.dumps({'run_id': all_data['run_id'], 'summary': all_data['summary']}, indent=2, default=str))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,26 @@
 """
 Data Preprocessing Module - Clean, standardize and prepare data for analysis.
+
+Submodules (and pandas) are imported on first attribute access.
 """
+import importlib
+
+_EXPORTS = {
+    'DataCleaner': '.data_cleaner',
+    'DataValidator': '.data_validator',
+    'SchemaCompactor': '.schema'
+}
+
+__all__ = ['DataCleaner', 'DataValidator', 'SchemaCompactor']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from .data_cleaner import DataCleaner
-from .text_processor import TextProcessor
-from .data_validator import DataValidator
 
-__all__ = ['DataCleaner', 'TextProcessor', 'DataValidator']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
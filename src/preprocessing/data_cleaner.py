@@ -11,15 +11,24 @@ from datetime import datetime, timedelta
 import logging
 import warnings
 
+from .plan import CleaningPlan
+from .polars_engine import PolarsCleaningEngine, polars_available
+from .profiling import StageProfiler
+from .schema import SchemaCompactor
+
 warnings.filterwarnings('ignore')
 
 class DataCleaner:
     """Comprehensive data cleaning pipeline for multi-source consumer security reviews"""
     
-    def __init__(self, config: Dict = None):
+    ENGINES = ('pandas', 'polars')
+    
+    def __init__(self, config: Dict = None, engine: str = None):
         self.logger = self._setup_logger()
         self.config = config or self._get_default_config()
+        self.engine = self._resolve_engine(engine or self.config.get('engine', 'pandas'))
         self.cleaning_stats = {}
+        self.last_report = None
         
     def _setup_logger(self):
         """Setup logging for data cleaning operations"""
@@ -41,9 +50,24 @@ class DataCleaner:
             'clean_text': True,
             'filter_languages': ['en'],
             'remove_spam': True,
-            'normalize_dates': True
+            'normalize_dates': True,
+            'profile_stages': False,    # per-stage time and deep memory; adds ~35% to cleaning time
+            'trace_memory': False,      # tracemalloc per stage; slows object-heavy stages
+            'profile_output': None,     # .jsonl appends JSON lines, .prom writes Prometheus text
+            'engine': 'pandas',         # 'polars' runs steps 1-9 as one lazy query (needs polars)
+            'compact_schema': True,     # categoricals, small ints and Arrow strings for the cleaned frame
+            'schema': {}                # SchemaCompactor overrides, e.g. {'drop_raw_text': True}
         }
     
+    def _resolve_engine(self, engine: str) -> str:
+        """Validate the engine name; fall back to pandas when polars isn't installed"""
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; use one of {self.ENGINES}")
+        if engine == 'polars' and not polars_available():
+            self.logger.warning("⚠️ polars is not installed; using the pandas engine")
+            return 'pandas'
+        return engine
+    
     def load_data(self, file_path: str) -> pd.DataFrame:
         """Load data from JSON or CSV file"""
         try:
@@ -64,154 +88,168 @@ class DataCleaner:
             raise
     
     def clean_pipeline(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Complete data cleaning pipeline"""
+        """Complete data cleaning pipeline; the report (with per-stage profile) is kept in last_report"""
         self.logger.info("🧹 Starting comprehensive data cleaning pipeline...")
         
         original_count = len(df)
         self.cleaning_stats = {'original_count': original_count}
+        profiler = StageProfiler(trace_memory=self.config.get('trace_memory', False))
         
-        # Step 1: Remove completely empty records
-        df = self._remove_empty_records(df)
-        
-        # Step 2: Standardize column names and types
-        df = self._standardize_columns(df)
-        
-        # Step 3: Clean and validate review text
-        df = self._clean_review_text(df)
-        
-        # Step 4: Standardize ratings across sources
-        df = self._standardize_ratings(df)
-        
-        # Step 5: Clean and normalize dates
-        df = self._clean_dates(df)
-        
-        # Step 6: Remove duplicates
-        if self.config['remove_duplicates']:            
-            df = self._remove_duplicates(df)
-        
-        # Step 7: Filter by quality metrics
-        df = self._filter_by_quality(df)
-        
-        # Step 8: Add derived features
-        df = self._add_derived_features(df)
-        
-        # Step 9: Final validation
-        df = self._final_validation(df)
+        if self.engine == 'polars':
+            # Steps 1-9 as one lazy Polars query
+            data = df
+            steps = [('polars_pipeline', self._run_polars_engine)]
+        else:
+            # Steps 1-8 filter and derive on a deferred plan; step 9 materializes the surviving rows once
+            data = CleaningPlan(df)
+            steps = [
+                # Step 1: Remove completely empty records
+                ('remove_empty_records', self._remove_empty_records),
+                # Step 2: Standardize column names and types
+                ('standardize_columns', self._standardize_columns),
+                # Step 3: Clean and validate review text
+                ('clean_review_text', self._clean_review_text),
+                # Step 4: Standardize ratings across sources
+                ('standardize_ratings', self._standardize_ratings),
+                # Step 5: Clean and normalize dates
+                ('clean_dates', self._clean_dates),
+                # Step 6: Remove duplicates
+                ('remove_duplicates', self._remove_duplicates if self.config['remove_duplicates'] else None),
+                # Step 7: Filter by quality metrics
+                ('filter_by_quality', self._filter_by_quality),
+                # Step 8: Add derived features
+                ('add_derived_features', self._add_derived_features),
+                # Step 9: Final validation
+                ('final_validation', self._final_validation)
+            ]
+        
+        # Step 10: Compact dtypes for analysis
+        if self.config.get('compact_schema', True):
+            steps.append(('compact_schema', self._compact_schema))
+        
+        for name, step in steps:
+            if step is None:
+                continue
+            if self.config.get('profile_stages', False):
+                data = profiler.run(name, step, data)
+            else:
+                data = step(data)
+        df = data
         
         # Generate cleaning report
-        self._generate_cleaning_report(original_count, len(df))
+        report = self._generate_cleaning_report(original_count, len(df), profiler)
+        self.last_report = report
+        
+        if profiler.stages and self.config.get('profile_output'):
+            profiler.write(self.config['profile_output'], run_id=report['generated_at'])
         
         return df
     
-    def _remove_empty_records(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _remove_empty_records(self, plan: CleaningPlan) -> CleaningPlan:
         """Remove records missing critical information."""
 
-        # Create mask: require (non-empty review_text OR non-empty title) AND non-null product_name
+        # Require (non-empty review_text OR non-empty title) AND non-null product_name
+        review_text = plan.optional('review_text')
+        title = plan.optional('title')
         mask = (
-            ((df['review_text'].notna()) & (df['review_text'].str.len() > 0))
-            | ((df['title'].notna()) & (df['title'].str.len() > 0))
-        ) & df['product_name'].notna()
+            ((review_text.notna()) & (review_text.str.len() > 0))
+            | ((title.notna()) & (title.str.len() > 0))
+        ) & plan.column('product_name').notna()
 
-        # Apply filter
-        df_clean = df[mask].copy()
-        removed = len(df) - len(df_clean)
+        removed = plan.filter('remove_empty_records', mask)
 
         if removed > 0:
             self.logger.info(f"🗑️  Removed {removed} empty records")
 
         self.cleaning_stats['empty_records_removed'] = removed
-        return df_clean
-
+        return plan
 
-    def _standardize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _standardize_columns(self, plan: CleaningPlan) -> CleaningPlan:
         """Standardize column names and data types"""
-        # Create unified review text from multiple sources
-        df['review_text_unified'] = ''
-        
-        # Combine title and review text for Reddit posts
-        for idx, row in df.iterrows():
+        # Combine title, review text and (Reddit) selftext into one review text
+        def unify_text(title, review_text, selftext):
             text_parts = []
             
-            if pd.notna(row.get('title')) and str(row['title']).strip():
-                text_parts.append(str(row['title']).strip())
+            if pd.notna(title) and str(title).strip():
+                text_parts.append(str(title).strip())
             
-            if pd.notna(row.get('review_text')) and str(row['review_text']).strip():
-                text_parts.append(str(row['review_text']).strip())
+            if pd.notna(review_text) and str(review_text).strip():
+                text_parts.append(str(review_text).strip())
             
-            if pd.notna(row.get('selftext')) and str(row['selftext']).strip():
-                selftext = str(row['selftext']).strip()
+            if pd.notna(selftext) and str(selftext).strip():
+                selftext = str(selftext).strip()
                 if selftext not in text_parts:  # Avoid duplication
                     text_parts.append(selftext)
             
-            df.loc[idx, 'review_text_unified'] = ' '.join(text_parts)
+            return ' '.join(text_parts)
+        
+        plan.derive('review_text_unified', [
+            unify_text(*values) for values in zip(
+                plan.optional('title'), plan.optional('review_text'), plan.optional('selftext'))
+        ])
         
         # Standardize product names
-        df['product_name'] = df['product_name'].str.strip().str.title()
+        plan.derive('product_name', plan.column('product_name').str.strip().str.title())
         
         # Create unified rating (handle different rating systems)
-        df['rating_unified'] = df['rating']
+        plan.derive('rating_unified', plan.column('rating'))
         
         # Standardize source information
-        df['data_source'] = df['collection_source'].fillna('unknown')
-        df['original_source'] = df['source'].fillna('unknown')
+        plan.derive('data_source', plan.column('collection_source').fillna('unknown'))
+        plan.derive('original_source', plan.column('source').fillna('unknown'))
         
         # Convert dates to datetime
-        if 'created_utc' in df.columns:
-            df['created_utc'] = pd.to_numeric(df['created_utc'], errors='coerce')
-            df['date_from_utc'] = pd.to_datetime(df['created_utc'], unit='s', errors='coerce')
+        if plan.has('created_utc'):
+            created_utc = pd.to_numeric(plan.column('created_utc'), errors='coerce')
+            plan.derive('created_utc', created_utc)
+            plan.derive('date_from_utc', pd.to_datetime(created_utc, unit='s', errors='coerce'))
         
         self.logger.info("✅ Standardized columns and data types")
-        return df
+        return plan
     
-    import re
-import pandas as pd
-
-def _clean_review_text(self, df: pd.DataFrame) -> pd.DataFrame:
-    """Clean and normalize review text."""
-    if not self.config.get('clean_text', False):
-        return df
+    def _clean_review_text(self, plan: CleaningPlan) -> CleaningPlan:
+        """Clean and normalize review text."""
+        if not self.config.get('clean_text', False):
+            return plan
 
-    original_len = len(df)
+        # Pre-compile regex patterns for performance
+        ws_pattern = re.compile(r'\s+')
+        url_pattern = re.compile(r'http[s]?://\S+')
+        # Keep word chars, whitespace, and common punctuation
+        nice_pattern = re.compile(r'[^\w\s\.,!?;:()\-"\'’]')
 
-    # Pre-compile regex patterns for performance
-    ws_pattern = re.compile(r'\s+')
-    url_pattern = re.compile(r'http[s]?://\S+')
-    # Keep word chars, whitespace, and common punctuation
-    nice_pattern = re.compile(r'[^\w\s\.,!?;:()\-"\'’]')
+        def clean_text(text):
+            if pd.isna(text):
+                return ''
+            text = str(text)
+            text = ws_pattern.sub(' ', text)
+            text = url_pattern.sub('', text)
+            text = nice_pattern.sub(' ', text)
+            # Collapse repeated punctuation
+            text = re.sub(r'\.{3,}', '...', text)
+            text = re.sub(r'!{2,}', '!', text)
+            text = re.sub(r'\?{2,}', '?', text)
+            # Trim whitespace
+            return ' '.join(text.split()).strip()
 
-    def clean_text(text):
-        if pd.isna(text):
-            return ''
-        text = str(text)
-        text = ws_pattern.sub(' ', text)
-        text = url_pattern.sub('', text)
-        text = nice_pattern.sub(' ', text)
-        # Collapse repeated punctuation
-        text = re.sub(r'\.{3,}', '...', text)
-        text = re.sub(r'!{2,}', '!', text)
-        text = re.sub(r'\?{2,}', '?', text)
-        # Trim whitespace
-        return ' '.join(text.split()).strip()
+        cleaned = plan.column('review_text_unified').apply(clean_text)
+        plan.derive('review_text_unified', cleaned)
 
-    df['review_text_unified'] = df['review_text_unified'].apply(clean_text)
+        # Filter by length constraints
+        min_len = self.config.get('min_review_length', 0)
+        max_len = self.config.get('max_review_length', float('inf'))
+        removed = plan.filter('clean_review_text', cleaned.str.len().between(min_len, max_len))
 
-    # Filter by length constraints
-    min_len = self.config.get('min_review_length', 0)
-    max_len = self.config.get('max_review_length', float('inf'))
-    length_mask = df['review_text_unified'].str.len().between(min_len, max_len)
-    df_clean = df[length_mask].copy()
-
-    removed = original_len - len(df_clean)
-    if removed > 0:
-        self.logger.info(f"📝 Removed {removed} records during text cleaning")
-    self.cleaning_stats['text_length_filtered'] = removed
+        if removed > 0:
+            self.logger.info(f"📝 Removed {removed} records during text cleaning")
+        self.cleaning_stats['text_length_filtered'] = removed
 
-    return df_clean
+        return plan
     
-    def _standardize_ratings(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _standardize_ratings(self, plan: CleaningPlan) -> CleaningPlan:
         """Standardize ratings to 1-5 scale"""
         if not self.config['standardize_ratings']:
-            return df
+            return plan
         
         def standardize_rating(rating, source):
             if pd.isna(rating):
@@ -239,84 +277,77 @@ def _clean_review_text(self, df: pd.DataFrame) -> pd.DataFrame:
             # Default: assume 1-5 scale
             return max(1, min(5, rating))
         
-        df['rating_standardized'] = df.apply(
-            lambda row: standardize_rating(row['rating_unified'], row['data_source']), 
-            axis=1
-        )
+        plan.derive('rating_standardized', pd.Series([
+            standardize_rating(rating, source)
+            for rating, source in zip(plan.column('rating_unified'), plan.column('data_source'))
+        ], index=plan.rows, dtype='float64'))
         
         self.logger.info("⭐ Standardized ratings to 1-5 scale")
-        return df
+        return plan
     
-    def _clean_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _clean_dates(self, plan: CleaningPlan) -> CleaningPlan:
         """Clean and normalize dates"""
         if not self.config['normalize_dates']:
-            return df
-        
-        # Create unified date column
-        df['date_unified'] = pd.NaT
+            return plan
         
         # Use date column first
-        if 'date' in df.columns:
-            df['date_unified'] = pd.to_datetime(df['date'], errors='coerce')
+        if plan.has('date'):
+            date_unified = pd.to_datetime(plan.column('date'), errors='coerce')
+        else:
+            date_unified = pd.Series(pd.NaT, index=plan.rows, dtype='datetime64[ns]')
         
         # Fill missing with UTC dates for Reddit
-        mask = df['date_unified'].isna() & df['date_from_utc'].notna()
-        df.loc[mask, 'date_unified'] = df.loc[mask, 'date_from_utc']
+        date_from_utc = plan.optional('date_from_utc')
+        fill = date_unified.isna() & date_from_utc.notna()
+        if fill.any():
+            date_unified = date_unified.copy()
+            date_unified[fill] = date_from_utc[fill]
+        plan.derive('date_unified', date_unified)
         
         # Add date features
-        df['year'] = df['date_unified'].dt.year
-        df['month'] = df['date_unified'].dt.month
-        df['quarter'] = df['date_unified'].dt.quarter
+        plan.derive('year', date_unified.dt.year)
+        plan.derive('month', date_unified.dt.month)
+        plan.derive('quarter', date_unified.dt.quarter)
         
         # Calculate days since collection
-        if 'scraped_at' in df.columns:
-            df['scraped_at'] = pd.to_datetime(df['scraped_at'], errors='coerce')
-            df['days_old'] = (df['scraped_at'] - df['date_unified']).dt.days
+        if plan.has('scraped_at'):
+            scraped_at = pd.to_datetime(plan.column('scraped_at'), errors='coerce')
+            plan.derive('scraped_at', scraped_at)
+            plan.derive('days_old', (scraped_at - date_unified).dt.days)
         
         self.logger.info("📅 Normalized dates and added temporal features")
-        return df
+        return plan
     
-    def _remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _remove_duplicates(self, plan: CleaningPlan) -> CleaningPlan:
         """Remove duplicate reviews"""
-        original_count = len(df)
-        
         # Remove exact duplicates based on text and product
-        df = df.drop_duplicates(subset=['product_name', 'review_text_unified'], keep='first')
-        
-        # Remove near-duplicates (same reviewer, same product, similar date)
-        def identify_near_duplicates():
-            duplicates = []
-            
-            for product in df['product_name'].unique():
-                product_df = df[df['product_name'] == product]
-                
-                # Group by reviewer if available
-                if 'reviewer_name' in product_df.columns:
-                    for reviewer in product_df['reviewer_name'].dropna().unique():
-                        reviewer_reviews = product_df[product_df['reviewer_name'] == reviewer]
-                        
-                        if len(reviewer_reviews) > 1:
-                            # Keep only the most recent review
-                            if 'date_unified' in reviewer_reviews.columns:
-                                to_remove = reviewer_reviews.nsmallest(len(reviewer_reviews) - 1, 'date_unified')
-                                duplicates.extend(to_remove.index.tolist())
-            
-            return duplicates
+        exact = plan.view(['product_name', 'review_text_unified']).duplicated(keep='first')
+        removed = plan.filter('remove_duplicates', ~exact)
+        
+        # Remove near-duplicates (same reviewer, same product): exactly one review per reviewer
+        # is kept, the last in (date, row) order with undated reviews ranked after dated ones,
+        # as nsmallest(len - 1, 'date_unified') ranks them
+        if plan.has('reviewer_name'):
+            reviews = plan.view(['product_name', 'reviewer_name', 'date_unified'])
+            reviews = reviews[reviews['reviewer_name'].notna()]
+            keys = ['product_name', 'reviewer_name']
+            repeated = reviews.groupby(keys, sort=False, observed=True)['reviewer_name'].transform('size') > 1
+            if 'date_unified' in reviews.columns and repeated.any():
+                reviews = reviews[repeated]
+                kept = reviews.sort_values('date_unified', kind='stable', na_position='last').groupby(
+                    keys, sort=False, observed=True).tail(1).index
+                near_dupes = reviews.index[~reviews.index.isin(kept)]
+                removed += plan.filter('remove_duplicates', ~plan.rows.isin(near_dupes))
         
-        near_dupe_indices = identify_near_duplicates()
-        if near_dupe_indices:
-            df = df.drop(near_dupe_indices)
-        
-        removed = original_count - len(df)
         if removed > 0:
             self.logger.info(f"🔄 Removed {removed} duplicate reviews")
         
         self.cleaning_stats['duplicates_removed'] = removed
-        return df
+        return plan
     
-    def _filter_by_quality(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _filter_by_quality(self, plan: CleaningPlan) -> CleaningPlan:
         """Filter reviews by quality metrics"""
-        original_count = len(df)
+        removed = 0
         
         # Remove likely spam (very short, repetitive text)
         def is_spam(text):
@@ -335,58 +366,61 @@ def _clean_review_text(self, df: pd.DataFrame) -> pd.DataFrame:
             return False
         
         if self.config['remove_spam']:
-            spam_mask = df['review_text_unified'].apply(is_spam)
-            df = df[~spam_mask].copy()
+            spam_mask = plan.column('review_text_unified').apply(is_spam)
+            removed = plan.filter('filter_by_quality', ~spam_mask)
         
-        removed = original_count - len(df)
         if removed > 0:
             self.logger.info(f"🚫 Removed {removed} low-quality/spam reviews")
         
         self.cleaning_stats['quality_filtered'] = removed
-        return df
+        return plan
     
-    def _add_derived_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_derived_features(self, plan: CleaningPlan) -> CleaningPlan:
         """Add derived features for analysis"""
+        text = plan.column('review_text_unified')
+        
         # Text length features
-        df['text_length'] = df['review_text_unified'].str.len()
-        df['word_count'] = df['review_text_unified'].str.split().str.len()
+        word_count = text.str.count(r'\S+')  # same as str.split().str.len() without the token lists
+        plan.derive('text_length', text.str.len())
+        plan.derive('word_count', word_count)
         
         # Sentiment indicators (basic)
         positive_words = ['good', 'great', 'excellent', 'amazing', 'love', 'best', 'perfect', 'fantastic']
         negative_words = ['bad', 'terrible', 'awful', 'hate', 'worst', 'horrible', 'useless', 'garbage']
         
-        df['positive_words'] = df['review_text_unified'].str.lower().apply(
-            lambda x: sum(1 for word in positive_words if word in str(x))
-        )
-        df['negative_words'] = df['review_text_unified'].str.lower().apply(
-            lambda x: sum(1 for word in negative_words if word in str(x))
-        )
+        lowered = text.str.lower()
+        positive = lowered.apply(lambda x: sum(1 for word in positive_words if word in str(x)))
+        negative = lowered.apply(lambda x: sum(1 for word in negative_words if word in str(x)))
+        plan.derive('positive_words', positive)
+        plan.derive('negative_words', negative)
         
         # Basic sentiment score
-        df['sentiment_score'] = (df['positive_words'] - df['negative_words']) / (df['word_count'] + 1)
+        plan.derive('sentiment_score', (positive - negative) / (word_count + 1))
         
         # Source credibility features
-        df['has_rating'] = df['rating_standardized'].notna()
-        df['has_reviewer_name'] = df['reviewer_name'].notna() if 'reviewer_name' in df.columns else False
+        plan.derive('has_rating', plan.column('rating_standardized').notna())
+        plan.derive('has_reviewer_name',
+                    plan.column('reviewer_name').notna() if plan.has('reviewer_name') else False)
         
         # Engagement features for Reddit
-        if 'score' in df.columns:
-            df['reddit_engagement'] = df['score'].fillna(0) + df['num_comments'].fillna(0)
+        if plan.has('score'):
+            plan.derive('reddit_engagement',
+                        plan.column('score').fillna(0) + plan.column('num_comments').fillna(0))
         
         self.logger.info("📊 Added derived features for analysis")
-        return df
+        return plan
     
-    def _final_validation(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Final validation and cleanup"""
+    def _final_validation(self, plan: CleaningPlan) -> pd.DataFrame:
+        """Final validation, then materialize the surviving rows once"""
         # Ensure required columns exist
         required_columns = ['product_name', 'review_text_unified', 'data_source']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in required_columns if not plan.has(col)]
         
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
         
-        # Reset index
-        df = df.reset_index(drop=True)
+        # Materialize and reset index
+        df = plan.materialize().reset_index(drop=True)
         
         # Add unique ID
         df['clean_id'] = range(len(df))
@@ -394,7 +428,20 @@ def _clean_review_text(self, df: pd.DataFrame) -> pd.DataFrame:
         self.logger.info("✅ Completed final validation")
         return df
     
-    def _generate_cleaning_report(self, original_count: int, final_count: int):
+    def _run_polars_engine(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Steps 1-9 on the Polars engine, with the same removal counts"""
+        df, counts = PolarsCleaningEngine(self.config, self.logger).run(df)
+        self.cleaning_stats.update(counts)
+        return df
+    
+    def _compact_schema(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink dtypes and record bytes saved per column"""
+        df, report = SchemaCompactor(self.config.get('schema')).compact(df)
+        self.cleaning_stats['schema_compaction'] = report
+        return df
+    
+    def _generate_cleaning_report(self, original_count: int, final_count: int,
+                                  profiler: StageProfiler = None) -> Dict:
         """Generate comprehensive cleaning report"""
         total_removed = original_count - final_count
         retention_rate = (final_count / original_count) * 100 if original_count > 0 else 0
@@ -404,9 +451,20 @@ def _clean_review_text(self, df: pd.DataFrame) -> pd.DataFrame:
             'final_count': final_count,
             'total_removed': total_removed,
             'retention_rate': retention_rate,
-            'cleaning_steps': self.cleaning_stats
+            'cleaning_steps': self.cleaning_stats,
+            'generated_at': datetime.now().isoformat()
         }
         
+        if profiler is not None and profiler.stages:
+            report['stage_profile'] = profiler.stages
+            report['profile_summary'] = profiler.summary()
+            timings = '\n'.join(
+                f"  {stage['stage']:<22} {stage['wall_seconds']:8.3f}s  "
+                f"{stage['rows_in']:>8,} -> {stage['rows_out']:<8,} {stage['frame_memory_mb']:8.1f} MB"
+                for stage in profiler.stages
+            )
+            self.logger.info(f"⏱️ Stage profile:\n{timings}")
+        
         self.logger.info(f"""
 📈 DATA CLEANING REPORT 📈
 ========================
@@ -0,0 +1,94 @@
+"""
+Cleaning Plan - Deferred row filters and column derivations over a raw review frame.
+
+Filters only flip bits in a keep-mask and derivations are computed for the rows
+still alive, so the wide raw frame is copied once, when the plan is materialized.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Union
+
+
+class CleaningPlan:
+    """Accumulate filter masks and derived columns; rows are addressed by position in the base frame"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.base = df
+        self.keep = np.ones(len(df), dtype=bool)
+        self.derived = {}           # name -> Series indexed by base positions alive when it was derived
+        self.removed = {}           # filter name -> rows it removed
+        self._base_memory = {}
+
+    def __len__(self) -> int:
+        return int(self.keep.sum())
+
+    @property
+    def rows(self) -> pd.Index:
+        """Positions of the rows still alive"""
+        return pd.Index(np.flatnonzero(self.keep))
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.base.columns) + [name for name in self.derived if name not in self.base.columns]
+
+    def has(self, name: str) -> bool:
+        return name in self.derived or name in self.base.columns
+
+    def column(self, name: str) -> pd.Series:
+        """Values of one column for the alive rows (KeyError if it doesn't exist)"""
+        rows = self.rows
+        if name in self.derived:
+            values = self.derived[name]
+            return values if len(values) == len(rows) else values.reindex(rows)
+        return self.base[name].iloc[rows].set_axis(rows)
+
+    def optional(self, name: str) -> pd.Series:
+        """Like column(), but all-None when the column is absent"""
+        if self.has(name):
+            return self.column(name)
+        return pd.Series(None, index=self.rows, dtype=object, name=name)
+
+    def view(self, names: Iterable[str]) -> pd.DataFrame:
+        """Narrow frame of the existing columns among `names`, for alive rows"""
+        return pd.DataFrame({name: self.column(name) for name in names if self.has(name)}, index=self.rows)
+
+    def derive(self, name: str, values: Union[pd.Series, np.ndarray, list, object]):
+        """Set a column for the alive rows; scalars are broadcast"""
+        rows = self.rows
+        if isinstance(values, pd.Series):
+            values = values if values.index.equals(rows) else values.reindex(rows)
+        elif isinstance(values, (list, tuple, np.ndarray, pd.api.extensions.ExtensionArray)):
+            values = pd.Series(values, index=rows)
+        else:
+            values = pd.Series([values] * len(rows), index=rows)
+        self.derived[name] = values.rename(name)
+
+    def filter(self, name: str, mask: pd.Series) -> int:
+        """Drop alive rows where `mask` is False; returns how many were removed"""
+        mask = np.asarray(mask, dtype=bool)
+        rows = np.flatnonzero(self.keep)
+        dropped = rows[~mask]
+        self.keep[dropped] = False
+        self.removed[name] = self.removed.get(name, 0) + len(dropped)
+        return len(dropped)
+
+    def memory_usage(self, index: bool = True, deep: bool = True) -> pd.Series:
+        """Bytes held by the plan: the (uncopied) base frame plus derived columns"""
+        if deep not in self._base_memory:
+            self._base_memory[deep] = self.base.memory_usage(index=index, deep=deep)
+        derived = pd.Series({name: values.memory_usage(index=False, deep=deep)
+                             for name, values in self.derived.items()}, dtype='int64')
+        return pd.concat([self._base_memory[deep], derived])
+
+    def materialize(self) -> pd.DataFrame:
+        """Take the surviving rows once and attach derived columns"""
+        rows = self.rows
+        df = self.base.take(rows)
+        for name, values in self.derived.items():
+            values = values if len(values) == len(rows) else values.reindex(rows)
+            df[name] = values.array
+        return df
+
+    def summary(self) -> Dict:
+        return {'rows_in': len(self.base), 'rows_out': len(self), 'removed': dict(self.removed)}
@@ -0,0 +1,271 @@
+"""
+Polars Engine - DataCleaner's cleaning stages as one Polars lazy query.
+
+Every stage is a column expression; filters mark the stage that dropped a row
+instead of removing it, so removal counts match the pandas engine and the
+query is collected (streaming engine) once. Requires the optional `polars` package.
+"""
+
+import pandas as pd
+from typing import Dict, Tuple
+import logging
+
+TEXT_COLUMNS = ['product_name', 'review_text', 'title', 'selftext', 'source', 'collection_source',
+                'reviewer_name', 'date', 'scraped_at']
+# ISO layouts produced by the scrapers; anything else parses to null
+DATE_FORMATS = ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S%.f', '%Y-%m-%d %H:%M:%S%.f']
+POSITIVE_WORDS = ['good', 'great', 'excellent', 'amazing', 'love', 'best', 'perfect', 'fantastic']
+NEGATIVE_WORDS = ['bad', 'terrible', 'awful', 'hate', 'worst', 'horrible', 'useless', 'garbage']
+
+_ROW = '_row'
+_DROPPED_AT = '_dropped_at'
+
+
+def polars_available() -> bool:
+    try:
+        import polars  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def to_polars(df: pd.DataFrame):
+    """pandas -> Polars; column by column when pyarrow isn't installed"""
+    import polars as pl
+    try:
+        return pl.from_pandas(df)
+    except ImportError:
+        columns = {}
+        for name in df.columns:
+            series = df[name]
+            if series.dtype.kind in 'biufM':
+                columns[name] = pl.Series(name, series.to_numpy(), nan_to_null=True)
+            else:
+                columns[name] = pl.Series(name, series.astype(object).where(series.notna(), None).tolist(),
+                                          strict=False)
+        return pl.DataFrame(columns)
+
+
+def to_pandas(frame) -> pd.DataFrame:
+    """Polars -> pandas; via NumPy when pyarrow isn't installed"""
+    try:
+        return frame.to_pandas()
+    except ImportError:
+        return pd.DataFrame({name: frame[name].to_numpy() for name in frame.columns})
+
+
+class PolarsCleaningEngine:
+    """Run DataCleaner's stages 1-9 as a single lazy Polars query"""
+
+    def __init__(self, config: Dict, logger: logging.Logger = None):
+        self.config = config
+        self.logger = logger or logging.getLogger('DataCleaner')
+
+    def run(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+        """Clean `df`; returns the pandas frame and DataCleaner-style removal counts"""
+        import polars as pl
+
+        frame = to_polars(df)
+        casts = [pl.col(name).cast(pl.String) for name in TEXT_COLUMNS if name in frame.columns]
+        lf = frame.lazy().with_columns(casts).with_row_index(_ROW).with_columns(
+            pl.lit(None, dtype=pl.String).alias(_DROPPED_AT))
+
+        stats = {}
+        lf = self._remove_empty_records(lf)
+        stats['empty_records_removed'] = 'remove_empty_records'
+        lf = self._standardize_columns(lf)
+        if self.config.get('clean_text', False):
+            lf = self._clean_review_text(lf)
+            stats['text_length_filtered'] = 'clean_review_text'
+        if self.config.get('standardize_ratings', True):
+            lf = self._standardize_ratings(lf)
+        if self.config.get('normalize_dates', True):
+            lf = self._clean_dates(lf)
+        if self.config.get('remove_duplicates', True):
+            lf = self._remove_duplicates(lf)
+            stats['duplicates_removed'] = 'remove_duplicates'
+        lf = self._filter_by_quality(lf)
+        stats['quality_filtered'] = 'filter_by_quality'
+        lf = self._add_derived_features(lf)
+
+        missing_columns = [col for col in ['product_name', 'review_text_unified', 'data_source']
+                           if col not in lf.collect_schema().names()]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        # One pass over the data; dropped rows are only discarded after the counts are taken
+        marked = lf.collect(engine='streaming')
+        removed = dict(marked[_DROPPED_AT].drop_nulls().value_counts().iter_rows())
+        counts = {key: int(removed.get(stage, 0)) for key, stage in stats.items()}
+
+        result = to_pandas(marked.filter(pl.col(_DROPPED_AT).is_null()).drop(_ROW, _DROPPED_AT))
+        result['clean_id'] = range(len(result))
+        self.logger.info(f"🐻‍❄️ Polars engine cleaned {len(df):,} -> {len(result):,} records")
+        return result, counts
+
+    @staticmethod
+    def _drop(lf, stage: str, keep):
+        """Mark rows still alive where `keep` is false as dropped by `stage`"""
+        import polars as pl
+        return lf.with_columns(
+            pl.when(pl.col(_DROPPED_AT).is_null() & ~keep.fill_null(False))
+            .then(pl.lit(stage)).otherwise(pl.col(_DROPPED_AT)).alias(_DROPPED_AT))
+
+    def _remove_empty_records(self, lf):
+        import polars as pl
+        names = lf.collect_schema().names()
+        non_empty = lambda name: (pl.col(name).is_not_null() & (pl.col(name).str.len_chars() > 0)
+                                  if name in names else pl.lit(False))
+        keep = (non_empty('review_text') | non_empty('title')) & pl.col('product_name').is_not_null()
+        return self._drop(lf, 'remove_empty_records', keep)
+
+    def _standardize_columns(self, lf):
+        import polars as pl
+        names = lf.collect_schema().names()
+        stripped = lambda name: (pl.col(name).str.strip_chars() if name in names
+                                 else pl.lit(None, dtype=pl.String))
+        part = lambda expr: pl.when(expr.str.len_chars() > 0).then(expr)
+
+        title, text, selftext = stripped('title'), stripped('review_text'), stripped('selftext')
+        # selftext is skipped when it repeats the title or body
+        selftext = pl.when((selftext == title).fill_null(False) | (selftext == text).fill_null(False)) \
+            .then(None).otherwise(selftext)
+        columns = [
+            pl.concat_str([part(title), part(text), part(selftext)], separator=' ', ignore_nulls=True)
+            .fill_null('').alias('review_text_unified'),
+            pl.col('product_name').str.strip_chars().str.to_titlecase(),
+            pl.col('rating').alias('rating_unified'),
+            pl.col('collection_source').fill_null('unknown').alias('data_source'),
+            pl.col('source').fill_null('unknown').alias('original_source')
+        ]
+        lf = lf.with_columns(columns)
+        if 'created_utc' in names:
+            created_utc = pl.col('created_utc').cast(pl.Float64, strict=False)
+            lf = lf.with_columns(created_utc).with_columns(
+                pl.from_epoch((pl.col('created_utc') * 1_000_000).cast(pl.Int64), time_unit='us')
+                .alias('date_from_utc'))
+        return lf
+
+    def _clean_review_text(self, lf):
+        import polars as pl
+        text = (
+            pl.col('review_text_unified').fill_null('')
+            .str.replace_all(r'http[s]?://\S+', '')
+            .str.replace_all(r'[^\w\s\.,!?;:()\-"\'’]', ' ')
+            .str.replace_all(r'\.{3,}', '...')
+            .str.replace_all(r'!{2,}', '!')
+            .str.replace_all(r'\?{2,}', '?')
+            # Whitespace is normalized once at the end; no pattern above depends on its kind
+            .str.replace_all(r'\s+', ' ')
+            .str.strip_chars()
+        )
+        lf = lf.with_columns(text.alias('review_text_unified'))
+
+        min_len = self.config.get('min_review_length', 0)
+        max_len = self.config.get('max_review_length', float('inf'))
+        length = pl.col('review_text_unified').str.len_chars()
+        return self._drop(lf, 'clean_review_text', (length >= min_len) & (length <= max_len))
+
+    def _standardize_ratings(self, lf):
+        import polars as pl
+        rating = pl.col('rating_unified').cast(pl.Float64, strict=False)
+        reddit = (
+            pl.when(rating >= 100).then(5.0)
+            .when(rating >= 50).then(4.0)
+            .when(rating >= 10).then(3.0)
+            .when(rating >= 0).then(2.0)
+            .otherwise(1.0)
+        )
+        standardized = pl.when(rating.is_null()).then(None) \
+            .when(pl.col('data_source') == 'reddit').then(reddit) \
+            .otherwise(rating.clip(1, 5))
+        return lf.with_columns(standardized.alias('rating_standardized'))
+
+    def _clean_dates(self, lf):
+        import polars as pl
+        names = lf.collect_schema().names()
+
+        def parse(name):
+            return pl.coalesce([pl.col(name).str.strptime(pl.Datetime('us'), fmt, strict=False, exact=True)
+                                for fmt in DATE_FORMATS])
+
+        date = parse('date') if 'date' in names else pl.lit(None, dtype=pl.Datetime('us'))
+        if 'date_from_utc' in names:
+            date = pl.coalesce([date, pl.col('date_from_utc')])
+        lf = lf.with_columns(date.alias('date_unified')).with_columns(
+            pl.col('date_unified').dt.year().alias('year'),
+            pl.col('date_unified').dt.month().alias('month'),
+            pl.col('date_unified').dt.quarter().alias('quarter'))
+
+        if 'scraped_at' in names:
+            lf = lf.with_columns(parse('scraped_at').alias('scraped_at')).with_columns(
+                # Floor division, like pandas Timedelta.days for negative spans
+                ((pl.col('scraped_at') - pl.col('date_unified')).dt.total_microseconds() // 86_400_000_000)
+                .alias('days_old'))
+        return lf
+
+    def _remove_duplicates(self, lf):
+        import polars as pl
+        alive = pl.col(_DROPPED_AT).is_null()
+        row = pl.col(_ROW)
+
+        # Exact duplicates: first alive row per (product, text)
+        first = pl.when(alive).then(row).min().over(['product_name', 'review_text_unified'])
+        lf = self._drop(lf, 'remove_duplicates', ~alive | (row == first))
+
+        names = lf.collect_schema().names()
+        if 'reviewer_name' not in names or 'date_unified' not in names:
+            return lf
+
+        # Near duplicates: one review per reviewer and product, the last in (date, row) order
+        # with undated reviews ranked after dated ones, as the pandas engine keeps
+        keys = ['product_name', 'reviewer_name']
+        grouped = pl.col(_DROPPED_AT).is_null() & pl.col('reviewer_name').is_not_null()
+        date = pl.col('date_unified')
+        size = grouped.sum().over(keys)
+        undated = grouped & date.is_null()
+        latest_date = pl.when(grouped).then(date).max().over(keys)
+        kept_row = pl.when(undated.any().over(keys)) \
+            .then(pl.when(undated).then(row).max().over(keys)) \
+            .otherwise(pl.when(grouped & (date == latest_date)).then(row).max().over(keys))
+        near_duplicate = grouped & (size > 1) & (row != kept_row)
+        return self._drop(lf, 'remove_duplicates', ~near_duplicate)
+
+    def _filter_by_quality(self, lf):
+        import polars as pl
+        if not self.config.get('remove_spam', True):
+            return lf
+        text = pl.col('review_text_unified')
+        words = text.str.to_lowercase().str.extract_all(r'\S+')
+        spam = (
+            text.is_null() | (text.str.len_chars() < 20)
+            | (words.list.len() < 5)
+            | (words.list.n_unique() / words.list.len() < 0.3)
+        )
+        return self._drop(lf, 'filter_by_quality', ~spam)
+
+    def _add_derived_features(self, lf):
+        import polars as pl
+        names = lf.collect_schema().names()
+        text = pl.col('review_text_unified')
+        lowered = text.str.to_lowercase()
+        count_words = lambda words: pl.sum_horizontal(
+            [lowered.str.contains(word, literal=True).cast(pl.Int64) for word in words])
+
+        lf = lf.with_columns(
+            text.str.len_chars().cast(pl.Int64).alias('text_length'),
+            text.str.count_matches(r'\S+').cast(pl.Int64).alias('word_count'),
+            count_words(POSITIVE_WORDS).alias('positive_words'),
+            count_words(NEGATIVE_WORDS).alias('negative_words')
+        ).with_columns(
+            ((pl.col('positive_words') - pl.col('negative_words')) / (pl.col('word_count') + 1))
+            .alias('sentiment_score'),
+            pl.col('rating_standardized').is_not_null().alias('has_rating'),
+            (pl.col('reviewer_name').is_not_null() if 'reviewer_name' in names else pl.lit(False))
+            .alias('has_reviewer_name')
+        )
+        if 'score' in names:
+            lf = lf.with_columns(
+                (pl.col('score').fill_null(0).cast(pl.Float64) + pl.col('num_comments').fill_null(0).cast(pl.Float64))
+                .alias('reddit_engagement'))
+        return lf
@@ -0,0 +1,140 @@
+"""
+Stage Profiler - Per-stage wall time, row counts and memory for cleaning pipelines.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+import pandas as pd
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (psutil, /proc or None)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size so far in MB, where the platform reports it"""
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+    except ImportError:
+        return None
+
+
+def frame_memory_mb(df, deep: bool = True) -> float:
+    """Memory of a DataFrame (or anything with DataFrame.memory_usage, e.g. a CleaningPlan)"""
+    return float(df.memory_usage(index=True, deep=deep).sum()) / 1e6
+
+
+class StageProfiler:
+    """Wrap pipeline stages and record wall time, rows in/out and memory for each"""
+
+    def __init__(self, trace_memory: bool = False, deep_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.deep_memory = deep_memory
+        self.stages = []
+
+    def run(self, name: str, stage: Callable[[pd.DataFrame], pd.DataFrame], df: pd.DataFrame) -> pd.DataFrame:
+        """Run one stage and append its measurements"""
+        rows_in = len(df)
+        rss_before = current_rss_mb()
+
+        # tracemalloc sees allocations of Python objects (incl. object-dtype strings), at a runtime cost
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        result = stage(df)
+        wall = time.perf_counter() - start
+
+        record = {
+            'stage': name,
+            'wall_seconds': round(wall, 6),
+            'rows_in': rows_in,
+            'rows_out': len(result),
+            'rows_removed': rows_in - len(result),
+            'rss_before_mb': _round(rss_before),
+            'rss_after_mb': _round(current_rss_mb()),
+            'peak_rss_mb': _round(peak_rss_mb()),
+            'frame_memory_mb': round(frame_memory_mb(result, self.deep_memory), 3),
+            'columns': len(result.columns)
+        }
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record['tracemalloc_delta_mb'] = round((current - traced_before) / 1e6, 3)
+            record['tracemalloc_peak_mb'] = round((peak - traced_before) / 1e6, 3)
+            if started_tracing:
+                tracemalloc.stop()
+
+        self.stages.append(record)
+        return result
+
+    def summary(self) -> Dict:
+        """Totals and the dominant stage"""
+        total = sum(stage['wall_seconds'] for stage in self.stages)
+        slowest = max(self.stages, key=lambda stage: stage['wall_seconds'], default=None)
+        return {
+            'total_seconds': round(total, 6),
+            'slowest_stage': slowest['stage'] if slowest else None,
+            'slowest_share': round(slowest['wall_seconds'] / total, 3) if slowest and total else 0.0,
+            'final_frame_memory_mb': self.stages[-1]['frame_memory_mb'] if self.stages else 0.0
+        }
+
+    def to_json_lines(self, run_id: str = None) -> str:
+        """One JSON object per stage"""
+        return ''.join(
+            json.dumps({**({'run_id': run_id} if run_id else {}), **stage}) + '\n'
+            for stage in self.stages
+        )
+
+    def to_prometheus(self, prefix: str = 'data_cleaner') -> str:
+        """Prometheus text exposition format, one gauge family per measurement"""
+        metrics = {
+            'stage_seconds': 'wall_seconds',
+            'stage_rows_in': 'rows_in',
+            'stage_rows_out': 'rows_out',
+            'stage_frame_memory_megabytes': 'frame_memory_mb',
+            'stage_rss_megabytes': 'rss_after_mb',
+            'stage_tracemalloc_peak_megabytes': 'tracemalloc_peak_mb'
+        }
+        lines = []
+        for metric, field in metrics.items():
+            samples = [(stage['stage'], stage.get(field)) for stage in self.stages if stage.get(field) is not None]
+            if not samples:
+                continue
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            lines.extend(f'{prefix}_{metric}{{stage="{stage}"}} {value}' for stage, value in samples)
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str, run_id: str = None):
+        """Append JSON lines (.jsonl) or overwrite Prometheus text (.prom / .txt)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if path.endswith('.jsonl'):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(self.to_json_lines(run_id))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
@@ -0,0 +1,140 @@
+"""
+Schema Compactor - Memory-compact dtypes for cleaned review frames.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Tuple
+import logging
+
+# Free text is never categorical; raw variants are redundant once review_text_unified exists
+TEXT_COLUMNS = ['review_text_unified', 'review_text', 'title', 'selftext', 'body', 'url', 'post_title']
+RAW_TEXT_COLUMNS = ['review_text', 'title', 'selftext', 'body']
+# Float columns that only hold whole numbers (NaN-padded counters and calendar fields)
+INTEGER_COLUMNS = ['year', 'month', 'quarter', 'days_old', 'score', 'num_comments',
+                   'reddit_engagement', 'created_utc', 'helpful_votes', 'thumbs_up']
+
+_INT_DTYPES = [('int8', 'Int8'), ('int16', 'Int16'), ('int32', 'Int32'), ('int64', 'Int64')]
+
+
+def arrow_string_dtype() -> Optional[pd.StringDtype]:
+    """Arrow-backed string dtype when pyarrow is installed"""
+    try:
+        import pyarrow  # noqa: F401
+        return pd.StringDtype('pyarrow')
+    except ImportError:
+        return None
+
+
+def smallest_int_dtype(values: pd.Series, nullable: bool) -> Optional[str]:
+    """Smallest integer dtype holding every value, or None if any value is fractional"""
+    present = values.dropna()
+    if present.empty:
+        return None
+    if not np.all(np.mod(present.to_numpy(dtype='float64'), 1) == 0):
+        return None
+    low, high = present.min(), present.max()
+    for numpy_dtype, nullable_dtype in _INT_DTYPES:
+        info = np.iinfo(numpy_dtype)
+        if info.min <= low and high <= info.max:
+            return nullable_dtype if nullable else numpy_dtype
+    return None
+
+
+class SchemaCompactor:
+    """Cast low-cardinality columns to categoricals, counters to small ints and text to Arrow strings"""
+
+    def __init__(self, config: Dict = None):
+        self.logger = logging.getLogger('SchemaCompactor')
+        self.config = {**self._get_default_config(), **(config or {})}
+
+    def _get_default_config(self) -> Dict:
+        """Default compaction rules"""
+        return {
+            'category_max_ratio': 0.5,      # unique values / rows at or below this become categorical
+            'text_columns': TEXT_COLUMNS,
+            'integer_columns': INTEGER_COLUMNS,
+            'arrow_strings': True,
+            'downcast_floats': False,       # float32 halves float columns but adds noise to exported scores
+            'drop_raw_text': False,         # drop review_text/title/selftext once unified text exists
+        }
+
+    def compact(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+        """Return the compacted frame and a per-column bytes-saved report"""
+        before = df.memory_usage(index=False, deep=True)
+        dtypes_before = df.dtypes.astype(str).to_dict()
+        result = df
+
+        dropped = []
+        if self.config['drop_raw_text'] and 'review_text_unified' in df.columns:
+            dropped = [col for col in RAW_TEXT_COLUMNS if col in df.columns]
+            result = result.drop(columns=dropped)
+
+        string_dtype = arrow_string_dtype() if self.config['arrow_strings'] else None
+        converted = {}
+        for column in result.columns:
+            new_series = self._compact_column(result[column], column, string_dtype)
+            if new_series is not None:
+                converted[column] = new_series
+        if converted:
+            result = result.assign(**converted)
+
+        after = result.memory_usage(index=False, deep=True)
+        columns = {}
+        for column in df.columns:
+            entry = {'dtype_before': dtypes_before[column], 'bytes_before': int(before[column])}
+            if column in dropped:
+                entry.update(dtype_after=None, bytes_after=0)
+            else:
+                entry.update(dtype_after=str(result[column].dtype), bytes_after=int(after[column]))
+            entry['bytes_saved'] = entry['bytes_before'] - entry['bytes_after']
+            columns[column] = entry
+
+        total_before = int(before.sum())
+        total_after = int(after.sum())
+        report = {
+            'bytes_before': total_before,
+            'bytes_after': total_after,
+            'bytes_saved': total_before - total_after,
+            'reduction': round(1 - total_after / total_before, 3) if total_before else 0.0,
+            'dropped_columns': dropped,
+            'columns': columns
+        }
+        self.logger.info(
+            f"🗜️ Compacted schema: {total_before / 1e6:.1f} MB -> {total_after / 1e6:.1f} MB "
+            f"({report['reduction']:.0%} saved)"
+        )
+        return result, report
+
+    def _compact_column(self, series: pd.Series, column: str, string_dtype) -> Optional[pd.Series]:
+        """Compact dtype for one column, or None to keep it as is"""
+        dtype = series.dtype
+
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype) \
+                or isinstance(dtype, pd.CategoricalDtype):
+            return None
+
+        if pd.api.types.is_integer_dtype(dtype) or (
+                pd.api.types.is_float_dtype(dtype) and column in self.config['integer_columns']):
+            int_dtype = smallest_int_dtype(series, nullable=bool(series.isna().any()))
+            if int_dtype and int_dtype != str(dtype):
+                return series.astype(int_dtype)
+        if pd.api.types.is_numeric_dtype(dtype):
+            # Ratings and scores keep a float dtype so the schema doesn't change with the data;
+            # float32 is opt-in since it exports 0.1 as 0.1000000015
+            if self.config['downcast_floats'] and pd.api.types.is_float_dtype(dtype) and dtype != np.float32:
+                return series.astype('float32')
+            return None
+
+        # Object or string columns: only homogeneous string columns are touched
+        present = series.dropna()
+        if present.empty or not present.map(lambda value: isinstance(value, str)).all():
+            return None
+
+        if column not in self.config['text_columns']:
+            if present.nunique() <= self.config['category_max_ratio'] * len(series):
+                return series.astype('category')
+
+        if string_dtype is not None and dtype != string_dtype:
+            return series.astype(string_dtype)
+        return None
@@ -0,0 +1,345 @@
+"""
+Streaming Pipeline - Reviews flow from each scraper page through cleaning into analysis batches as they arrive.
+
+One producer thread per source pushes every fetched page of reviews into a
+bounded queue; a cleaner thread runs DataCleaner on each page (exact duplicates
+are also dropped across pages) and the analyzer labels fixed-size batches and
+appends them to a JSON-lines file. A full queue blocks the stage feeding it, so
+memory is bounded by the queue sizes instead of the whole run, and the first
+analyzed batch lands as soon as the fastest source returns its first page.
+
+Product info is not fetched in this mode; use DataCollectionManager.collect_all_data for that.
+
+Usage:
+    python -m src.streaming_pipeline
+    python -m src.streaming_pipeline --companies McAfee Norton --sources appstore reddit --max-reviews 200
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import pandas as pd
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List
+import logging
+
+_DONE = object()
+# Columns a combined multi-source frame always has and DataCleaner relies on; one page may lack some
+_RAW_COLUMNS = ['product_name', 'review_text', 'title', 'rating', 'date', 'source', 'reviewer_name', 'created_utc']
+# Per-page cleaning and routing would otherwise log a full report for every page
+_QUIET_LOGGERS = ['DataCleaner', 'ReviewRouter']
+
+
+@contextmanager
+def _quiet(names: List[str]):
+    loggers = [logging.getLogger(name) for name in names]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        for logger, level in zip(loggers, levels):
+            logger.setLevel(level)
+
+
+class StreamingPipeline:
+    """Scrape -> clean -> analyze with bounded queues between the stages"""
+
+    def __init__(self, manager=None, config: Dict = None, analyzer=None):
+        from .data_collection.collection_manager import DataCollectionManager
+
+        self.logger = logging.getLogger('StreamingPipeline')
+        self.manager = manager or DataCollectionManager()
+        self.config = {**self._get_default_config(), **self.manager.config.get('streaming', {}), **(config or {})}
+        self.analyzer = analyzer if analyzer is not None else self._create_analyzer()
+        self.router = None
+        self.stats = {}
+
+    def _get_default_config(self) -> Dict:
+        """Default queue sizes, batching and outputs"""
+        return {
+            'queue_size': 8,            # pages (raw) / cleaned frames waiting between stages
+            'analysis_batch_size': 50,  # reviews per analyzer call and per output flush
+            'max_batch_wait': 5.0,      # seconds before a partial batch is analyzed anyway
+            'use_openai': True,         # heuristic labels only when False or no API key
+            'raw_output_dir': 'data/raw',
+            'output_dir': 'data/processed',
+            'cleaner': {}               # DataCleaner overrides
+        }
+
+    def _create_analyzer(self):
+        if not self.config['use_openai']:
+            return None
+        try:
+            from .analysis.openai_analyzer import OpenAIAnalyzer
+            return OpenAIAnalyzer(self.manager.config)
+        except (ValueError, ImportError) as e:
+            self.logger.warning(f"⚠️ OpenAI analyzer unavailable ({e}); using heuristic labels")
+            return None
+
+    def run(self, companies: List[str] = None, max_reviews: int = None, sources: List[str] = None) -> Dict:
+        """Stream every (source, company) through cleaning and analysis; returns run stats"""
+        from .preprocessing.data_cleaner import DataCleaner
+
+        collection = self.manager.config['data_collection']
+        companies = companies or collection['target_companies']
+        max_reviews = max_reviews or collection['max_reviews_per_product']
+        scrapers = {name: scraper for name, scraper in self.manager.scrapers.items()
+                    if sources is None or name in sources}
+        if not scrapers:
+            raise ValueError(f"No scrapers match {sources}; available: {list(self.manager.scrapers)}")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(self.config['raw_output_dir'], exist_ok=True)
+        os.makedirs(self.config['output_dir'], exist_ok=True)
+        self.raw_path = os.path.join(self.config['raw_output_dir'], f"combined_reviews_{timestamp}.jsonl")
+        self.output_path = os.path.join(self.config['output_dir'], f"analyzed_reviews_{timestamp}.jsonl")
+
+        cleaner_config = {**DataCleaner()._get_default_config(), 'profile_stages': False, 'compact_schema': False,
+                          **self.config['cleaner']}
+        self.cleaner = DataCleaner(cleaner_config)
+        self.raw_queue = queue.Queue(maxsize=self.config['queue_size'])
+        self.clean_queue = queue.Queue(maxsize=self.config['queue_size'])
+        self._stop = threading.Event()
+        self._errors = []
+        self._seen = set()
+        self._started = time.perf_counter()
+        self.stats = {'pages': 0, 'scraped': 0, 'cleaned': 0, 'cross_page_duplicates': 0, 'analyzed': 0,
+                      'batches': 0, 'failed_units': [], 'first_result_seconds': None,
+                      'max_queue_depth': {'raw': 0, 'clean': 0}}
+
+        self.logger.info(f"🌊 Streaming {len(companies)} companies from {len(scrapers)} sources "
+                         f"(queues of {self.config['queue_size']}, batches of {self.config['analysis_batch_size']})")
+
+        threads = [threading.Thread(target=self._guard, args=(self._produce, name, scraper, companies, max_reviews),
+                                    name=f"produce-{name}", daemon=True)
+                   for name, scraper in scrapers.items()]
+        threads.append(threading.Thread(target=self._guard, args=(self._clean, len(scrapers)),
+                                        name='clean', daemon=True))
+        for thread in threads:
+            thread.start()
+
+        with _quiet(_QUIET_LOGGERS):
+            try:
+                self._analyze_stream()
+            except BaseException:
+                self._stop.set()
+                raise
+            finally:
+                for thread in threads:
+                    thread.join(timeout=1.0 if self._stop.is_set() else None)
+
+        if self._errors:
+            raise RuntimeError(f"Streaming pipeline stage failed: {self._errors[0]!r}") from self._errors[0]
+
+        self.stats['elapsed_seconds'] = round(time.perf_counter() - self._started, 3)
+        self.stats.update({'raw_path': self.raw_path, 'output_path': self.output_path})
+        self.logger.info(f"✅ Streamed {self.stats['scraped']:,} scraped -> {self.stats['cleaned']:,} cleaned -> "
+                         f"{self.stats['analyzed']:,} analyzed in {self.stats['elapsed_seconds']:.1f}s "
+                         f"(first result after {self.stats['first_result_seconds']}s)")
+        return self.stats
+
+    def _guard(self, stage, *args):
+        """Run a worker stage; a failure stops the whole pipeline"""
+        try:
+            stage(*args)
+        except Exception as e:
+            self.logger.error(f"❌ {threading.current_thread().name} failed: {e}")
+            self._errors.append(e)
+            self._stop.set()
+
+    def _put(self, target: queue.Queue, item, name: str) -> bool:
+        """Blocking put that gives up once the pipeline is stopping"""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.5)
+            except queue.Full:
+                continue
+            depth = self.stats['max_queue_depth']
+            depth[name] = max(depth[name], target.qsize())
+            return True
+        return False
+
+    def _get(self, source: queue.Queue, timeout: float = None):
+        """Blocking get that returns _DONE once the pipeline is stopping"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stop.is_set():
+            wait = 0.5 if deadline is None else min(0.5, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty
+            try:
+                return source.get(timeout=wait)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _produce(self, source_name: str, scraper, companies: List[str], max_reviews: int):
+        """Push each fetched page of reviews for every company of one source"""
+        scraper.telemetry.reset()
+        if hasattr(scraper, 'start_run'):
+            scraper.start_run(review_limit=max_reviews)
+        try:
+            if hasattr(scraper, 'scrape_reviews_multi'):
+                # One shared search for every company, then one page per company
+                try:
+                    with scraper.telemetry.scope('all_companies'):
+                        reviews_by_company = scraper.scrape_reviews_multi(companies, max_reviews)
+                except Exception as e:
+                    self.logger.error(f"❌ {source_name}/all companies: {e}")
+                    self.stats['failed_units'].extend(
+                        {'source': source_name, 'company': company, 'error': str(e)} for company in companies)
+                    return
+                for company in companies:
+                    if not self._put(self.raw_queue, (source_name, company, reviews_by_company.get(company, [])), 'raw'):
+                        return
+                return
+
+            for company in companies:
+                try:
+                    with scraper.telemetry.scope(company):
+                        for page in scraper.iter_review_pages(company, max_reviews):
+                            scraper.telemetry.record_reviews(len(page))
+                            if not self._put(self.raw_queue, (source_name, company, page), 'raw'):
+                                return
+                except Exception as e:
+                    self.logger.error(f"❌ {source_name}/{company}: {e}")
+                    self.stats['failed_units'].append({'source': source_name, 'company': company, 'error': str(e)})
+        finally:
+            self._put(self.raw_queue, _DONE, 'raw')
+
+    def _clean(self, producers: int):
+        """Clean each page as it arrives and forward the surviving rows"""
+        finished = 0
+        try:
+            while finished < producers:
+                item = self._get(self.raw_queue)
+                if item is _DONE:
+                    if self._stop.is_set():
+                        return
+                    finished += 1
+                    continue
+
+                source_name, company, records = item
+                self.stats['pages'] += 1
+                self.stats['scraped'] += len(records)
+                if not records:
+                    continue
+                self._append_raw(records, source_name)
+                page = pd.DataFrame(records).assign(collection_source=source_name)
+                for column in _RAW_COLUMNS:
+                    if column not in page.columns:
+                        page[column] = pd.Series(None, index=page.index, dtype=object)
+                cleaned = self._drop_seen(self.cleaner.clean_pipeline(page))
+                if len(cleaned) and not self._put(self.clean_queue, cleaned, 'clean'):
+                    return
+        finally:
+            self._put(self.clean_queue, _DONE, 'clean')
+
+    def _append_raw(self, records: List[Dict], source_name: str):
+        with open(self.raw_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps({**record, 'collection_source': source_name}, ensure_ascii=False,
+                                       default=str) + '\n' for record in records))
+
+    def _drop_seen(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop exact duplicates of rows from earlier pages and number rows across the run"""
+        keys = [hash(key) for key in zip(df['product_name'], df['review_text_unified'])]
+        fresh, page_keys = [], set()
+        for key in keys:
+            fresh.append(key not in self._seen and key not in page_keys)
+            page_keys.add(key)
+        self._seen.update(page_keys)
+
+        df = df[fresh].reset_index(drop=True)
+        self.stats['cross_page_duplicates'] += len(keys) - len(df)
+        df['clean_id'] = range(self.stats['cleaned'], self.stats['cleaned'] + len(df))
+        self.stats['cleaned'] += len(df)
+        return df
+
+    def _analyze_stream(self):
+        """Analyze full batches as soon as they fill, and partial ones after max_batch_wait"""
+        batch_size = self.config['analysis_batch_size']
+        pending = []
+        while True:
+            try:
+                item = self._get(self.clean_queue, timeout=self.config['max_batch_wait'])
+            except queue.Empty:
+                if pending:
+                    self._analyze_batch(pd.concat(pending, ignore_index=True))
+                    pending = []
+                continue
+            if item is _DONE:
+                break
+
+            pending.append(item)
+            buffered = pd.concat(pending, ignore_index=True)
+            full = len(buffered) - len(buffered) % batch_size
+            for start in range(0, full, batch_size):
+                self._analyze_batch(buffered.iloc[start:start + batch_size].reset_index(drop=True))
+            pending = [buffered.iloc[full:].reset_index(drop=True)] if full < len(buffered) else []
+
+        if pending and not self._stop.is_set():
+            self._analyze_batch(pd.concat(pending, ignore_index=True))
+
+    def _analyze_batch(self, df: pd.DataFrame):
+        if self.analyzer is not None:
+            df = self.analyzer.analyze_batch_sentiment(df)
+        else:
+            df = self._heuristic_labels(df)
+
+        with open(self.output_path, 'a', encoding='utf-8') as f:
+            # lines=True already ends with a newline (older pandas omit it); never emit blank lines
+            records = df.to_json(orient='records', lines=True, force_ascii=False)
+            f.write(records if records.endswith('\n') else records + '\n')
+
+        self.stats['analyzed'] += len(df)
+        self.stats['batches'] += 1
+        if self.stats['first_result_seconds'] is None:
+            self.stats['first_result_seconds'] = round(time.perf_counter() - self._started, 3)
+            self.logger.info(f"⚡ First {len(df)} analyzed reviews after {self.stats['first_result_seconds']:.1f}s")
+
+    def _heuristic_labels(self, df: pd.DataFrame) -> pd.DataFrame:
+        """ai_* columns from the review router's scores, in the OpenAIAnalyzer output shape"""
+        from .analysis.review_router import ReviewRouter
+
+        if self.router is None:
+            self.router = ReviewRouter(self.manager.config.get('analysis', {}).get('routing', {}))
+        scores = self.router.score(df)
+        results = [self.router.heuristic_analysis(text, score)
+                   for text, score in zip(df['review_text_unified'], scores['route_score'])]
+        return df.assign(
+            ai_sentiment=[result['sentiment'] for result in results],
+            ai_sentiment_score=[result['score'] for result in results],
+            ai_key_points=[result['key_points'] for result in results],
+            ai_features=[result['features'] for result in results],
+            ai_summary=[result['summary'] for result in results],
+            ai_route='heuristic',
+            ai_route_confidence=scores['route_confidence'].to_numpy()
+        )
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', nargs='+', help='defaults to data_collection.target_companies')
+    parser.add_argument('--sources', nargs='+', help='scraper names, e.g. appstore reddit (default: all)')
+    parser.add_argument('--max-reviews', type=int, help='per source and company')
+    parser.add_argument('--batch-size', type=int, dest='analysis_batch_size', help='reviews per analysis batch')
+    parser.add_argument('--no-openai', action='store_false', dest='use_openai', default=None,
+                        help='heuristic labels only')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    config = {key: value for key, value in vars(args).items()
+              if key in ('analysis_batch_size', 'use_openai') and value is not None}
+    stats = StreamingPipeline(config=config).run(args.companies, args.max_reviews, args.sources)
+    print(json.dumps(stats, indent=2, default=str))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the package as `src.*`, the same way the scripts at the repo root do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
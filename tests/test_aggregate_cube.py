@@ -0,0 +1,36 @@
+import os
+import time
+
+import pandas as pd
+
+from src.analysis.aggregate_cube import AggregateCube
+
+
+def write(path: str, rows):
+    pd.DataFrame(rows).to_json(path, orient='records')
+
+
+def post(product: str, post_id: str):
+    return {'product_name': product, 'source': 'Reddit', 'data_source': 'reddit', 'id': post_id,
+            'review_text': f'post {post_id}', 'date': '2024-05-01', 'sentiment_score': 0.5}
+
+
+def product_reviews(cube: AggregateCube):
+    return {key.split('|')[0]: cell['measures'][0] for key, cell in cube.cells.items()}
+
+
+def test_shared_post_ids_are_counted_per_product(tmp_path):
+    config = {'inputs': [str(tmp_path / 'analyzed_reviews_*.json')],
+              'state_path': str(tmp_path / 'state.json'), 'feed_path': str(tmp_path / 'feed.json')}
+    write(tmp_path / 'analyzed_reviews_1.json', [post('Norton', 'abc'), post('McAfee', 'abc'), post('McAfee', 'def')])
+    cube = AggregateCube(config)
+    cube.update()
+    assert product_reviews(cube) == {'Norton': 1, 'McAfee': 2}
+
+    # A partial run that only covered Norton
+    write(tmp_path / 'analyzed_reviews_2.json', [post('Norton', 'abc')])
+    # Newer mtime, so this file is the one that claims Norton:abc
+    os.utime(tmp_path / 'analyzed_reviews_2.json', (time.time() + 5, time.time() + 5))
+    stats = cube.update()
+    assert product_reviews(cube) == {'Norton': 1, 'McAfee': 2}
+    assert stats['duplicate_reviews'] == 1
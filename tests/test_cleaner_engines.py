@@ -0,0 +1,55 @@
+"""The Polars engine must produce the pandas engine's rows, values and removal counts."""
+import pandas as pd
+import pytest
+
+from benchmarks.cleaner_engines import compare, synthetic_reviews
+from src.preprocessing.data_cleaner import DataCleaner
+
+pytest.importorskip('polars')
+
+TEXT = 'The scan found malware quickly and support answered my renewal question'
+
+
+def clean(df: pd.DataFrame, engine: str):
+    cleaner = DataCleaner({**DataCleaner()._get_default_config(), 'engine': engine, 'compact_schema': False})
+    result = cleaner.clean_pipeline(df.copy())
+    return result, {key: value for key, value in cleaner.cleaning_stats.items() if key != 'original_count'}
+
+
+def review(i: int, reviewer='ann', date='2024-01-01', product='McAfee', **extra):
+    return {'product_name': product, 'review_text': f'{TEXT} {i}', 'title': f'Title {i}', 'rating': 4,
+            'date': date, 'source': 'Google Play Store', 'collection_source': 'playstore',
+            'reviewer_name': reviewer, 'scraped_at': '2024-12-31T12:00:00', 'created_utc': None, **extra}
+
+
+UNDATED_REVIEWER = pd.DataFrame([
+    review(0, date='2024-01-01'), review(1, date=None), review(2, date='2024-03-01'), review(3, date=None),
+    review(4, reviewer='bob', date=None), review(5, reviewer='bob', date=None),
+    review(6, reviewer='cy', date='2024-02-01'), review(7, reviewer='cy', date='2024-02-01'),
+    review(8, reviewer=None), review(9, reviewer=None),
+])
+
+FIXTURES = {
+    'synthetic': synthetic_reviews(3000, seed=11),
+    'undated_reviewer': UNDATED_REVIEWER,
+    'no_reviewer_name': synthetic_reviews(1000, seed=12).drop(columns=['reviewer_name']),
+    'no_reddit_columns': synthetic_reviews(1000, seed=13).drop(columns=['created_utc', 'score', 'num_comments']),
+    'no_title_or_selftext': synthetic_reviews(1000, seed=14).drop(columns=['title', 'selftext']),
+    'no_scraped_at': synthetic_reviews(1000, seed=15).drop(columns=['scraped_at']),
+}
+
+
+@pytest.mark.parametrize('name', sorted(FIXTURES))
+def test_engines_agree(name):
+    pandas_df, pandas_stats = clean(FIXTURES[name], 'pandas')
+    polars_df, polars_stats = clean(FIXTURES[name], 'polars')
+    assert compare(pandas_df, polars_df) == []
+    assert polars_stats == pandas_stats
+
+
+@pytest.mark.parametrize('engine', DataCleaner.ENGINES)
+def test_undated_reviewer_keeps_one_review_each(engine):
+    result, stats = clean(UNDATED_REVIEWER, engine)
+    # ann keeps her last undated review, bob his last review, cy the later row of a tie
+    assert stats['duplicates_removed'] == 5
+    assert sorted(result['review_text'].str.rsplit(' ', n=1).str[-1].astype(int)) == [3, 5, 7, 8, 9]
@@ -0,0 +1,84 @@
+"""Duplicate removal must match the original nsmallest-based implementation row for row."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.data_cleaner import DataCleaner
+from src.preprocessing.plan import CleaningPlan
+
+
+def legacy_remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
+    """DataCleaner._remove_duplicates before the CleaningPlan rewrite, kept as the reference"""
+    df = df.drop_duplicates(subset=['product_name', 'review_text_unified'], keep='first')
+    duplicates = []
+    for product in df['product_name'].unique():
+        product_df = df[df['product_name'] == product]
+        if 'reviewer_name' in product_df.columns:
+            for reviewer in product_df['reviewer_name'].dropna().unique():
+                reviewer_reviews = product_df[product_df['reviewer_name'] == reviewer]
+                if len(reviewer_reviews) > 1 and 'date_unified' in reviewer_reviews.columns:
+                    to_remove = reviewer_reviews.nsmallest(len(reviewer_reviews) - 1, 'date_unified')
+                    duplicates.extend(to_remove.index.tolist())
+    return df.drop(duplicates)
+
+
+def remove_duplicates(df: pd.DataFrame):
+    cleaner = DataCleaner()
+    plan = cleaner._remove_duplicates(CleaningPlan(df))
+    return df.iloc[plan.rows], cleaner.cleaning_stats['duplicates_removed']
+
+
+def reviews(rows):
+    df = pd.DataFrame(rows, columns=['product_name', 'reviewer_name', 'date_unified', 'review_text_unified'])
+    df['date_unified'] = pd.to_datetime(df['date_unified'])
+    return df
+
+
+def synthetic(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.Series(pd.to_datetime('2024-01-01') + pd.to_timedelta(rng.integers(0, 60, n), unit='D'))
+    return pd.DataFrame({
+        'product_name': rng.choice(['McAfee', 'Norton', 'Avast'], n),
+        'reviewer_name': pd.Series([f'user{i}' for i in rng.integers(0, 250, n)]).where(rng.random(n) > 0.1),
+        'date_unified': dates.where(rng.random(n) > 0.3),
+        'review_text_unified': [f'review {i}' for i in rng.integers(0, n // 2, n)]
+    })
+
+
+FIXTURES = {
+    'dated_and_undated': reviews([
+        ('McAfee', 'ann', '2024-01-01', 'a'), ('McAfee', 'ann', None, 'b'),
+        ('McAfee', 'ann', '2024-03-01', 'c'), ('McAfee', 'ann', None, 'd')]),
+    'only_undated': reviews([('Norton', 'bob', None, 'a'), ('Norton', 'bob', None, 'b'), ('Norton', 'bob', None, 'c')]),
+    'same_date': reviews([('Avast', 'cy', '2024-02-01', 'a'), ('Avast', 'cy', '2024-02-01', 'b')]),
+    'anonymous_and_exact': reviews([
+        ('Avast', None, '2024-02-01', 'a'), ('Avast', None, '2024-02-02', 'b'), ('Avast', 'dee', '2024-02-03', 'a'),
+        ('Norton', 'dee', '2024-02-04', 'a'), ('Norton', 'dee', '2024-01-04', 'e')]),
+    'synthetic': synthetic(3000, seed=0),
+    'synthetic_mostly_undated': synthetic(3000, seed=1).assign(
+        date_unified=lambda df: df['date_unified'].where(np.arange(len(df)) % 4 == 0)),
+}
+
+
+@pytest.mark.parametrize('name', sorted(FIXTURES))
+def test_matches_legacy_implementation(name):
+    df = FIXTURES[name]
+    expected = legacy_remove_duplicates(df)
+    result, removed = remove_duplicates(df)
+    pd.testing.assert_frame_equal(result, expected)
+    assert removed == len(df) - len(expected)
+
+
+def test_keeps_exactly_one_review_per_reviewer():
+    result, removed = remove_duplicates(FIXTURES['dated_and_undated'])
+    assert len(result) == 1 and removed == 3
+    result, removed = remove_duplicates(FIXTURES['only_undated'])
+    assert len(result) == 1 and removed == 2
+
+
+def test_without_reviewer_or_date_columns_only_exact_duplicates_go():
+    df = FIXTURES['anonymous_and_exact']
+    for dropped in ('reviewer_name', 'date_unified'):
+        result, removed = remove_duplicates(df.drop(columns=dropped))
+        assert removed == 1
+        assert list(result.index) == [0, 1, 3, 4]
@@ -0,0 +1,28 @@
+from src.data_collection.collection_manager import DataCollectionManager
+from src.data_collection.work_queue import WorkQueue
+
+
+class StoreScraper:
+    pass
+
+
+class ForumScraper:
+    def scrape_reviews_multi(self, companies, max_reviews):
+        return {}
+
+
+def test_collect_queued_run_before_any_task_finished(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = DataCollectionManager(config_path=str(tmp_path / 'missing.yaml'))
+    manager._scrapers = {'playstore': StoreScraper(), 'reddit': ForumScraper()}
+    queue = WorkQueue(str(tmp_path / 'queue.db'))
+
+    run_id = manager.enqueue_collection(queue, companies=['McAfee', 'Norton'], max_reviews_per_source=10)
+    result = manager.collect_queued_run(queue, run_id)
+
+    assert result['sources'] == {}
+    assert result['queue_stats']['depth'] == 3
+    summary = result['summary']
+    assert summary['source_performance'] == {}
+    assert summary['total_reviews_by_company'] == {'McAfee': 0, 'Norton': 0}
+    assert summary['companies_missing_data'] == ['McAfee', 'Norton']
@@ -0,0 +1,29 @@
+import json
+
+import pandas as pd
+
+from src.analysis.insights_api import InsightsStore
+
+
+def review(product: str, review_id: str, score: float):
+    return {'product_name': product, 'source': 'Reddit', 'data_source': 'reddit', 'review_id': review_id,
+            'review_text_unified': f'review {review_id}', 'ai_sentiment_score': score}
+
+
+def products(store: InsightsStore):
+    body, _ = store.answer('products', {})
+    return {item['product']: (item['reviews'], item['avg_sentiment']) for item in json.loads(body)['products']}
+
+
+def test_partial_runs_keep_skipped_products(tmp_path):
+    pd.DataFrame([review('Norton', 'a', -0.5), review('McAfee', 'a', 0.2), review('McAfee', 'b', 0.4)]).to_json(
+        tmp_path / 'analyzed_reviews_20240501_120000.json', orient='records')
+    # A later run that only re-analyzed Norton
+    pd.DataFrame([review('Norton', 'a', 0.5)]).to_json(
+        tmp_path / 'analyzed_reviews_20240502_120000.json', orient='records')
+
+    store = InsightsStore(str(tmp_path), check_interval=0)
+    assert products(store) == {'McAfee': (2, 0.3), 'Norton': (1, 0.5)}
+
+    latest = InsightsStore(str(tmp_path), check_interval=0, latest_only=True)
+    assert products(latest) == {'Norton': (1, 0.5)}
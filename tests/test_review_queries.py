@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from src.analysis.review_queries import ReviewQueries
+
+pytest.importorskip('duckdb')
+
+
+def review(product: str, review_id: str, score: float):
+    return {'product_name': product, 'source': 'Reddit', 'data_source': 'reddit', 'review_id': review_id,
+            'review_text': f'review {review_id}', 'rating_standardized': 4.0, 'ai_sentiment_score': score}
+
+
+def test_partial_runs_keep_skipped_products(tmp_path):
+    processed = tmp_path / 'processed'
+    processed.mkdir()
+    pd.DataFrame([review('Norton', 'a', -0.5), review('McAfee', 'a', 0.2), review('McAfee', 'b', 0.4)]).to_json(
+        processed / 'analyzed_reviews_20240501_120000.json', orient='records')
+    # A later run that only re-analyzed Norton
+    pd.DataFrame([review('Norton', 'a', 0.5)]).to_json(
+        processed / 'analyzed_reviews_20240502_120000.json', orient='records')
+
+    queries = ReviewQueries(raw_dir=str(tmp_path / 'raw'), processed_dir=str(processed))
+    result = queries.sentiment_by_product().set_index('product_name')
+    assert result['reviews'].to_dict() == {'McAfee': 2, 'Norton': 1}
+    assert result['avg_sentiment'].round(4).to_dict() == {'McAfee': 0.3, 'Norton': 0.5}
+
+    latest = ReviewQueries(raw_dir=str(tmp_path / 'raw'), processed_dir=str(processed), latest_only=True)
+    assert latest.sentiment_by_product()['product_name'].tolist() == ['Norton']
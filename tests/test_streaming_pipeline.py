@@ -0,0 +1,45 @@
+import json
+from types import SimpleNamespace
+
+from src.data_collection.telemetry import ScraperTelemetry
+from src.streaming_pipeline import StreamingPipeline
+
+TEXT = 'The scan found malware quickly and support answered my renewal question'
+
+
+class PagedScraper:
+    def __init__(self):
+        self.telemetry = ScraperTelemetry()
+
+    def iter_review_pages(self, company, max_reviews):
+        for page in range(3):
+            yield [{'product_name': company, 'review_text': f'{TEXT} {company} {page} {i}', 'rating': 4,
+                    'date': '2024-05-01', 'source': 'Store', 'reviewer_name': f'user{page}{i}'} for i in range(7)]
+
+
+class BrokenForum:
+    def __init__(self):
+        self.telemetry = ScraperTelemetry()
+
+    def scrape_reviews_multi(self, companies, max_reviews):
+        raise ConnectionError('search endpoint unavailable')
+
+
+def test_stream_writes_strict_jsonl_and_records_multi_source_failures(tmp_path):
+    manager = SimpleNamespace(
+        config={'data_collection': {'target_companies': ['McAfee', 'Norton'], 'max_reviews_per_product': 50}},
+        scrapers={'store': PagedScraper(), 'forum': BrokenForum()})
+    pipeline = StreamingPipeline(manager, {'use_openai': False, 'analysis_batch_size': 5, 'max_batch_wait': 0.2,
+                                           'raw_output_dir': str(tmp_path / 'raw'),
+                                           'output_dir': str(tmp_path / 'processed')})
+
+    stats = pipeline.run()
+
+    with open(stats['output_path'], encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    assert lines[-1] == ''
+    records = [json.loads(line) for line in lines[:-1]]
+    assert len(records) == stats['analyzed'] == 42
+    assert stats['batches'] > 1
+    assert [(unit['source'], unit['company']) for unit in stats['failed_units']] == [('forum', 'McAfee'),
+                                                                                       ('forum', 'Norton')]
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from src.analysis.structured_output import (StructuredOutputClient, describe_schema, missing_fields, object_schema,
+                                            repair_json)
+
+
+def test_trailing_commas_inside_strings_are_kept():
+    assert repair_json('{"a": "x,}", "b": [1,]}') == {'a': 'x,}', 'b': [1]}
+
+
+def test_escaped_quotes_do_not_end_the_string():
+    assert repair_json('{"a": "say \\",]\\"", "b": {"c": 1,},}') == {'a': 'say ",]"', 'b': {'c': 1}}
+
+
+def test_fenced_output():
+    assert repair_json('```json\n{"a": [1, 2,]}\n```') == {'a': [1, 2]}
+
+
+def test_truncated_output_is_closed():
+    assert repair_json('{"a": "hello, wor') == {'a': 'hello, wor'}
+    assert repair_json('{"a": [1, 2,') == {'a': [1, 2]}
+    assert repair_json('{"a": {"b": "x,]", ') == {'a': {'b': 'x,]'}}
+
+
+def test_no_object():
+    assert repair_json('no json here') is None
+
+
+NESTED = object_schema({
+    'label': {'type': 'string', 'enum': ['a', 'b']},
+    'detail': object_schema({'score': {'type': 'number'}, 'tags': {'type': 'array', 'items': {'type': 'string'}}}),
+    'items': {'type': 'array', 'items': object_schema({'name': {'type': 'string'}})}
+})
+
+
+def test_describe_schema_spells_out_nested_objects():
+    assert describe_schema(NESTED) == ('{"label": a|b, "detail": {"score": number, "tags": [string]}, '
+                                       '"items": [{"name": string}]}')
+
+
+def test_missing_fields_checks_nested_objects():
+    valid = {'label': 'a', 'detail': {'score': 0.5, 'tags': []}, 'items': [{'name': 'x'}]}
+    assert missing_fields(valid, NESTED) == []
+    assert missing_fields({**valid, 'detail': {'score': 0.5}}, NESTED) == ['detail']
+    assert missing_fields({**valid, 'detail': {'score': 'high', 'tags': []}}, NESTED) == ['detail']
+    assert missing_fields({**valid, 'items': [{'name': 'x'}, {}]}, NESTED) == ['items']
+
+
+class PlainCompletions:
+    """Mimics a model like gpt-4 that rejects every response_format"""
+
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if 'response_format' in kwargs:
+            raise ValueError(f"Invalid parameter: 'response_format' of type "
+                             f"'{kwargs['response_format']['type']}' is not supported with this model.")
+        message = SimpleNamespace(content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_falls_back_to_prompt_described_json():
+    completions = PlainCompletions('Sure:\n```json\n{"label": "b", "detail": {"score": 1, "tags": ["x"],}, "items": []}\n```')
+    client = StructuredOutputClient(SimpleNamespace(chat=SimpleNamespace(completions=completions)), 'gpt-4', stream=False)
+
+    data = client.request([{'role': 'user', 'content': 'Classify'}], NESTED)
+
+    assert data == {'label': 'b', 'detail': {'score': 1, 'tags': ['x']}, 'items': []}
+    assert [call.get('response_format', {}).get('type') for call in completions.calls] == ['json_schema', 'json_object', None]
+    assert describe_schema(NESTED) in completions.calls[-1]['messages'][-1]['content']
+
+    # The downgrade sticks for later requests
+    client.request([{'role': 'user', 'content': 'Again'}], NESTED)
+    assert 'response_format' not in completions.calls[-1]